@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+build_includes
+----------------------------------
+Benchmark each freezer strategy against synthetic package trees.
+
+Finding the packages (discovery, frosty.includes._discover_packages) is the same for every strategy, and an import is
+only cold the first time, so it is timed once per tree and reported on its own.  Every strategy is then timed
+separately for the other two phases of build_includes:
+
+    walk    -- scanning the package directories into frosty.walk.PackageTree models
+    names   -- deriving include names from the package trees, replayed from memory
+
+Example:
+
+    python benchmarks/build_includes.py --breadth 4 --depth 4 --modules 20 --clutter 50 --json
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    import tracemalloc
+except ImportError:  # Python < 3.4
+    tracemalloc = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frosty.compat import timer  # noqa: E402
+from frosty.freezers import FREEZER, resolve_freezer  # noqa: E402
+from frosty.includes import DISCOVERY, _discover_packages  # noqa: E402
+from frosty.walk import PackageTree  # noqa: E402
+
+
+def generate_tree(root, package_name, breadth=3, depth=3, modules=10, clutter=10):
+    """
+    Write a synthetic package tree beneath root.
+
+    :param root: Directory the top level package is created in
+    :param package_name: Name of the top level package
+    :param breadth: Sub-packages in every package
+    :param depth: Levels of sub-packages below the top level package
+    :param modules: Modules in every package
+    :param clutter: Files in a non-package data directory next to every package's modules (0 = no data directory)
+    :return: 2-tuple of the number of packages and the number of files written
+    """
+    packages = files = 0
+    stack = [(os.path.join(root, package_name), 0)]
+    while stack:
+        path, level = stack.pop()
+        os.makedirs(path)
+        packages += 1
+        names = [u"__init__.py"] + [u"module_{0}.py".format(index) for index in range(modules)]
+        for name in names:
+            with open(os.path.join(path, name), 'w') as f:
+                f.write(u"VALUE = 1\n")
+        files += len(names)
+
+        if clutter:
+            data_path = os.path.join(path, u"data", u"nested")
+            os.makedirs(data_path)
+            for index in range(clutter):
+                open(os.path.join(data_path, u"asset_{0}.txt".format(index)), 'w').close()
+            files += clutter
+
+        if level < depth:
+            stack.extend((os.path.join(path, u"sub_{0}".format(index)), level + 1) for index in range(breadth))
+    return packages, files
+
+
+def _measure(function, repeat):
+    """
+    Best wall time and peak traced memory (bytes, None without tracemalloc) of repeated calls to function.
+
+    Memory is traced on a separate call, so tracing doesn't slow down the timed ones.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = timer()
+        result = function()
+        elapsed = timer() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak = None
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def discover(package_name, discovery=None):
+    """
+    Time finding the packages of a tree, once (See the module docstring).  Memory isn't traced, since a traced second
+    run would only find the modules already imported by the first.
+
+    :return: 2-tuple of a dict of seconds, peak_bytes and items, and the package references
+    """
+    gc.collect()
+    start = timer()
+    references = _discover_packages([package_name], discovery=discovery)
+    seconds = timer() - start
+    return {u"seconds": seconds, u"peak_bytes": None, u"items": len(references)}, references
+
+
+def benchmark(references, freezer, repeat=3):
+    """
+    Time the walk and names phases of build_includes for one freezer strategy
+
+    :param references: package references found by discover
+    :return: dict of phase name -> dict of seconds, peak_bytes and items (plus the size of the include set)
+    """
+    freezer = resolve_freezer(freezer)
+    results = {}
+
+    passthrough_includes, package_root_paths = freezer._split_packages(references)
+    package_dirs = [freezer._package_dir(path) for path in package_root_paths]
+    package_dirs = [path for path in package_dirs if path is not None]
+
+    def walk():
+        return dict((path, PackageTree(path)) for path in package_dirs)
+
+    seconds, peak, trees = _measure(walk, repeat)
+    directories = sum(len(tree.listings) for tree in trees.values())
+    results[u"walk"] = {u"seconds": seconds, u"peak_bytes": peak, u"items": directories}
+
+    def names():
+        includes = set(passthrough_includes)
+        for package_path, name in package_root_paths.items():
+            includes |= freezer._package_includes(package_path, name, walk=lambda top: trees[top].walk(top))
+        return includes
+
+    seconds, peak, includes = _measure(names, repeat)
+    results[u"names"] = {u"seconds": seconds, u"peak_bytes": peak, u"items": len(includes)}
+    return results
+
+
+def _format_rate(items, seconds):
+    return u"{0:,.0f}/s".format(items / seconds) if seconds else u"-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=u"Benchmark frosty include strategies on a synthetic package tree")
+    parser.add_argument(u"--breadth", type=int, default=3, help=u"sub-packages per package")
+    parser.add_argument(u"--depth", type=int, default=3, help=u"levels of sub-packages")
+    parser.add_argument(u"--modules", type=int, default=10, help=u"modules per package")
+    parser.add_argument(u"--clutter", type=int, default=10, help=u"non-package data files per package")
+    parser.add_argument(u"--repeat", type=int, default=3, help=u"runs per phase (best time is reported)")
+    parser.add_argument(u"--discovery", default=DISCOVERY.IMPORT, choices=sorted(DISCOVERY.ALL))
+    parser.add_argument(u"--freezer", action=u"append", help=u"freezer to benchmark (default: all)")
+    parser.add_argument(u"--json", action=u"store_true", help=u"print machine readable results")
+    args = parser.parse_args(argv)
+
+    freezers = args.freezer or sorted(u"{0}".format(freezer()) for freezer in FREEZER.ALL)
+    package_name = u"frosty_bench_tree"
+    root = tempfile.mkdtemp(prefix=u"frosty-bench-")
+    sys.path.insert(0, root)
+    try:
+        packages, files = generate_tree(root, package_name, breadth=args.breadth, depth=args.depth,
+                                        modules=args.modules, clutter=args.clutter)
+        discovery, references = discover(package_name, args.discovery)
+        report = {
+            u"tree": {u"packages": packages, u"files": files, u"breadth": args.breadth, u"depth": args.depth,
+                      u"modules": args.modules, u"clutter": args.clutter},
+            u"discovery": dict(discovery, mode=args.discovery),
+            u"freezers": dict((freezer, benchmark(references, freezer, args.repeat)) for freezer in freezers),
+        }
+    finally:
+        sys.path.remove(root)
+        shutil.rmtree(root)
+
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+        return 0
+
+    print(u"Tree: {packages} packages, {files} files".format(**report[u"tree"]))
+    print(u"Discovery ({mode}): {seconds:.4f} seconds".format(**report[u"discovery"]))
+    print(u"{0:<10} {1:<7} {2:>10} {3:>14} {4:>12}".format(u"freezer", u"phase", u"seconds", u"throughput",
+                                                           u"peak KiB"))
+    for freezer, phases in sorted(report[u"freezers"].items()):
+        for phase in (u"walk", u"names"):
+            result = phases[phase]
+            peak = u"{0:,.0f}".format(result[u"peak_bytes"] / 1024.0) if result[u"peak_bytes"] is not None else u"-"
+            print(u"{0:<10} {1:<7} {2:>10.4f} {3:>14} {4:>12}".format(
+                freezer, phase, result[u"seconds"], _format_rate(result[u"items"], result[u"seconds"]), peak))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
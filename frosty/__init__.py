@@ -2,9 +2,44 @@
 #
 from __future__ import absolute_import
 
+import sys
+
 __version__ = '0.1.8'
 
-# Expose Public API
-from .includes import build_includes
-from .freezers import FREEZER, resolve_freezer
+# Expose Public API.  frosty.index, frosty.lazy and frosty.profile run inside frozen applications, where importing
+# this package has to stay cheap, so the build modules are only imported once one of these names is used.  That needs
+# module __getattr__ (Python 3.7+); older interpreters import the build modules along with the package.
+_EXPORTS = {
+    'build_includes': 'includes',
+    'build_freezer_includes': 'includes',
+    'compile_includes': 'includes',
+    'find_lazy_modules': 'includes',
+    'find_native_modules': 'includes',
+    'iter_includes': 'includes',
+    'DISCOVERY': 'includes',
+    'FREEZER': 'freezers',
+    'register_freezer': 'freezers',
+    'resolve_freezer': 'freezers',
+    'build_reachable_includes': 'reachability',
+    'POOL': 'workers',
+}
+
+__all__ = sorted(_EXPORTS)
+
+if sys.version_info >= (3, 7, 0, 'final', 0):
+    def __getattr__(name):
+        if name not in _EXPORTS:
+            raise AttributeError(u"module 'frosty' has no attribute '{0}'".format(name))
+        from importlib import import_module
+        value = getattr(import_module(u"." + _EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
 
+    def __dir__():
+        return sorted(set(globals()) | set(_EXPORTS))
+else:  # No module __getattr__ (PEP 562)
+    from .includes import build_includes, build_freezer_includes, compile_includes, find_lazy_modules, \
+        find_native_modules, iter_includes, DISCOVERY
+    from .freezers import FREEZER, register_freezer, resolve_freezer
+    from .reachability import build_reachable_includes
+    from .workers import POOL
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# asyncio counterparts of the include builders.  Needs Python 3.5+ (async def), so nothing else in frosty imports it.
+from __future__ import absolute_import
+
+import asyncio
+
+from functools import partial
+
+from .compat import timer
+from .freezers import _Default, _build_package_includes
+from .includes import _Build, _freezer_options
+
+
+async def _gather(coroutines):
+    """
+    Run coroutines concurrently, cancelling all of the rest as soon as one of them fails (or this is cancelled)
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def freezer_build_includes_async(freezer, include_packages, cache=None, workers=None, pool=None, executor=None,
+                                       stats=None, compact=False, exclude=None, files=None):
+    """
+    Asynchronous counterpart of a freezer strategy's build_includes (See _Default.build_includes).
+
+    Packages are walked in the executor, at most workers of them at a time.  A freezer may provide its own
+    build_includes_async coroutine; freezers that don't derive from FREEZER.DEFAULT run their build_includes in the
+    executor as a whole (with workers and pool passed on).
+
+    :param freezer: freezer instance (See frosty.freezers.resolve_freezer)
+    :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+    :param cache: IncludeCache to reuse the results of earlier walks from (None = always walk)
+    :param workers: Number of packages to walk concurrently (None = as many as the executor runs at once)
+    :param pool: Kind of worker pool for freezers that don't walk in the executor (See POOL constants)
+    :param executor: concurrent.futures executor that blocking work runs in (None = the event loop's default)
+    :param stats: BuildStats to record phase and per-package measurements in (None = measure nothing)
+    :param compact: Include every module, in the fewest names the freezer understands (See _package_includes)
+    :param exclude: frosty.exclude.ExcludePatterns of names to leave out (excluded packages are never walked)
+    :param files: list that the frosty.walk.PackageFiles of every package are appended to (None = record nothing)
+    :return: set of includes
+    """
+    loop = asyncio.get_event_loop()
+    if hasattr(freezer, 'build_includes_async'):
+        return await freezer.build_includes_async(include_packages, cache=cache, workers=workers, pool=pool,
+                                                  executor=executor, stats=stats, compact=compact, exclude=exclude,
+                                                  files=files)
+    if not isinstance(freezer, _Default):
+        options = _freezer_options(cache=cache, workers=workers, pool=pool, stats=stats, compact=compact,
+                                   exclude=exclude, files=files)
+        return await loop.run_in_executor(executor, partial(freezer.build_includes, include_packages, **options))
+
+    cls = freezer.__class__
+    includes, jobs = await loop.run_in_executor(
+        executor, partial(cls._package_jobs, include_packages, cache=cache, stats=stats, compact=compact,
+                          exclude=exclude, files=files))
+    start = timer() if stats is not None else None
+    semaphore = asyncio.Semaphore(workers) if workers else None
+
+    async def build(job):
+        if semaphore is None:
+            return await loop.run_in_executor(executor, _build_package_includes, job)
+        async with semaphore:
+            return await loop.run_in_executor(executor, _build_package_includes, job)
+
+    results = await _gather(build(job) for job in jobs)
+    includes = cls._merge_package_results(includes, results, stats=stats, files=files)
+    if stats is not None:
+        stats.add_phase(u"packages", timer() - start)
+    return includes
+
+
+async def build_includes_async(include_packages, freezer=None, optional=None, discovery=None, cache=None, workers=None,
+                               pool=None, executor=None, timeout=None, stats=None, compact=False, exclude=None,
+                               sizes=None, profile=None, keep=None, fingerprint=None):
+    """
+    Asynchronous counterpart of frosty.includes.build_includes, for build tools that run on an asyncio event loop.
+
+    Discovery, walks and file hashing all run in an executor, so the event loop is never blocked, and package trees
+    are walked concurrently (at most workers at a time).  The result is identical to build_includes.  Report callbacks
+    (stats, sizes and fingerprint) are called in the executor too.
+
+    Cancelling the build stops every walk that hasn't started yet.  Work already running in the executor can't be
+    interrupted; it finishes in the background and its result is dropped.
+
+    Example:
+
+        >>>includes = await build_includes_async(['salt'], discovery=DISCOVERY.SPEC, workers=8)
+
+    :param workers: Number of packages to walk concurrently (None = as many as the executor runs at once)
+    :param pool: Kind of worker pool used to hash files for the fingerprint, and by freezers that don't walk in the
+                 executor (See POOL constants, None = POOL.THREAD)
+    :param executor: concurrent.futures executor that blocking work runs in (None = the event loop's default)
+
+    See frosty.includes.build_includes for every other parameter.
+    """
+    loop = asyncio.get_event_loop()
+    # Reading a profile is blocking file I/O
+    build = await loop.run_in_executor(
+        executor, partial(_Build, freezer, cache=cache, stats=stats, compact=compact, exclude=exclude, sizes=sizes,
+                          profile=profile, keep=keep, fingerprint=fingerprint))
+    package_references = await loop.run_in_executor(
+        executor, partial(build.discover, include_packages, optional=optional, discovery=discovery, timeout=timeout,
+                          workers=workers))
+    includes = await freezer_build_includes_async(build.freezer, package_references, cache=build.cache,
+                                                  workers=workers, pool=pool, executor=executor, stats=build.stats,
+                                                  compact=build.compact, exclude=build.exclude, files=build.files)
+    return await loop.run_in_executor(executor, partial(build.finish, includes, workers=workers, pool=pool))
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import hashlib
+import os
+import py_compile
+import shutil
+import six
+import sys
+import tempfile
+
+from .files import MODULE, replace_file, split_module_file
+from .workers import POOL, map_workers
+
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:  # Python 2
+    import imp
+    MAGIC_NUMBER = imp.get_magic()
+
+# Checked-hash .pyc files (PEP 552) hold the hash of their source instead of its mtime, so the same source always
+# compiles to the same bytes.  Older interpreters only write timestamp based .pyc files.
+_CHECKED_HASH = getattr(getattr(py_compile, 'PycInvalidationMode', None), 'CHECKED_HASH', None)
+
+
+def bytecode_key(source, dfile, optimize):
+    """
+    Content address of the bytecode of a source file: everything the compiled bytes depend on
+
+    :param source: bytes of the source file
+    :param dfile: File name recorded in the bytecode (See bytecode_file)
+    :param optimize: Optimisation level (-1 = the running interpreter's)
+    """
+    if optimize < 0:
+        optimize = sys.flags.optimize
+    digest = hashlib.sha256(MAGIC_NUMBER)
+    digest.update(u"{0}:{1}:{2}\n".format(optimize, _CHECKED_HASH is not None, dfile).encode('utf-8'))
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def bytecode_file(module_name, is_package, suffix=u".pyc"):
+    """
+    Path of a module within a bytecode tree, relative to the top of the tree ("/" separated)
+    """
+    parts = module_name.split(u".")
+    if is_package:
+        parts.append(u"__init__")
+    return u"/".join(parts) + suffix
+
+
+def _copy(source, destination):
+    """
+    Atomically copy a file, so that a freezer reading the tree never sees a partial one
+    """
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(destination), suffix=u".tmp")
+    os.close(handle)
+    shutil.copyfile(source, temp_path)
+    replace_file(temp_path, destination)
+
+
+def _compile(source_path, cfile, dfile, optimize):
+    options = {}
+    if _CHECKED_HASH is not None:
+        options['invalidation_mode'] = _CHECKED_HASH
+    if six.PY3:
+        options['optimize'] = optimize
+    py_compile.compile(source_path, cfile=cfile, dfile=dfile, doraise=True, **options)
+
+
+def _compile_module(job):
+    """
+    Compile (or reuse the stored bytecode of) a single source file into the bytecode tree
+
+    :param job: 5-tuple of the source file, the destination .pyc file, the file name recorded in the bytecode, the
+                optimisation level and the bytecode store directory (None = don't store bytecode)
+    :return: 2-tuple of whether stored bytecode was reused, and an error message (None = compiled)
+    """
+    source_path, destination, dfile, optimize, store = job
+    try:
+        with open(source_path, 'rb') as f:
+            source = f.read()
+        if store is None:
+            _compile(source_path, destination, dfile, optimize)
+            return False, None
+
+        key = bytecode_key(source, dfile, optimize)
+        stored = os.path.join(store, key[:2], key + u".pyc")
+        reused = os.path.exists(stored)
+        if not reused:
+            if not os.path.isdir(os.path.dirname(stored)):
+                try:
+                    os.makedirs(os.path.dirname(stored))
+                except OSError:  # Made by another worker
+                    pass
+            _compile(source_path, stored, dfile, optimize)
+        _copy(stored, destination)
+        return reused, None
+    except py_compile.PyCompileError as e:
+        return False, e.msg
+    except (IOError, OSError) as e:
+        return False, u"{0}".format(e)
+
+
+class BytecodeTree(object):
+    """
+    Tree of precompiled modules, laid out the way sourceless imports find them (package/__init__.pyc,
+    package/module.pyc), ready to be handed to a freezer.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.modules = {}  # module name -> .pyc file
+        self.compiled = []  # names of the modules that had to be compiled
+        self.reused = []  # names of the modules whose stored bytecode was reused
+        self.skipped = {}  # module name -> file, for modules that have no bytecode (extensions, zip archive members)
+        self.errors = {}  # module name -> message, for modules that failed to compile
+
+
+def compile_modules(modules, directory, optimize=-1, cache=None, workers=None, pool=POOL.PROCESS):
+    """
+    Compile modules into a bytecode tree.
+
+    Bytecode is content addressed (See bytecode_key) and stored in the cache, so a module whose source hasn't changed is
+    never compiled again, by any build that shares the cache.  Bytecode only records paths relative to the tree, and on
+    Python 3.7+ holds checked source hashes instead of mtimes, so there the same sources always give the same bytes
+    wherever they are built.
+
+    :param modules: iterable of (module name, whether the module is a package, file that defines the module) 3-tuples
+                    (See _Default.module_files)
+    :param directory: Top of the bytecode tree (created if needed; files of earlier builds are overwritten, not
+                      removed)
+    :param optimize: Optimisation level (-1 = the running interpreter's, 0, 1 = no asserts, 2 = no docstrings either)
+    :param cache: IncludeCache that stores bytecode (See IncludeCache.bytecode_directory.  None = compile everything)
+    :param workers: Number of modules to compile concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See POOL constants)
+    :return: BytecodeTree
+    """
+    tree = BytecodeTree(directory)
+    store = cache.bytecode_directory() if cache is not None else None
+
+    jobs, names = [], []
+    for module_name, is_package, path in sorted(modules):
+        split = split_module_file(os.path.basename(path))
+        if split is None or split[1] == MODULE.EXTENSION or not os.path.isfile(path):
+            tree.skipped[module_name] = path
+            continue
+        relative_path = bytecode_file(module_name, is_package)
+        destination = os.path.join(directory, *relative_path.split(u"/"))
+        if not os.path.isdir(os.path.dirname(destination)):
+            os.makedirs(os.path.dirname(destination))
+        tree.modules[module_name] = destination
+        if split[1] == MODULE.BYTECODE:
+            # Sourceless modules already are bytecode
+            _copy(path, destination)
+            continue
+        jobs.append((path, destination, bytecode_file(module_name, is_package, suffix=u".py"), optimize, store))
+        names.append(module_name)
+
+    for module_name, (reused, error) in zip(names, map_workers(_compile_module, jobs, workers=workers, pool=pool)):
+        if error is not None:
+            tree.errors[module_name] = error
+            del tree.modules[module_name]
+        elif reused:
+            tree.reused.append(module_name)
+        else:
+            tree.compiled.append(module_name)
+    return tree
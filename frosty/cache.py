@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import hashlib
+import json
+import os
+import shutil
+import six
+import sys
+import tempfile
+
+from .files import replace_file
+from .walk import directory_functions, find_archive, init_file, walk_packages
+
+
+_CACHE_FORMAT = 3
+
+
+def user_cache_dir():
+    """
+    Platform specific directory for frosty's persistent cache
+
+    :return: absolute path of the cache directory (may not exist yet)
+    """
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, u"frosty")
+
+
+def _fingerprint(path):
+    """
+    Fingerprint of a directory.  A directory's mtime changes whenever an entry is added, removed or renamed in it,
+    which is all that the include strategies look at.
+
+    Directories inside a zip archive share the fingerprint of the archive itself.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        archive_path = find_archive(path)
+        if archive_path is None:
+            raise
+        stat = os.stat(archive_path)
+    return [getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_ino, stat.st_dev]
+
+
+class _CacheEntry(object):
+    """
+    Cached state of a single package directory: every directory looked at beneath it (with its fingerprint, whether it
+    is a package and, for the packages, its listing) and the includes that each freezer built from them.
+    """
+    def __init__(self, directories=None, includes=None):
+        self.directories = directories or {}
+        self.includes = includes or {}
+        self._changed = False
+        self._scan_directory = None
+        self._archive = False
+
+    def is_fresh(self):
+        """
+        True when none of the directories looked at on the last walk have changed since
+        """
+        for path, cached in six.iteritems(self.directories):
+            try:
+                if _fingerprint(path) != cached[0]:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan(self, path):
+        fingerprint = _fingerprint(path)
+        cached = self.directories.get(path)
+        if cached is not None and cached[0] == fingerprint and cached[2] is not None:
+            return list(cached[2]), list(cached[3])
+
+        dirs, files = self._scan_directory(path)
+        self.directories[path] = [fingerprint, init_file(files, archive=self._archive) is not None, dirs, files]
+        self._changed = True
+        return dirs, files
+
+    def _is_package(self, path):
+        try:
+            fingerprint = _fingerprint(path)
+        except OSError:
+            return False
+        cached = self.directories.get(path)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        # Adding an __init__.py changes the mtime of the sub-directory, not of its parent, so non-packages are
+        # fingerprinted too.  The listing of a package is kept, so that descending into it doesn't list it again.
+        try:
+            dirs, files = self._scan_directory(path)
+        except OSError:
+            return False
+        package = init_file(files, archive=self._archive) is not None
+        self.directories[path] = [fingerprint, package, dirs, files] if package else [fingerprint, package, None, None]
+        self._changed = True
+        return package
+
+    def walk(self, top):
+        """
+        walk_packages compatible traversal that re-lists only the directories whose fingerprint has changed.
+
+        If anything changed, the includes built from the old listings are dropped.
+        """
+        self._changed = False
+        self._scan_directory = directory_functions(top)[0]
+        self._archive = find_archive(top) is not None
+        for result in walk_packages(top, scan=self._scan, is_package=self._is_package):
+            yield result
+
+        if self._changed:
+            # Forget directories that have been removed since the last walk
+            for path in list(self.directories):
+                try:
+                    _fingerprint(path)
+                except OSError:
+                    del self.directories[path]
+            self.includes = {}
+
+    def replay(self, top):
+        """
+        walk_packages compatible replay of the last walk, from the cached listings alone (the caller may prune dirs in
+        place, like with walk_packages)
+        """
+        stack = [top]
+        while stack:
+            root = stack.pop()
+            cached = self.directories.get(root)
+            if cached is None or cached[2] is None:
+                continue
+            dirs = [name for name in cached[2] if (self.directories.get(os.path.join(root, name)) or [None, False])[1]]
+            yield root, dirs, list(cached[3])
+            stack.extend(os.path.join(root, name) for name in reversed(dirs))
+
+    def to_json(self):
+        return {u"format": _CACHE_FORMAT, u"directories": self.directories, u"includes": self.includes}
+
+    @classmethod
+    def from_json(cls, data):
+        if not isinstance(data, dict) or data.get(u"format") != _CACHE_FORMAT:
+            return None
+        return cls(data.get(u"directories"), data.get(u"includes"))
+
+
+class IncludeCache(object):
+    """
+    Persistent on-disk cache of the includes built for each package, per freezer strategy.
+
+    Every package directory gets its own cache file, holding the fingerprints (mtime, inode, device) of all of the
+    directories that were looked at when it was last walked.  An unchanged tree returns its includes without being
+    walked again, and a changed tree only re-lists the directories that actually changed.
+
+    The imports found in source files (See frosty.reachability) are cached here too, keyed by the hash of the source,
+    and so is precompiled bytecode (See frosty.bytecode).
+    """
+    def __init__(self, directory=None):
+        """
+        :param directory: Where cache files are stored (None = user_cache_dir())
+        """
+        self.directory = os.path.abspath(directory or user_cache_dir())
+        self._entries = {}
+        self._imports = {}
+        self._hashes = None
+
+    def _entry_path(self, package_dir):
+        digest = hashlib.sha1(os.path.abspath(package_dir).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + u".json")
+
+    def _load(self, package_dir):
+        entry = self._entries.get(package_dir)
+        if entry is None:
+            try:
+                with open(self._entry_path(package_dir), 'r') as f:
+                    entry = _CacheEntry.from_json(json.load(f))
+            except (IOError, OSError, ValueError):
+                entry = None
+            self._entries[package_dir] = entry = entry or _CacheEntry()
+        return entry
+
+    def _write(self, path, data):
+        """
+        Atomically write a cache file, so that concurrent builds never see a partial one
+        """
+        try:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix=u".tmp")
+            with os.fdopen(handle, 'w') as f:
+                json.dump(data, f)
+            replace_file(temp_path, path)
+        except (IOError, OSError):
+            # A cache that can't be written is just a slower build, not a failed one.
+            pass
+
+    def _save(self, package_dir, entry):
+        self._write(self._entry_path(package_dir), entry.to_json())
+
+    def _imports_path(self, digest):
+        return os.path.join(self.directory, u"imports", digest + u".json")
+
+    def scanned_imports(self, digest):
+        """
+        Imports found in a source file with the given content hash (None if it hasn't been scanned yet)
+        """
+        imports = self._imports.get(digest)
+        if imports is None:
+            try:
+                with open(self._imports_path(digest), 'r') as f:
+                    data = json.load(f)
+            except (IOError, OSError, ValueError):
+                return None
+            if not isinstance(data, dict) or data.get(u"format") != _CACHE_FORMAT:
+                return None
+            imports = self._imports[digest] = data[u"imports"]
+        return imports
+
+    def store_scanned_imports(self, digest, imports):
+        """
+        Remember the imports found in a source file with the given content hash
+        """
+        self._imports[digest] = imports
+        self._write(self._imports_path(digest), {u"format": _CACHE_FORMAT, u"imports": imports})
+
+    def bytecode_directory(self):
+        """
+        Directory of the content addressed bytecode store (See frosty.bytecode.compile_modules)
+        """
+        return os.path.join(self.directory, u"bytecode")
+
+    def file_hashes(self):
+        """
+        Content hashes of the files fingerprinted by earlier builds (See frosty.fingerprint)
+
+        :return: dict of absolute path -> [mtime, size, inode, hash]
+        """
+        if self._hashes is None:
+            try:
+                with open(os.path.join(self.directory, u"hashes.json"), 'r') as f:
+                    data = json.load(f)
+            except (IOError, OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get(u"format") == _CACHE_FORMAT:
+                self._hashes = data[u"hashes"]
+            else:
+                self._hashes = {}
+        return self._hashes
+
+    def store_file_hashes(self, hashes):
+        """
+        Remember the content hashes of fingerprinted files (See file_hashes)
+        """
+        self._hashes = hashes
+        self._write(os.path.join(self.directory, u"hashes.json"), {u"format": _CACHE_FORMAT, u"hashes": hashes})
+
+    def package_includes(self, freezer, package_path, package_name, package_stats=None, compact=False, exclude=None):
+        """
+        Includes for a single package, reusing the last walk of its directory when nothing has changed.
+
+        :param freezer: freezer class (or instance) whose _package_includes builds the includes
+        :param package_path: File that defines the package
+        :param package_name: Fully qualified name of the package
+        :param package_stats: frosty.stats.PackageStats to record the walk in (None = measure nothing)
+        :param compact: Build the compact includes (See frosty.freezers._Default._package_includes)
+        :param exclude: frosty.exclude.ExcludePatterns of names to leave out (None = exclude nothing)
+        :return: set of includes for the package
+        """
+        package_dir = freezer._package_dir(package_path)
+        if package_dir is None:
+            # Plain modules are never walked, so there is nothing to cache
+            return freezer._package_includes(package_path, package_name, compact=compact, exclude=exclude)
+
+        cls = freezer if isinstance(freezer, type) else freezer.__class__
+        key = u"{0}.{1}:{2}{3}{4}".format(cls.__module__, cls.__name__, package_name, u":compact" if compact else u"",
+                                          u":exclude=" + exclude.key if exclude is not None else u"")
+
+        entry = self._load(package_dir)
+        if key in entry.includes and entry.is_fresh():
+            if package_stats is not None:
+                package_stats.cached = True
+            return set(entry.includes[key])
+
+        walk = entry.walk if package_stats is None else package_stats.timed_walk(entry.walk)
+        includes = freezer._package_includes(package_path, package_name, walk=walk, compact=compact, exclude=exclude)
+        entry.includes[key] = sorted(includes)
+        self._save(package_dir, entry)
+        return includes
+
+    def package_walk(self, package_dir):
+        """
+        walk_packages compatible replay of the last walk of a package directory, from its cached listings alone (See
+        package_includes, which brings them up to date)
+        """
+        return self._load(package_dir).replay
+
+    def clear(self):
+        """
+        Remove every cache file and the bytecode store (and forget everything held in memory)
+        """
+        self._entries = {}
+        self._imports = {}
+        self._hashes = None
+        for directory in [self.directory, os.path.join(self.directory, u"imports")]:
+            if os.path.isdir(directory):
+                for name in os.listdir(directory):
+                    if name.endswith(u".json"):
+                        os.remove(os.path.join(directory, name))
+        if os.path.isdir(self.bytecode_directory()):
+            shutil.rmtree(self.bytecode_directory())
+
+
+class MemoryIncludeCache(IncludeCache):
+    """
+    IncludeCache that is only held in memory.
+
+    Nothing is read from or written to disk, but every package tree walked through it is still shared by later builds
+    in the same process (e.g. the targets of a batch, or several freezers over the same packages).
+    """
+    def __init__(self):
+        super(MemoryIncludeCache, self).__init__(directory=os.curdir)
+
+    def _load(self, package_dir):
+        entry = self._entries.get(package_dir)
+        if entry is None:
+            entry = self._entries[package_dir] = _CacheEntry()
+        return entry
+
+    def _write(self, path, data):
+        pass
+
+    def scanned_imports(self, digest):
+        return self._imports.get(digest)
+
+    def bytecode_directory(self):
+        return None
+
+    def file_hashes(self):
+        if self._hashes is None:
+            self._hashes = {}
+        return self._hashes
+
+    def clear(self):
+        self._entries = {}
+        self._imports = {}
+        self._hashes = None
+
+
+def resolve_cache(cache):
+    """
+    Locate the appropriate cache given a cache setting from the programmer.
+
+    :param cache: None/False = no caching, True = cache in user_cache_dir(), a directory path, or an IncludeCache
+    :return: IncludeCache instance or None
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return IncludeCache()
+    if isinstance(cache, six.string_types):
+        return IncludeCache(cache)
+    return cache
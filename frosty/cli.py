@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import, print_function
+
+import argparse
+import io
+import json
+import os
+import six
+import sys
+
+from warnings import catch_warnings, simplefilter
+
+from .fingerprint import BuildFingerprint
+from .freezers import resolve_freezer
+from .includes import build_batch_includes, DISCOVERY
+from .sizes import SizeReport
+from .workers import POOL
+
+
+class FORMAT(object):
+    """
+    Constants for the output formats of the command line tool
+    """
+
+    JSON = u"json"  # Sorted include list per target
+    SNIPPET = u"snippet"  # Freezer ready options per target, as Python source
+
+    ALL = set([JSON, SNIPPET])
+
+
+# Target name used when packages are given on the command line instead of in a batch file
+_COMMAND_LINE_TARGET = u"includes"
+
+
+def _valid_target_name(target_name):
+    """
+    True if a target name is a plain file name (--output-dir writes one file per target, and must not write outside it)
+    """
+    separators = [u"/", u"\\", u"\0", os.sep] + ([os.altsep] if os.altsep else [])
+    return bool(target_name) and target_name not in (os.curdir, os.pardir) and \
+        not any(separator in target_name for separator in separators)
+
+
+def load_batch(path):
+    """
+    Read a batch file of freeze targets.
+
+    The file is a JSON object of target name -> target, where each target has a list of packages, and optionally a
+    list of optional packages, a freezer name, compact, a list of exclude patterns, import profile paths and a list of
+    keep patterns (See frosty.includes.build_batch_includes):
+
+        {
+            "server": {"packages": ["salt", "zmq"], "freezer": "cxfreeze", "exclude": ["*.tests"]},
+            "client": {"packages": ["salt"], "optional": ["psutil"], "freezer": "py2exe"}
+        }
+
+    Target names are used as file names (See --output-dir), so they can't hold path separators.
+
+    :param path: Path of the batch file (u"-" = read standard input)
+    :return: dict of target name -> target dict
+    :raises ValueError: if the file isn't a valid batch file
+    """
+    if path == u"-":
+        batch = json.load(sys.stdin)
+    else:
+        with io.open(path, 'r', encoding='utf-8') as f:
+            batch = json.load(f)
+
+    if not isinstance(batch, dict):
+        raise ValueError(u"Batch file {0} must hold a JSON object of target name -> target".format(path))
+    for target_name, target in six.iteritems(batch):
+        if not _valid_target_name(target_name):
+            raise ValueError(u"Target name \"{0}\" in {1} can't be used as a file name".format(target_name, path))
+        if not isinstance(target, dict) or not isinstance(target.get(u"packages", []), list):
+            raise ValueError(u"Target \"{0}\" in {1} must be an object with a list of packages".format(target_name,
+                                                                                                     path))
+    return batch
+
+
+def format_target(target_name, freezer, includes, output_format=FORMAT.JSON):
+    """
+    Render the includes of one target
+
+    :param target_name: Name of the target
+    :param freezer: Freezer the includes were built for (See FREEZER constants)
+    :param includes: set of includes
+    :param output_format: See FORMAT constants
+    :return: unicode text
+    """
+    if output_format == FORMAT.JSON:
+        return six.text_type(json.dumps(sorted(includes), indent=4)) + u"\n"
+    if output_format == FORMAT.SNIPPET:
+        freezer = resolve_freezer(freezer)
+        if hasattr(freezer, 'setup_options'):
+            options = freezer.setup_options(includes)
+        else:
+            options = {u"includes": sorted(includes)}
+        return u"# {0} ({1})\noptions = {2}\n".format(target_name, freezer,
+                                                      json.dumps(options, indent=4, sort_keys=True))
+    raise ValueError(u"Unsupported output format \"{0}\".".format(output_format))
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog=u"frosty",
+                                     description=u"Build the includes of frozen applications")
+    parser.add_argument(u"packages", nargs=u"*", help=u"packages to include (unless --batch is used)")
+    parser.add_argument(u"-b", u"--batch", help=u"JSON file of freeze targets to build in one pass (- = stdin)")
+    parser.add_argument(u"--optional", action=u"append", default=[], help=u"optional package to include")
+    parser.add_argument(u"-f", u"--freezer", help=u"freezer to build includes for (default: default)")
+    parser.add_argument(u"--compact", action=u"store_true", help=u"list every module in the fewest names")
+    parser.add_argument(u"-x", u"--exclude", action=u"append", default=[],
+                        help=u"glob pattern of dotted names to leave out (e.g. '*.tests')")
+    parser.add_argument(u"-p", u"--profile", action=u"append", default=[],
+                        help=u"import profile recorded by the frozen application; only what it imported is included")
+    parser.add_argument(u"-k", u"--keep", action=u"append", default=[],
+                        help=u"glob pattern of dotted names to include even if the profile never imported them")
+    parser.add_argument(u"-d", u"--discovery", default=DISCOVERY.IMPORT, choices=sorted(DISCOVERY.ALL))
+    parser.add_argument(u"--timeout", type=float, help=u"seconds to wait for each isolated import")
+    parser.add_argument(u"--cache", nargs=u"?", const=True, default=None,
+                        help=u"reuse walks from earlier runs (optionally in the given directory)")
+    parser.add_argument(u"-j", u"--workers", type=int, help=u"packages to walk concurrently")
+    parser.add_argument(u"--pool", default=POOL.THREAD, choices=sorted(POOL.ALL))
+    parser.add_argument(u"--format", default=FORMAT.JSON, choices=sorted(FORMAT.ALL), help=u"output format")
+    parser.add_argument(u"-o", u"--output-dir", help=u"write one file per target here (default: standard output)")
+    parser.add_argument(u"--size-report", help=u"write the bundle size report of every target to this JSON file")
+    parser.add_argument(u"--max-bytes", type=int, help=u"exit with status 3 if a target's bundle is larger")
+    parser.add_argument(u"--max-include-bytes", type=int,
+                        help=u"exit with status 3 if any single include pulls in more bytes")
+    parser.add_argument(u"--fingerprint",
+                        help=u"write the build fingerprint of every target to this JSON file (unchanged builds write "
+                             u"an identical file)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the frosty command line tool
+
+    :param argv: Command line arguments (None = sys.argv[1:])
+    :return: exit status
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        if args.packages or args.optional or args.freezer or args.compact or args.exclude or args.profile or args.keep:
+            parser.error(u"packages, --optional, --freezer, --compact, --exclude, --profile and --keep are set per "
+                         u"target with --batch")
+        try:
+            targets = load_batch(args.batch)
+        except (IOError, OSError, ValueError) as e:
+            parser.error(u"{0}".format(e))
+    elif args.packages or args.optional:
+        targets = {_COMMAND_LINE_TARGET: {u"packages": args.packages, u"optional": args.optional,
+                                          u"freezer": args.freezer, u"compact": args.compact,
+                                          u"exclude": args.exclude, u"profile": args.profile or None,
+                                          u"keep": args.keep}}
+    else:
+        parser.error(u"either packages or --batch is required")
+
+    measure_sizes = args.size_report or args.max_bytes is not None or args.max_include_bytes is not None
+    if measure_sizes:
+        for target in targets.values():
+            target[u"sizes"] = SizeReport()
+    if args.fingerprint:
+        for target in targets.values():
+            target[u"fingerprint"] = BuildFingerprint()
+
+    with catch_warnings():
+        # Missing optional packages should be seen by whoever runs the build
+        simplefilter('default', ImportWarning)
+        try:
+            results = build_batch_includes(targets, discovery=args.discovery, cache=args.cache, workers=args.workers,
+                                           pool=args.pool, timeout=args.timeout)
+        except (ImportError, ValueError, IOError, OSError) as e:
+            print(u"frosty: error: {0}".format(e), file=sys.stderr)
+            return 1
+
+    if args.output_dir:
+        if not os.path.isdir(args.output_dir):
+            os.makedirs(args.output_dir)
+        extension = u".json" if args.format == FORMAT.JSON else u".py"
+        for target_name, includes in sorted(six.iteritems(results)):
+            text = format_target(target_name, targets[target_name].get(u"freezer"), includes, args.format)
+            with io.open(os.path.join(args.output_dir, target_name + extension), 'w', encoding='utf-8') as f:
+                f.write(text)
+    elif args.batch and args.format == FORMAT.JSON:
+        # One document for the whole batch, so it can be piped into other tools
+        document = dict((target_name, sorted(includes)) for target_name, includes in six.iteritems(results))
+        sys.stdout.write(json.dumps(document, indent=4, sort_keys=True) + u"\n")
+    else:
+        for target_name, includes in sorted(six.iteritems(results)):
+            sys.stdout.write(format_target(target_name, targets[target_name].get(u"freezer"), includes, args.format))
+
+    if args.fingerprint:
+        with io.open(args.fingerprint, 'w', encoding='utf-8') as f:
+            document = dict((target_name, target[u"fingerprint"].to_dict())
+                            for target_name, target in six.iteritems(targets))
+            f.write(six.text_type(json.dumps(document, indent=4, sort_keys=True)) + u"\n")
+
+    if not measure_sizes:
+        return 0
+
+    reports = dict((target_name, target[u"sizes"]) for target_name, target in six.iteritems(targets))
+    if args.size_report:
+        with io.open(args.size_report, 'w', encoding='utf-8') as f:
+            document = dict((target_name, report.to_dict()) for target_name, report in six.iteritems(reports))
+            f.write(six.text_type(json.dumps(document, indent=4, sort_keys=True)) + u"\n")
+
+    violations = []
+    for target_name, report in sorted(six.iteritems(reports)):
+        violations.extend(u"{0}: {1}".format(target_name, violation)
+                          for violation in report.check(args.max_bytes, args.max_include_bytes))
+    for violation in violations:
+        print(u"frosty: size budget exceeded: {0}".format(violation), file=sys.stderr)
+    return 3 if violations else 0
@@ -4,9 +4,28 @@ from __future__ import absolute_import
 
 import six
 import sys
+import time
 
 from contextlib import contextmanager
 
+from .files import BYTECODE_SUFFIXES, EXTENSION_SUFFIXES, SOURCE_SUFFIXES
+
+# Highest resolution clock available for measuring elapsed time
+timer = getattr(time, 'perf_counter', time.time)
+
+try:
+    from concurrent import futures
+except ImportError:  # Python 2 without the futures backport
+    futures = None
+
+try:
+    from os import scandir
+except ImportError:  # Python < 3.5
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 
 class UnicodeMixin(object):
     """
@@ -43,4 +62,95 @@ if sys.version_info < (3, 4, 0, 'final', 0):
         try:
             yield
         except exceptions:
-            pass
\ No newline at end of file
+            pass
+
+if sys.version_info >= (3, 4, 0, 'final', 0):
+    from importlib.machinery import PathFinder
+    from importlib.util import find_spec as _find_top_level_spec
+
+    def find_module_location(name, path=None):
+        """
+        Find the disk location of a module without executing it (or any of its parent packages).
+
+        :param name: Fully qualified module name
+        :param path: Search locations of the parent package (None = top level module)
+        :return: 2-tuple of the module origin (None if it has no location) and its submodule search locations (None if
+                 it isn't a package), or None if the module could not be found
+        """
+        if path is None:
+            spec = _find_top_level_spec(name)
+        else:
+            spec = PathFinder.find_spec(name, list(path))
+        if spec is None:
+            return None
+        origin = spec.origin if spec.has_location else None
+        search_locations = spec.submodule_search_locations
+        if search_locations is not None:
+            search_locations = list(search_locations)
+        return origin, search_locations
+else:
+    import imp
+    import os
+    import pkgutil
+    import zipimport
+
+    def _find_archive_location(name, path=None):
+        """
+        Find a module inside a zip archive on the search path (imp.find_module only searches directories)
+        """
+        for entry in (sys.path if path is None else path):
+            importer = pkgutil.get_importer(entry)
+            if not isinstance(importer, zipimport.zipimporter) or importer.find_module(name) is None:
+                continue
+            origin = importer.get_filename(name)
+            return origin, [os.path.dirname(origin)] if importer.is_package(name) else None
+        return None
+
+    def find_module_location(name, path=None):
+        """
+        Find the disk location of a module without executing it (or any of its parent packages).
+
+        :param name: Fully qualified module name
+        :param path: Search locations of the parent package (None = top level module)
+        :return: 2-tuple of the module origin (None if it has no location) and its submodule search locations (None if
+                 it isn't a package), or None if the module could not be found
+        """
+        try:
+            module_file, pathname, (suffix, mode, module_type) = imp.find_module(name.rpartition('.')[2], path)
+        except ImportError:
+            return _find_archive_location(name, path)
+        if module_file:
+            module_file.close()
+        if module_type == imp.PKG_DIRECTORY:
+            for init_suffix in ('.py', '.pyc', '.pyo'):
+                init_path = os.path.join(pathname, '__init__' + init_suffix)
+                if os.path.exists(init_path):
+                    return init_path, [pathname]
+            return None, [pathname]
+        if module_type in (imp.C_BUILTIN, imp.PY_FROZEN):
+            return None, None
+        return pathname, None
+
+
+def iter_entry_points(group):
+    """
+    List the entry points registered for a group, without loading any of them.
+
+    :return: list of entry points (each with a name and a load() method)
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8
+        entry_points = None
+
+    if entry_points is not None:
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, 'select'):
+            return list(all_entry_points.select(group=group))
+        return list(all_entry_points.get(group, []))
+
+    try:
+        import pkg_resources
+    except ImportError:
+        return []
+    return list(pkg_resources.iter_entry_points(group))
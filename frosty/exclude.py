@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import fnmatch
+import hashlib
+import re
+import six
+
+
+class ExcludePatterns(object):
+    """
+    Patterns of dotted module names to leave out of the includes.
+
+    Strings are glob patterns (fnmatch style, where "*" also matches dots), and compiled regular expressions are matched
+    from the start of the name (re.match):
+
+        ExcludePatterns(['*.tests', '*.test.*', re.compile(r'.*\\._vendor\\b')])
+
+    Freezer strategies check names while they walk, so an excluded package is never descended into.  All of the glob
+    patterns are combined into a single regular expression, so a check costs the same however many there are.
+    """
+    def __init__(self, patterns):
+        """
+        :param patterns: iterable of glob strings and compiled regular expressions
+        """
+        self.patterns = tuple(patterns)
+        globs = [pattern for pattern in self.patterns if isinstance(pattern, six.string_types)]
+        self._expressions = [pattern for pattern in self.patterns if not isinstance(pattern, six.string_types)]
+        if globs:
+            self._expressions.insert(0, re.compile(u"|".join(u"(?:{0})".format(fnmatch.translate(glob))
+                                                             for glob in globs)))
+
+    def __call__(self, name):
+        """
+        True if the dotted name is excluded
+        """
+        for expression in self._expressions:
+            if expression.match(name):
+                return True
+        return False
+
+    @property
+    def key(self):
+        """
+        Stable identifier of the patterns (for cache keys)
+        """
+        text = u"\n".join(pattern if isinstance(pattern, six.string_types) else u"re:" + pattern.pattern
+                          for pattern in self.patterns)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+    def __repr__(self):
+        return u"ExcludePatterns({0!r})".format(list(self.patterns))
+
+
+def resolve_exclude(exclude):
+    """
+    Build the exclusion check given an exclude setting from the programmer.
+
+    :param exclude: None = exclude nothing, a single pattern, an iterable of patterns, or an ExcludePatterns
+    :return: ExcludePatterns instance or None
+    """
+    if exclude is None or isinstance(exclude, ExcludePatterns):
+        return exclude
+    if isinstance(exclude, six.string_types) or hasattr(exclude, 'match'):
+        exclude = [exclude]
+    exclude = list(exclude)
+    if not exclude:
+        return None
+    return ExcludePatterns(exclude)
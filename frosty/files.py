@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Shared by the build and by the modules that run inside frozen applications (frosty.index, frosty.lazy and
+# frosty.profile), so this only imports what the interpreter has loaded at start up anyway.
+from __future__ import absolute_import
+
+import os
+import sys
+
+if sys.version_info >= (3, 3, 0, 'final', 0):
+    from importlib.machinery import BYTECODE_SUFFIXES, EXTENSION_SUFFIXES, SOURCE_SUFFIXES
+else:
+    import imp
+
+    # Same lists as importlib.machinery (every file suffix the running interpreter can import a module from)
+    SOURCE_SUFFIXES = [suffix for suffix, mode, module_type in imp.get_suffixes() if module_type == imp.PY_SOURCE]
+    BYTECODE_SUFFIXES = [suffix for suffix, mode, module_type in imp.get_suffixes() if module_type == imp.PY_COMPILED]
+    EXTENSION_SUFFIXES = [suffix for suffix, mode, module_type in imp.get_suffixes() if module_type == imp.C_EXTENSION]
+
+
+class MODULE(object):
+    """
+    Constants for the kinds of files a module can be imported from
+    """
+
+    SOURCE = u"source"  # Python source (.py)
+    BYTECODE = u"bytecode"  # Sourceless bytecode (.pyc)
+    EXTENSION = u"extension"  # Native extension module (.so, .pyd, including Cython modules)
+
+    ALL = set([SOURCE, BYTECODE, EXTENSION])
+
+
+# Every importable suffix of the running interpreter, longest first so that ".cpython-34m.so" wins over ".so"
+_MODULE_SUFFIXES = sorted([(suffix, MODULE.SOURCE) for suffix in SOURCE_SUFFIXES] +
+                          [(suffix, MODULE.BYTECODE) for suffix in BYTECODE_SUFFIXES] +
+                          [(suffix, MODULE.EXTENSION) for suffix in EXTENSION_SUFFIXES],
+                          key=lambda item: -len(item[0]))
+
+# True if a name can be imported as a module (Python 3 also allows non-ASCII names)
+if hasattr(str, 'isidentifier'):
+    is_identifier = str.isidentifier
+else:  # Python 2 (only ASCII identifiers)
+    import re
+    is_identifier = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$').match
+
+
+def split_module_file(filename):
+    """
+    Split a file name into the name and kind of the module it can be imported as
+
+    :param filename: File name (without a directory)
+    :return: 2-tuple of the module name and its kind (See MODULE constants), or None if it isn't a module file
+    """
+    for suffix, kind in _MODULE_SUFFIXES:
+        if filename.endswith(suffix):
+            name = filename[:-len(suffix)]
+            if is_identifier(name):
+                return name, kind
+            # A shorter suffix may still fit (Python 2 imports "module.so" through ".so", not "module.so")
+    return None
+
+
+def replace_file(source, destination):
+    """
+    Move source over destination, atomically where the platform allows it
+    """
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import hashlib
+import io
+import json
+import os
+import platform
+import six
+import sys
+import tempfile
+
+from functools import partial
+
+from .files import replace_file
+from .report import BuildReport
+from .walk import include_attribution
+from .workers import map_workers
+
+
+_FINGERPRINT_FORMAT = 2
+
+# Bytes read at a time while hashing a file
+_CHUNK_SIZE = 1 << 20
+
+
+def _hash_file(path):
+    """
+    Content hash of a single file (None if it can't be read)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(partial(f.read, _CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except (IOError, OSError):
+        return None
+    return digest.hexdigest()
+
+
+def _stat_key(path):
+    """
+    What a cached content hash is checked against (None if the file doesn't exist)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size, stat.st_ino]
+
+
+def hash_files(paths, cache=None, workers=None, pool=None):
+    """
+    Content hashes of many files, concurrently.  A file whose mtime, size and inode are the same as when the cache last
+    hashed it isn't read again.
+
+    :param paths: iterable of file paths
+    :param cache: IncludeCache that remembers hashes between builds (None = hash every file)
+    :param workers: Number of files to hash concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See POOL constants, None = POOL.THREAD)
+    :return: dict of path -> sha256 hex digest (None for files that couldn't be read)
+    """
+    known = cache.file_hashes() if cache is not None else {}
+    hashes, stale, keys = {}, [], {}
+    for path in sorted(set(paths)):
+        absolute_path = os.path.abspath(path)
+        key = keys[path] = _stat_key(absolute_path)
+        cached = known.get(absolute_path)
+        if key is not None and cached is not None and cached[:3] == key:
+            hashes[path] = cached[3]
+        else:
+            stale.append(path)
+
+    for path, digest in zip(stale, map_workers(_hash_file, stale, workers=workers, pool=pool)):
+        hashes[path] = digest
+        if digest is not None and keys[path] is not None:
+            known[os.path.abspath(path)] = keys[path] + [digest]
+
+    if cache is not None and stale:
+        cache.store_file_hashes(known)
+    return hashes
+
+
+class BuildFingerprint(BuildReport):
+    """
+    Deterministic fingerprint of a build: the freezer, the interpreter, the sorted includes, and the content hash of
+    every file that the includes pull into the bundle (modules and the package data beside them, See
+    frosty.walk.include_attribution).  Two builds with the same fingerprint freeze the same application, so a build
+    script can skip the freeze step:
+
+        >>>fingerprint = BuildFingerprint()
+        >>>includes = build_includes(['salt'], fingerprint=fingerprint, cache=True)
+        >>>if not fingerprint.matches('build/frosty.fingerprint'):
+        >>>    freeze(includes)
+        >>>    fingerprint.write('build/frosty.fingerprint')
+
+    The files are the ones listed by the build's own walk, so nothing is walked again.  They are named by their path
+    beneath the top-level package (e.g. "salt/modules/git.py"), so the fingerprint is the same wherever the packages
+    are installed.
+    """
+    def __init__(self, callbacks=None):
+        """
+        :param callbacks: callable (or list of callables) called with this object once the fingerprint is computed
+        """
+        super(BuildFingerprint, self).__init__(callbacks)
+        self.freezer = None
+        self.includes = []
+        self.files = {}  # file name beneath its top-level package -> content hash
+        self.digest = None
+
+    def finish(self, freezer, includes, packages, exclude=None, cache=None, workers=None, pool=None):
+        """
+        Compute the fingerprint, and report it to every callback
+
+        :param freezer: Freezer the includes were built for
+        :param includes: final set of includes
+        :param packages: list of frosty.walk.PackageFiles recorded by the build
+        :param exclude: frosty.exclude.ExcludePatterns compatible check of the modules that the build left out (None =
+                        exclude nothing)
+        :param cache: IncludeCache that remembers file hashes between builds (None = hash every file)
+        :param workers: Number of files to hash concurrently (None = one at a time)
+        :param pool: Kind of worker pool used when workers is set (See POOL constants, None = POOL.THREAD)
+        """
+        attribute = include_attribution(includes, exclude=exclude)
+        files = {}  # file name -> path
+        for package_files in packages:
+            for package, module, kind, path in package_files.files:
+                if attribute(package, module) is None:
+                    continue
+                parts = package.split(u".")
+                if package_files.package_dir is None:
+                    # A plain module is named after the package it is in
+                    parts = parts[:-1]
+                files[u"/".join(parts + [os.path.basename(path)])] = path
+
+        hashes = hash_files(files.values(), cache=cache, workers=workers, pool=pool)
+        self.freezer = six.text_type(freezer)
+        self.includes = sorted(includes)
+        self.files = dict((name, hashes[path]) for name, path in six.iteritems(files))
+
+        document = json.dumps(self._fingerprinted(), sort_keys=True, separators=(',', ':'))
+        self.digest = hashlib.sha256(document.encode('utf-8')).hexdigest()
+        self._report()
+
+    def _fingerprinted(self):
+        return {
+            u"format": _FINGERPRINT_FORMAT,
+            u"freezer": self.freezer,
+            u"python": u"{0}-{1}.{2}".format(platform.python_implementation(), *sys.version_info[:2]),
+            u"includes": self.includes,
+            u"files": self.files,
+        }
+
+    def to_dict(self):
+        document = self._fingerprinted()
+        document[u"digest"] = self.digest
+        return document
+
+    def write(self, path):
+        """
+        Atomically write the fingerprint to a file (See matches)
+        """
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=u".tmp")
+        with io.open(handle, 'w', encoding='utf-8') as f:
+            f.write(six.text_type(json.dumps(self.to_dict(), indent=4, sort_keys=True)) + u"\n")
+        replace_file(temp_path, path)
+
+    def matches(self, path):
+        """
+        True if the fingerprint written to path (See write) is the same as this one (False if there is none)
+        """
+        try:
+            with io.open(path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+        return isinstance(previous, dict) and previous.get(u"digest") == self.digest
+
+    def __eq__(self, other):
+        return isinstance(other, BuildFingerprint) and self.digest == other.digest
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+def resolve_fingerprint(fingerprint):
+    """
+    Locate the appropriate build fingerprint given a fingerprint setting from the programmer.
+
+    :param fingerprint: None/False = no fingerprint, a callback, or a BuildFingerprint (to read the fingerprint back
+                        after the build)
+    :return: BuildFingerprint instance or None
+    """
+    return BuildFingerprint.resolve(fingerprint, u"fingerprint")
@@ -3,12 +3,18 @@
 from __future__ import absolute_import
 
 import os
-import re
 import six
 
+from functools import partial
 from warnings import warn
 
-from .compat import UnicodeMixin
+from .compat import UnicodeMixin, iter_entry_points, timer
+from .locations import PackageLocation
+from .stats import PackageStats
+from .trie import IncludeTrie
+from .walk import MODULE, PackageFiles, PackageTree, find_archive, init_file, iter_module_files, namespace_members, \
+    split_module_file, walk_packages
+from .workers import map_workers
 
 
 class _Default(UnicodeMixin, object):
@@ -18,30 +24,86 @@ class _Default(UnicodeMixin, object):
     Although freezers should generally not require a custom class (patches welcome!), if one was going to create
     their own freezer, then this would be the class to inherit from.
     """
+
+    # Whether the freezer understands "package.*" wild cards (See frosty.trie.IncludeTrie)
+    wildcards = True
+
+    # setup() command whose options hold the includes (None = the freezer takes includes directly)
+    options_command = None
+
     @classmethod
     def _split_packages(cls, include_packages):
         """
         Split an iterable of packages into packages that need to be passed through, and those that need to have their
         disk location resolved.
 
-        Some modules don't have a '__file__' attribute.  AFAIK these aren't packages, so they can just be passed
-        through to the includes as-is
+        Packages may be imported modules or PackageLocation instances (See frosty.locations); either way only their
+        location is used, so nothing is imported here.  Some modules don't have a disk location (built-ins).  AFAIK
+        these aren't packages, so they can just be passed through to the includes as-is.  Namespace packages (PEP 420)
+        are passed through too, and every regular package and module in any of their portions becomes a package root.
         :return: 2-tuple of a list of the pass-through includes and the package_root_paths
         """
+        locations = [PackageLocation.from_module(package) for package in include_packages]
         passthrough_includes = set([
-            six.text_type(package.__name__)
-            for package in include_packages
-            if not hasattr(package, '__file__')
+            location.name
+            for location in locations
+            if location.origin is None
         ])
         package_file_paths = dict([
-            (six.text_type(os.path.abspath(package.__file__)), six.text_type(package.__name__))
-            for package in include_packages
-            if hasattr(package, '__file__')
+            (location.origin, location.name)
+            for location in locations
+            if location.origin is not None
         ])
+        for location in locations:
+            if location.origin is None and location.is_package:
+                namespaces, members = namespace_members(location.name, location.search_locations)
+                passthrough_includes |= namespaces
+                for package_path, package_name in six.iteritems(members):
+                    package_file_paths.setdefault(package_path, package_name)
         return passthrough_includes, package_file_paths
 
     @classmethod
-    def build_includes(cls, include_packages):
+    def _package_dir(cls, package_path):
+        """
+        Directory to walk for sub-packages of the package defined at package_path (None = a plain module)
+        """
+        split = split_module_file(os.path.basename(package_path))
+        if split is not None and split[0] == u"__init__":
+            return os.path.dirname(package_path)
+        return None
+
+    @classmethod
+    def _dotted_name(cls, package_name, package_dir, path):
+        """
+        Translate a path within package_dir into a dotted name (module file extensions are dropped)
+        """
+        relative_path = os.path.splitext(os.path.relpath(path, package_dir))[0]
+        if relative_path == os.curdir:
+            return package_name
+        return u".".join([package_name] + relative_path.split(os.sep))
+
+    @classmethod
+    def _walk_package(cls, package_name, package_dir, walk=walk_packages, exclude=None, excluded=None):
+        """
+        Walk a package directory, never descending into sub-packages whose dotted name is excluded
+
+        :param exclude: frosty.exclude.ExcludePatterns (None = exclude nothing)
+        :param excluded: list that the names of the pruned sub-packages are appended to (None = don't record them)
+        """
+        for root, dirs, files in walk(package_dir):
+            if exclude is not None:
+                kept = []
+                for name in dirs:
+                    dotted_name = cls._dotted_name(package_name, package_dir, os.path.join(root, name))
+                    if not exclude(dotted_name):
+                        kept.append(name)
+                    elif excluded is not None:
+                        excluded.append(dotted_name)
+                dirs[:] = kept
+            yield root, dirs, files
+
+    @classmethod
+    def _iter_package_includes(cls, package_path, package_name, walk=walk_packages, exclude=None):
         """
         The default include strategy is to add a star (*) wild card after all sub-packages (but not the main package).
         This strategy is compatible with py2app and bbfreeze.
@@ -53,34 +115,223 @@ class _Default(UnicodeMixin, object):
             salt.modules.*
             etc...
 
-        :param include_packages: List of package references to recurse for subpackages
-        """
-        includes, package_root_paths = cls._split_packages(include_packages)
-        for package_path, package_name in six.iteritems(package_root_paths):
-            if re.search(r'__init__.py.*$', package_path):
-                # Looks like a package.  Walk the directory and see if there are more.
-                package_files = set([os.path.dirname(package_path)])
-                for root, dirs, files in os.walk(os.path.dirname(package_path)):
-                    if '__init__.py' in files:
-                        package_files.add(root)
-
-                if len(package_files) > 1:
-                    common_prefix = os.path.commonprefix(package_files)
-                    common_dir = os.path.dirname(common_prefix)
-                    package_tails = set([f[len(common_dir) + len(os.sep):] for f in package_files])
-                    package_names = set([tail.replace(os.sep, '.') for tail in package_tails])
-                    package_names_with_star = set([pkg + '.*' if pkg != package_name else pkg for pkg in package_names])
-                    includes |= package_names_with_star
-
-                else:
-                    # No sub-packages.  Just add the package name by itself.
-                    includes.add(package_name)
+        :param package_path: File that defines the package
+        :param package_name: Fully qualified name of the package
+        :param walk: walk_packages compatible function used to traverse the package directory
+        :param exclude: frosty.exclude.ExcludePatterns checked against every name (None = exclude nothing)
+        :return: generator of the includes for the package, in walk order
+        """
+        if exclude is not None and exclude(package_name):
+            return
+        yield package_name
+
+        package_dir = cls._package_dir(package_path)
+        if package_dir is None:
+            # Not a package.  Just add the module.
+            return
+
+        # Looks like a package.  Walk the directory and see if there are more.
+        for root, dirs, files in cls._walk_package(package_name, package_dir, walk=walk, exclude=exclude):
+            if root != package_dir:
+                include = cls._dotted_name(package_name, package_dir, root) + u".*"
+                if exclude is None or not exclude(include):
+                    yield include
+
+    @classmethod
+    def _iter_package_modules(cls, package_path, package_name, walk=walk_packages, exclude=None, excluded=None):
+        """
+        Every module in a package, in walk order.  Modules are found in every form the interpreter can import them
+        from: source, sourceless bytecode and native extensions (See frosty.walk.MODULE).
+
+        :param exclude: frosty.exclude.ExcludePatterns checked against every module name (None = exclude nothing)
+        :param excluded: list that the names of excluded modules are appended to (None = don't record them)
+        :return: generator of (module name, whether the module is a package, file that defines the module) 3-tuples
+        """
+        if exclude is not None and exclude(package_name):
+            return
+        package_dir = cls._package_dir(package_path)
+        yield package_name, package_dir is not None, package_path
+        if package_dir is None:
+            return
+
+        archive = find_archive(package_dir) is not None
+        for root, dirs, files in cls._walk_package(package_name, package_dir, walk=walk, exclude=exclude,
+                                                   excluded=excluded):
+            if root != package_dir:
+                init_path = os.path.join(root, init_file(files, archive=archive) or u"__init__.py")
+                yield cls._dotted_name(package_name, package_dir, root), True, init_path
+            for module, filename, kind in iter_module_files(files, archive=archive):
+                module_name = cls._dotted_name(package_name, package_dir, os.path.join(root, module))
+                if exclude is not None and exclude(module_name):
+                    if excluded is not None:
+                        excluded.append(module_name)
+                    continue
+                yield module_name, False, os.path.join(root, filename)
+
+    @classmethod
+    def native_modules(cls, include_packages, exclude=None):
+        """
+        Native extension modules in (and beneath) every package
+
+        :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+        :param exclude: frosty.exclude.ExcludePatterns (None = exclude nothing)
+        :return: dict of module name -> file of the extension module
+        """
+        native = {}
+        for module_name, package, path in cls.module_files(include_packages, exclude=exclude):
+            split = split_module_file(os.path.basename(path))
+            if split is not None and split[1] == MODULE.EXTENSION:
+                native[module_name] = path
+        return native
+
+    @classmethod
+    def module_files(cls, include_packages, exclude=None):
+        """
+        Every module in (and beneath) every package, e.g. to precompile them (See frosty.bytecode.compile_modules)
+
+        :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+        :param exclude: frosty.exclude.ExcludePatterns (None = exclude nothing)
+        :return: list of (module name, whether the module is a package, file that defines the module) 3-tuples
+        """
+        passthrough_includes, package_root_paths = cls._split_packages(include_packages)
+        modules = []
+        for package_path, package_name in sorted(six.iteritems(package_root_paths)):
+            modules.extend(cls._iter_package_modules(package_path, package_name, exclude=exclude))
+        return modules
+
+    @classmethod
+    def _package_includes(cls, package_path, package_name, walk=walk_packages, compact=False, exclude=None):
+        """
+        Set of includes for a single package (See _iter_package_includes for the strategy)
+
+        With compact, every module in the package is included instead, in the fewest names the freezer understands:
+        complete packages collapse to "package.*" for freezers with wild cards, and are listed module by module for
+        the others.  A package with excluded modules is never collapsed.
+        """
+        if not compact:
+            if exclude is None:
+                # Custom strategies may not know about exclusions
+                return set(cls._iter_package_includes(package_path, package_name, walk=walk))
+            return set(cls._iter_package_includes(package_path, package_name, walk=walk, exclude=exclude))
+
+        trie = IncludeTrie()
+        excluded = []
+        for module_name, package, path in cls._iter_package_modules(package_path, package_name, walk=walk,
+                                                                    exclude=exclude, excluded=excluded):
+            trie.add_module(module_name, package=package)
+            trie.add(module_name)
+        for module_name in excluded:
+            # Known but not included, so that no wild card covers it
+            trie.add_module(module_name)
+        return set(trie.compact() if cls.wildcards else trie.expand())
+
+    @classmethod
+    def _exclude_packages(cls, passthrough_includes, package_root_paths, exclude):
+        """
+        Drop the excluded names from the result of _split_packages
+        """
+        if exclude is None:
+            return passthrough_includes, package_root_paths
+        passthrough_includes = set(include for include in passthrough_includes if not exclude(include))
+        package_root_paths = dict((package_path, package_name)
+                                  for package_path, package_name in six.iteritems(package_root_paths)
+                                  if not exclude(package_name))
+        return passthrough_includes, package_root_paths
+
+    @classmethod
+    def iter_includes(cls, include_packages, exclude=None):
+        """
+        Yield includes for every package as soon as each package directory is found.
+
+        Nothing is collected along the way, so the memory used doesn't grow with the size of the package trees.  Names
+        are unique within a package, but a package listed along with one of its own sub-packages may yield a name
+        twice.
+
+        :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+        :param exclude: frosty.exclude.ExcludePatterns (None = exclude nothing)
+        """
+        passthrough_includes, package_root_paths = cls._exclude_packages(*cls._split_packages(include_packages),
+                                                                         exclude=exclude)
+        for include in sorted(passthrough_includes):
+            yield include
+        for package_path, package_name in sorted(six.iteritems(package_root_paths)):
+            if exclude is None:
+                includes = cls._iter_package_includes(package_path, package_name)
             else:
-                # Not a package.  Just add the module.
-                includes.add(package_name)
+                includes = cls._iter_package_includes(package_path, package_name, exclude=exclude)
+            for include in includes:
+                yield include
+
+    @classmethod
+    def build_includes(cls, include_packages, cache=None, workers=None, pool=None, stats=None, compact=False,
+                       exclude=None, files=None):
+        """
+        Build the includes for every package (See _package_includes for the strategy)
+
+        :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+        :param cache: IncludeCache to reuse the results of earlier walks from (None = always walk)
+        :param workers: Number of packages to walk concurrently (None = one at a time)
+        :param pool: Kind of worker pool used when workers is set (See frosty.workers.POOL constants)
+        :param stats: BuildStats to record phase and per-package measurements in (None = measure nothing)
+        :param compact: Include every module, in the fewest names the freezer understands (See _package_includes)
+        :param exclude: frosty.exclude.ExcludePatterns of names to leave out (excluded packages are never walked)
+        :param files: list that the frosty.walk.PackageFiles of every package are appended to, as listed by the walk
+                      that built its includes (None = record nothing).  Cached packages are replayed from the cache.
+        """
+        includes, jobs = cls._package_jobs(include_packages, cache=cache, stats=stats, compact=compact, exclude=exclude,
+                                           files=files)
+        start = timer() if stats is not None else None
+        results = map_workers(_build_package_includes, jobs, workers=workers, pool=pool)
+        includes = cls._merge_package_results(includes, results, stats=stats, files=files)
+        if stats is not None:
+            stats.add_phase(u"packages", timer() - start)
+        return includes
 
+    @classmethod
+    def _package_jobs(cls, include_packages, cache=None, stats=None, compact=False, exclude=None, files=None):
+        """
+        Split the packages (the "split" phase of stats) into the includes that need no walk, and one
+        _build_package_includes job for every package that does (See build_includes for the parameters)
+
+        :return: 2-tuple of the set of includes that need no walk and the list of jobs
+        """
+        start = timer() if stats is not None else None
+        includes, package_root_paths = cls._exclude_packages(*cls._split_packages(include_packages), exclude=exclude)
+        if stats is not None:
+            stats.add_phase(u"split", timer() - start)
+
+        options = {u"cache": cache, u"measure": stats is not None, u"compact": compact, u"exclude": exclude,
+                   u"files": files is not None}
+        jobs = [(cls, package_path, package_name, options)
+                for package_path, package_name in sorted(six.iteritems(package_root_paths))]
+        return includes, jobs
+
+    @staticmethod
+    def _merge_package_results(includes, results, stats=None, files=None):
+        """
+        Merge the results of _build_package_includes jobs into includes (updated in place), stats and files
+        """
+        for package_includes, package_stats, package_files in results:
+            includes |= package_includes
+            if package_stats is not None:
+                stats.add_package(package_stats)
+            if package_files is not None:
+                files.append(package_files)
         return includes
 
+    @classmethod
+    def setup_options(cls, includes):
+        """
+        Freezer ready options for a set of includes (e.g. {"py2exe": {"includes": [...]}} for setup(options=...))
+
+        :param includes: set of includes
+        :return: dict of options
+        """
+        options = {u"includes": sorted(includes)}
+        if cls.options_command:
+            options = {cls.options_command: options}
+        return options
+
     def __unicode__(self):
         return u"default"
 
@@ -88,10 +339,146 @@ class _Default(UnicodeMixin, object):
         return u"Default "
 
 
+def _build_package_includes(job):
+    """
+    Build the includes of a single package (module level, so that process pools can pickle it)
+
+    :param job: 4-tuple of the freezer class, package path, package name and a dict of options: cache (IncludeCache or
+                None), measure (whether to collect PackageStats), compact and exclude (See _Default._package_includes)
+                and files (whether to record the PackageFiles)
+    :return: 3-tuple of the set of includes, the PackageStats and the PackageFiles (None when not measured or recorded)
+    """
+    freezer, package_path, package_name, options = job
+    cache = options[u"cache"]
+    compact = options[u"compact"]
+    exclude = options[u"exclude"]
+    package_files = None
+    walk = walk_packages
+    if options[u"files"]:
+        package_dir = freezer._package_dir(package_path)
+        package_files = PackageFiles(package_name, package_path, package_dir)
+        walk = package_files.recorded_walk(walk)
+
+    if not options[u"measure"]:
+        if cache is not None:
+            includes = cache.package_includes(freezer, package_path, package_name, compact=compact, exclude=exclude)
+        else:
+            includes = freezer._package_includes(package_path, package_name, walk=walk, compact=compact,
+                                                 exclude=exclude)
+        return includes, None, _cached_package_files(freezer, package_name, package_files, cache, exclude)
+
+    package_stats = PackageStats(package_name, package_path)
+    start = timer()
+    if cache is not None:
+        includes = cache.package_includes(freezer, package_path, package_name, package_stats=package_stats,
+                                          compact=compact, exclude=exclude)
+    else:
+        includes = freezer._package_includes(package_path, package_name, walk=package_stats.timed_walk(walk),
+                                             compact=compact, exclude=exclude)
+    package_stats.seconds = timer() - start
+    package_stats.includes = len(includes)
+    return includes, package_stats, _cached_package_files(freezer, package_name, package_files, cache, exclude)
+
+
+def _cached_package_files(freezer, package_name, package_files, cache, exclude):
+    """
+    Record the files of a package that the cache built the includes of, from the listings of its cached walk
+    """
+    if package_files is not None and cache is not None and package_files.package_dir is not None:
+        package_files.record(freezer._walk_package(package_name, package_files.package_dir,
+                                                   walk=cache.package_walk(package_files.package_dir), exclude=exclude))
+    return package_files
+
+
+def _build_tree_includes(job):
+    """
+    Build the includes of one package directory for several freezers from a single scan (module level, so that process
+    pools can pickle it)
+
+    :param job: 3-tuple of the package directory, a list of (key, freezer class, package path, package name) 4-tuples
+                and a dict of options: cache (IncludeCache or None), compact and exclude (See _Default._package_includes)
+    :return: list of (key, set of includes) 2-tuples
+    """
+    package_dir, members, options = job
+    cache = options[u"cache"]
+    compact = options[u"compact"]
+    exclude = options[u"exclude"]
+    tree = None
+    results = []
+    for key, freezer, package_path, package_name in members:
+        if cache is not None:
+            # The cache keeps one entry per package directory, so only the first freezer lists the directories
+            includes = cache.package_includes(freezer, package_path, package_name, compact=compact, exclude=exclude)
+        else:
+            if tree is None:
+                # Exclusions are the same for every freezer, so the scan itself can skip the excluded packages
+                tree = PackageTree(package_dir, walk=partial(_pruned_walk, package_name, exclude))
+            includes = freezer._package_includes(package_path, package_name, walk=tree.walk, compact=compact,
+                                                 exclude=exclude)
+        results.append((key, includes))
+    return results
+
+
+def _pruned_walk(package_name, exclude, package_dir):
+    """
+    walk_packages that never descends into excluded sub-packages
+    """
+    return _Default._walk_package(package_name, package_dir, exclude=exclude)
+
+
+def build_shared_includes(freezers, include_packages, cache=None, workers=None, pool=None, compact=False,
+                          exclude=None):
+    """
+    Build the includes of several freezers at once, scanning each package directory only once.
+
+    Every freezer strategy is derived from the same in-memory package tree (See frosty.walk.PackageTree).  Custom
+    freezers that don't derive from FREEZER.DEFAULT build their includes on their own.
+
+    :param freezers: dict of key -> freezer instance
+    :param include_packages: List of package references (or PackageLocation instances) to recurse for subpackages
+    :param cache: IncludeCache to reuse the results of earlier walks from (None = always walk)
+    :param workers: Number of package directories to scan concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See frosty.workers.POOL constants)
+    :param compact: Include every module, in the fewest names each freezer understands (See _package_includes)
+    :param exclude: frosty.exclude.ExcludePatterns of names to leave out (excluded packages are never walked)
+    :return: dict of key -> set of includes
+    """
+    results = {}
+    jobs = {}  # package directory -> list of (key, freezer class, package path, package name)
+    for key, freezer in sorted(six.iteritems(freezers)):
+        if not isinstance(freezer, _Default):
+            if exclude is None:
+                results[key] = freezer.build_includes(include_packages)
+            else:
+                results[key] = freezer.build_includes(include_packages, exclude=exclude)
+            continue
+
+        cls = freezer.__class__
+        includes, package_root_paths = cls._exclude_packages(*cls._split_packages(include_packages), exclude=exclude)
+        for package_path, package_name in sorted(six.iteritems(package_root_paths)):
+            package_dir = cls._package_dir(package_path)
+            if package_dir is None:
+                # Plain modules are never walked
+                includes |= cls._package_includes(package_path, package_name, compact=compact, exclude=exclude)
+            else:
+                jobs.setdefault(package_dir, []).append((key, cls, package_path, package_name))
+        results[key] = includes
+
+    options = {u"cache": cache, u"compact": compact, u"exclude": exclude}
+    jobs = [(package_dir, members, options) for package_dir, members in sorted(six.iteritems(jobs))]
+    for package_results in map_workers(_build_tree_includes, jobs, workers=workers, pool=pool):
+        for key, includes in package_results:
+            results[key] |= includes
+    return results
+
+
 class _Py2Exe(_Default):
     """
     Specific implementations for py2exe (http://www.py2exe.org/)
     """
+
+    options_command = u"py2exe"
+
     def __unicode__(self):
         return u"py2exe"
 
@@ -108,6 +495,9 @@ class _Py2App(_Default):
     """
     Specific implementations for py2app (http://pythonhosted.org//py2app/)
     """
+
+    options_command = u"py2app"
+
     def __unicode__(self):
         return u"py2app"
 
@@ -116,8 +506,12 @@ class _CxFreeze(_Default):
     """
     Specific implementations for cx_freeze (http://cx-freeze.sourceforge.net/)
     """
+
+    wildcards = False
+    options_command = u"build_exe"
+
     @classmethod
-    def build_includes(cls, include_packages):
+    def _iter_package_includes(cls, package_path, package_name, walk=walk_packages, exclude=None):
         """
         cx_freeze doesn't support the star (*) method of sub-module inclusion, so all submodules must be included
         explicitly.
@@ -132,26 +526,15 @@ class _CxFreeze(_Default):
             salt.fileserver.roots
             etc...
 
-        :param include_packages: List of package references to recurse for subpackages
-        """
-        includes, package_root_paths = cls._split_packages(include_packages)
-        for package_path, package_name in six.iteritems(package_root_paths):
-            includes.add(package_name)
-            if re.search(r'__init__.py.*$', package_path):
-                # Looks like a package.  Walk the directory and see if there are more.
-                package_modules = set()
-                for root, dirs, files in os.walk(os.path.dirname(package_path)):
-                    if '__init__.py' in files:
-                        package_modules.add(root)
-                        for module in [f for f in files if f != u"__init__.py" and f.endswith('.py')]:
-                            package_modules.add(os.path.join(root, module))
-
-                common_prefix = os.path.commonprefix(package_modules)
-                common_dir = os.path.dirname(common_prefix)
-                package_tails = set([f[len(common_dir) + len(os.sep):] for f in package_modules])
-                package_names = set([os.path.splitext(tail)[0].replace(os.sep, '.') for tail in package_tails])
-                includes |= package_names
-        return includes
+        :param package_path: File that defines the package
+        :param package_name: Fully qualified name of the package
+        :param walk: walk_packages compatible function used to traverse the package directory
+        :param exclude: frosty.exclude.ExcludePatterns checked against every name (None = exclude nothing)
+        :return: generator of the includes for the package, in walk order
+        """
+        for module_name, package, path in cls._iter_package_modules(package_path, package_name, walk=walk,
+                                                                    exclude=exclude):
+            yield module_name
 
     def __unicode__(self):
         return u"cxfreeze"
@@ -171,6 +554,96 @@ class FREEZER(object):
     ALL = set([DEFAULT, PY2EXE, PY2APP, BBFREEZE, CXFREEZE])
 
 
+# Packaging entry point group that third party freezer strategies (PyInstaller, Nuitka, briefcase, ...) register in:
+#
+#     entry_points={'frosty.freezers': ['pyinstaller = frosty_pyinstaller:PyInstallerFreezer']}
+ENTRY_POINT_GROUP = u"frosty.freezers"
+
+
+class _FreezerRegistry(object):
+    """
+    Freezer classes by normalised name, with one cached instance per class.
+
+    The built-in freezers are named on the first lookup, and entry points are only listed when a name isn't
+    built-in (and only the matching one is ever loaded), so plugins cost nothing at import time.
+    """
+    def __init__(self, builtins):
+        self._builtins = builtins
+        self._classes = None
+        self._registered = set()
+        self._instances = {}
+        self._entry_points = None
+
+    @staticmethod
+    def normalize(name):
+        return six.text_type(name).lower().strip()
+
+    def _ensure_builtins(self):
+        if self._classes is None:
+            self._classes = {}
+            for freezer in self._builtins:
+                self.register(six.text_type(freezer()), freezer)
+
+    def register(self, name, freezer):
+        """
+        Make a freezer class available by name
+        """
+        if self._classes is None:
+            self._ensure_builtins()
+        self._classes[self.normalize(name)] = freezer
+        self._registered.add(freezer)
+
+    def is_registered(self, freezer):
+        self._ensure_builtins()
+        return freezer in self._registered
+
+    def _load_entry_point(self, name):
+        if self._entry_points is None:
+            self._entry_points = dict((self.normalize(entry_point.name), entry_point)
+                                      for entry_point in iter_entry_points(ENTRY_POINT_GROUP))
+        entry_point = self._entry_points.pop(name, None)
+        if entry_point is None:
+            return None
+        freezer = entry_point.load()
+        self.register(name, freezer)
+        return freezer
+
+    def lookup(self, name):
+        """
+        Freezer class for a name (None if there is no such freezer)
+        """
+        self._ensure_builtins()
+        sanitized = self.normalize(name)
+        freezer = self._classes.get(sanitized)
+        if freezer is None:
+            freezer = self._load_entry_point(sanitized)
+        return freezer
+
+    def instance(self, freezer):
+        """
+        Cached instance of a freezer class (freezer strategies don't hold any state)
+        """
+        instance = self._instances.get(freezer)
+        if instance is None:
+            instance = self._instances[freezer] = freezer()
+        return instance
+
+
+_registry = _FreezerRegistry(FREEZER.ALL)
+
+
+def register_freezer(name, freezer):
+    """
+    Register a custom freezer class, so that it can be used by name and without warnings.
+
+    Installed packages can do the same without any code, by declaring an entry point in the "frosty.freezers" group.
+
+    :param name: Name of the freezer (case and surrounding white space are ignored)
+    :param freezer: Freezer class (generally a subclass of FREEZER.DEFAULT)
+    """
+    _registry.register(name, freezer)
+
+
 def _freezer_lookup(freezer_string):
     """
     Translate a string that may be a freezer name into the internal freezer constant
@@ -178,18 +651,16 @@ def _freezer_lookup(freezer_string):
     :param freezer_string
     :return:
     """
-    sanitized = freezer_string.lower().strip()
-    for freezer in FREEZER.ALL:
-        freezer_instance = freezer()
-        freezer_name = six.text_type(freezer_instance)
-        if freezer_name == six.text_type(sanitized):
-            return freezer
+    freezer = _registry.lookup(freezer_string)
+    if freezer is not None:
+        return freezer
+
+    sanitized = _registry.normalize(freezer_string)
+    if sanitized != freezer_string:
+        raise ValueError(u"Unsupported freezer type \"{0}\". (Sanitized to \"{1}\")".format(freezer_string,
+                                                                                          sanitized))
     else:
-        if sanitized != freezer_string:
-            raise ValueError(u"Unsupported freezer type \"{0}\". (Sanitized to \"{1}\")".format(freezer_string,
-                                                                                              sanitized))
-        else:
-            raise ValueError(u"Unsupported freezer type \"{0}\".".format(freezer_string))
+        raise ValueError(u"Unsupported freezer type \"{0}\".".format(freezer_string))
 
 
 def resolve_freezer(freezer):
@@ -201,24 +672,19 @@ def resolve_freezer(freezer):
     """
     # Set default freezer if there was none
     if not freezer:
-        return _Default()
+        return _registry.instance(_Default)
 
     # Allow character based lookups as well
     if isinstance(freezer, six.string_types):
         cls = _freezer_lookup(freezer)
-        return cls()
+        return _registry.instance(cls)
 
     # Allow plain class definition lookups (we instantiate the class)
     if freezer.__class__ == type.__class__:
         return freezer()
 
     # Warn when a custom freezer implementation is used.
-    if freezer not in FREEZER.ALL:
+    if not _registry.is_registered(freezer.__class__):
         warn(u"Using custom freezer implelmentation: {0}".format(freezer))
 
     return freezer
-
-
-
-
-
@@ -2,54 +2,238 @@
 #
 from __future__ import absolute_import
 
+import six
+
+from functools import partial
 from warnings import warn
 
-from .freezers import resolve_freezer
+from .bytecode import compile_modules
+from .cache import MemoryIncludeCache, resolve_cache
+from .compat import timer
+from .exclude import resolve_exclude
+from .fingerprint import resolve_fingerprint
+from .lazy import lazy_modules
+from .freezers import build_shared_includes, resolve_freezer
+from .locations import import_package_location, locate_package
+from .profile import resolve_profile
+from .sizes import resolve_sizes
+from .stats import resolve_stats
+from .workers import POOL, map_workers
 
 
-def _import_packages(packages, optional=None):
+class DISCOVERY(object):
     """
-    Get actual package references from an iterable of package names
+    Constants for selecting how packages are found before their includes are built
+    """
+
+    IMPORT = u"import"  # Import every package (executes package code, but always agrees with the running interpreter)
+    SPEC = u"spec"  # Resolve package locations from the import system's finders without executing anything
+    ISOLATED = u"isolated"  # Import every package in a subprocess, so import side effects stay out of the build
+
+    ALL = set([IMPORT, SPEC, ISOLATED])
+
+
+def _try_resolve(resolver, package_name):
+    """
+    Resolve a single package name (None if it couldn't be found)
+    """
+    try:
+        return resolver(package_name)
+    except ImportError:
+        return None
+
+
+def _resolve_packages(resolver, packages, optional=None, workers=None):
+    """
+    Resolve an iterable of package names with the given resolver, aggregating any failures.
+
+    :param resolver: callable that takes a package name and returns a reference (raises ImportError if not found)
     :param packages: iterable of package names
     :type packages: iter of basestr
+    :param optional: iterable of optional package names (will only issue a warning if they don't exist)
+    :param workers: Number of packages to resolve concurrently (None = one at a time)
     :return: set of package references
     :rtype: set
     """
-    if not optional:
-        optional = []
-
-    package_references = set()
+    packages = list(packages)
+    optional = list(optional or [])
 
-    # Check all reqiured packages
-    failures = set()
-    for package_name in packages:
-        try:
-            package_reference = __import__(package_name, globals(), locals(), [], 0)
-            package_references.add(package_reference)
-        except ImportError:
-            failures.add(package_name)
+    references = map_workers(partial(_try_resolve, resolver), packages + optional, workers=workers)
+    required_references = references[:len(packages)]
+    optional_references = references[len(packages):]
 
     # Report aggregated list of import failures (save a developer time when building a new frozen environment)
+    failures = set([name for name, reference in zip(packages, required_references) if reference is None])
     if failures:
         raise ImportError(u"Unable to find required packages: {0}".format(u", ".join(failures)))
 
-    # Check all optional packages (and warn if some aren't found)
-    failures = set()
-    for package_name in optional:
-        try:
-            package_reference = __import__(package_name, globals(), locals(), [], 0)
-            package_references.add(package_reference)
-        except ImportError:
-            failures.add(package_name)
-
     # Warn user which optional packages weren't found
+    failures = set([name for name, reference in zip(optional, optional_references) if reference is None])
     for failure in failures:
         warn(ImportWarning(u"Unable to import {0}".format(failure)))
 
-    return package_references
+    return set([reference for reference in references if reference is not None])
+
 
+def _import_package(package_name):
+    return __import__(package_name, globals(), locals(), [], 0)
 
-def build_includes(include_packages, freezer=None, optional=None):
+
+def _import_packages(packages, optional=None):
+    """
+    Get actual package references from an iterable of package names
+    :param packages: iterable of package names
+    :type packages: iter of basestr
+    :return: set of package references
+    :rtype: set
+    """
+    return _resolve_packages(_import_package, packages, optional=optional)
+
+
+def _locate_top_level(package_name):
+    """
+    Locate a package the way _import_package finds it: every level of a dotted name has to exist, but (like __import__)
+    the name resolves to its top-level package
+    """
+    location = locate_package(package_name)
+    top_level = package_name.partition(u".")[0]
+    return location if top_level == package_name else locate_package(top_level)
+
+
+def _locate_packages(packages, optional=None, top_level=True):
+    """
+    Get package locations from an iterable of package names, without importing any of them
+    :param packages: iterable of package names
+    :type packages: iter of basestr
+    :param top_level: Resolve dotted names to their top-level package, like every other discovery mode (False = the
+                      named package itself)
+    :return: set of package locations
+    :rtype: set of frosty.locations.PackageLocation
+    """
+    resolver = _locate_top_level if top_level else locate_package
+    return _resolve_packages(resolver, packages, optional=optional)
+
+
+def _isolated_packages(packages, optional=None, timeout=None, workers=None):
+    """
+    Get package locations from an iterable of package names, importing each one in its own subprocess
+    :param packages: iterable of package names
+    :type packages: iter of basestr
+    :param timeout: Seconds to wait for each import (None = wait forever)
+    :param workers: Number of subprocesses to run at once (None = one at a time)
+    :return: set of package locations
+    :rtype: set of frosty.locations.PackageLocation
+    """
+    resolver = partial(import_package_location, timeout=timeout)
+    return _resolve_packages(resolver, packages, optional=optional, workers=workers)
+
+
+def _discover_packages(packages, optional=None, discovery=None, timeout=None, workers=None):
+    """
+    Find the packages using the requested discovery mode (See DISCOVERY constants)
+    """
+    if not discovery or discovery == DISCOVERY.IMPORT:
+        return _import_packages(packages, optional=optional)
+    if discovery == DISCOVERY.SPEC:
+        return _locate_packages(packages, optional=optional)
+    if discovery == DISCOVERY.ISOLATED:
+        return _isolated_packages(packages, optional=optional, timeout=timeout, workers=workers)
+    raise ValueError(u"Unsupported discovery mode \"{0}\".".format(discovery))
+
+
+def _freezer_options(cache=None, workers=None, pool=None, stats=None, compact=False, exclude=None, files=None):
+    """
+    Keyword arguments for a freezer's build_includes.  Only the options that were asked for are passed on, so custom
+    freezers don't have to support all of them.
+    """
+    options = {}
+    if cache is not None:
+        options['cache'] = cache
+    if workers:
+        options['workers'] = workers
+        options['pool'] = pool
+    if stats is not None:
+        options['stats'] = stats
+    if compact:
+        options['compact'] = compact
+    if exclude is not None:
+        options['exclude'] = exclude
+    if files is not None:
+        options['files'] = files
+    return options
+
+
+class _Build(object):
+    """
+    Resolved settings of one include build, and the steps every builder shares before and after the freezer runs
+    (build_includes, build_batch_includes and frosty.aio.build_includes_async)
+
+    See build_includes for the parameters.
+    """
+    def __init__(self, freezer=None, cache=None, stats=None, compact=False, exclude=None, sizes=None, profile=None,
+                 keep=None, fingerprint=None):
+        self.freezer = resolve_freezer(freezer)
+        self.cache = resolve_cache(cache)
+        self.stats = resolve_stats(stats)
+        self.compact = compact
+        self.sizes = resolve_sizes(sizes)
+        self.profile = resolve_profile(profile)
+        self.keep = resolve_exclude(keep)
+        self.exclude = resolve_exclude(exclude)
+        if self.profile is not None:
+            # Packages that were never imported are never walked
+            self.exclude = self.profile.exclude(self.exclude, self.keep)
+        self.fingerprint = resolve_fingerprint(fingerprint)
+        # Files of every package, as listed by the walks, for the reports that need them (None = not recorded)
+        self.files = [] if self.sizes is not None or self.fingerprint is not None else None
+
+    def discover(self, include_packages, optional=None, discovery=None, timeout=None, workers=None):
+        """
+        Import (or locate) all listed packages to ensure that they exist (the "discovery" phase of stats)
+        """
+        start = timer() if self.stats is not None else None
+        package_references = _discover_packages(include_packages, optional=optional, discovery=discovery,
+                                                timeout=timeout, workers=workers)
+        if self.stats is not None:
+            self.stats.add_phase(u"discovery", timer() - start)
+        return package_references
+
+    def freezer_options(self, workers=None, pool=None):
+        """
+        Keyword arguments for the freezer's build_includes (See _freezer_options)
+        """
+        return _freezer_options(cache=self.cache, workers=workers, pool=pool, stats=self.stats, compact=self.compact,
+                                exclude=self.exclude, files=self.files)
+
+    def build(self, package_references, workers=None, pool=None):
+        """
+        Find all includes for the freezer
+        """
+        return self.finish(self.freezer.build_includes(package_references, **self.freezer_options(workers, pool)),
+                           workers=workers, pool=pool)
+
+    def finish(self, includes, workers=None, pool=None):
+        """
+        Trim the freezer's includes to the profile, and finish every report
+
+        :return: final set of includes
+        """
+        if self.profile is not None:
+            includes = self.profile.trim(includes, self.keep)
+
+        if self.stats is not None:
+            self.stats.finish()
+        if self.sizes is not None:
+            self.sizes.finish(includes, self.files, exclude=self.exclude)
+        if self.fingerprint is not None:
+            self.fingerprint.finish(self.freezer, includes, self.files, exclude=self.exclude, cache=self.cache,
+                                    workers=workers, pool=pool)
+        return includes
+
+
+def build_includes(include_packages, freezer=None, optional=None, discovery=None, cache=None, workers=None,
+                   pool=None, timeout=None, stats=None, compact=False, exclude=None, sizes=None, profile=None,
+                   keep=None, fingerprint=None):
     """
     Iterate the list of packages to build a complete list of those packages as well as all subpackages.
 
@@ -57,14 +241,254 @@ def build_includes(include_packages, freezer=None, optional=None):
     :type: include_pacakges: list of basestr
     :param freezer: The freezer to use (See FREEZER constants)
     :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT).  DISCOVERY.SPEC never
+                      executes package code, DISCOVERY.ISOLATED executes it in subprocesses.  Every mode resolves a
+                      dotted name the way __import__ does: "wheel.tool" has to exist, but includes the whole of wheel.
+    :param cache: Persistent include cache (See frosty.cache.resolve_cache.  None = walk every package every time)
+    :param workers: Number of packages to walk concurrently (None = one at a time).  Output is identical either way.
+    :param pool: Kind of worker pool used when workers is set (See POOL constants, None = POOL.THREAD)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param stats: Measure the build (See frosty.stats.resolve_stats.  None = measure nothing)
+    :param compact: Include every module, in the fewest names the freezer understands ("package.*" wild cards for
+                    freezers that support them, every module by name for the others)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :param sizes: Report the on-disk bytes that each include pulls into the bundle (See frosty.sizes.resolve_sizes.
+                  None = measure nothing)
+    :param profile: Import profile recorded by the frozen application (See frosty.profile.record_imports).  Only the
+                    modules it imported are included, and packages it never imported are never walked (See
+                    frosty.profile.resolve_profile.  None = include everything)
+    :param keep: Glob patterns (or compiled regular expressions) of dotted names to include even though the profile
+                 never imported them, e.g. plugins that are only loaded on some machines
+    :param fingerprint: Fingerprint the build, so that a build script can skip freezing when nothing changed (See
+                        frosty.fingerprint.resolve_fingerprint.  None = no fingerprint)
     :return: complete set of package includes
     """
+    build = _Build(freezer, cache=cache, stats=stats, compact=compact, exclude=exclude, sizes=sizes, profile=profile,
+                   keep=keep, fingerprint=fingerprint)
+    package_references = build.discover(include_packages, optional=optional, discovery=discovery, timeout=timeout,
+                                        workers=workers)
+    return build.build(package_references, workers=workers, pool=pool)
+
+
+def build_freezer_includes(include_packages, freezers, optional=None, discovery=None, cache=None, workers=None,
+                           pool=None, timeout=None, compact=False, exclude=None):
+    """
+    Build the includes of the same packages for several freezers, from one discovery and one scan of every package.
+
+    Example:
+
+        >>>build_freezer_includes(['salt'], [FREEZER.PY2EXE, FREEZER.PY2APP, FREEZER.CXFREEZE])
+        {u'py2exe': set([...]), u'py2app': set([...]), u'cxfreeze': set([...])}
+
+    :param include_packages: list of package names
+    :type: include_pacakges: list of basestr
+    :param freezers: The freezers to build includes for (See FREEZER constants)
+    :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param cache: Persistent include cache (See frosty.cache.resolve_cache.  None = scan every package once)
+    :param workers: Number of packages to scan concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See POOL constants, None = POOL.THREAD)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param compact: Include every module, in the fewest names each freezer understands (See build_includes)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :return: dict of freezer name -> complete set of package includes
+    """
+    freezers = dict((six.text_type(freezer), freezer) for freezer in [resolve_freezer(f) for f in freezers])
+    cache = resolve_cache(cache)
+    exclude = resolve_exclude(exclude)
+
+    package_references = _discover_packages(include_packages, optional=optional, discovery=discovery, timeout=timeout,
+                                            workers=workers)
+    return build_shared_includes(freezers, package_references, cache=cache, workers=workers, pool=pool,
+                                 compact=compact, exclude=exclude)
+
+
+def find_native_modules(include_packages, freezer=None, optional=None, discovery=None, timeout=None, exclude=None):
+    """
+    Find the native extension modules (C extensions, Cython modules) in and beneath a list of packages.
+
+    These are the modules that leave a frozen application slower, or failing late, when they aren't frozen with it.
+
+    :param include_packages: list of package names
+    :type: include_pacakges: list of basestr
+    :param freezer: The freezer whose package rules are used (See FREEZER constants)
+    :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :return: dict of module name -> file of the extension module
+    """
+    freezer = resolve_freezer(freezer)
+    package_references = _discover_packages(include_packages, optional=optional, discovery=discovery, timeout=timeout)
+    return freezer.native_modules(package_references, exclude=resolve_exclude(exclude))
+
+
+def find_lazy_modules(include_packages, lazy=None, profile=None, keep=None, freezer=None, optional=None, discovery=None,
+                      timeout=None, exclude=None):
+    """
+    Choose the modules in (and beneath) a list of packages that the frozen application imports lazily.
+
+    Package __init__ files often import every module of the package, used or not.  A lazy module only runs once an
+    attribute of it is used, which cuts start up time and memory.  Write the report as a manifest and install it in
+    the frozen application (See frosty.lazy.install):
+
+        >>>report = find_lazy_modules(['salt'], lazy=['salt.cloud.*'], profile='profile.json', keep=['salt.log*'])
+        >>>report.write('build/lazy.json')
+
+    :param include_packages: list of package names
+    :type: include_pacakges: list of basestr
+    :param lazy: Glob patterns (or compiled regular expressions) of dotted names to make lazy
+    :param profile: Import profile; modules it never imported are made lazy (See frosty.profile.resolve_profile)
+    :param keep: Glob patterns (or compiled regular expressions) of dotted names that are never made lazy
+    :param freezer: The freezer whose package rules are used (See FREEZER constants)
+    :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :return: frosty.lazy.LazyReport
+    """
+    freezer = resolve_freezer(freezer)
+    package_references = _discover_packages(include_packages, optional=optional, discovery=discovery, timeout=timeout)
+    modules = freezer.module_files(package_references, exclude=resolve_exclude(exclude))
+    return lazy_modules(modules, patterns=resolve_exclude(lazy), profile=resolve_profile(profile),
+                        keep=resolve_exclude(keep))
+
+
+def compile_includes(include_packages, directory, freezer=None, optional=None, discovery=None, timeout=None,
+                     exclude=None, optimize=-1, cache=None, workers=None, pool=POOL.PROCESS):
+    """
+    Precompile every module in (and beneath) a list of packages into a bytecode tree for the freezer.
+
+    Modules are compiled concurrently, into checked-hash .pyc files (where the interpreter supports them) that are
+    stored by the hash of their source, so an unchanged module is never compiled twice (See
+    frosty.bytecode.compile_modules).
+
+    Example:
+
+        >>>tree = compile_includes(['salt'], 'build/bytecode', optimize=2, cache=True, workers=8)
+        >>>tree.compiled, tree.reused, tree.errors
+
+    :param include_packages: list of package names
+    :type: include_pacakges: list of basestr
+    :param directory: Top of the bytecode tree
+    :param freezer: The freezer whose package rules are used (See FREEZER constants)
+    :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :param optimize: Optimisation level (-1 = the running interpreter's, 0, 1 = no asserts, 2 = no docstrings either)
+    :param cache: Where compiled bytecode is stored, e.g. True for the user cache directory (See
+                  frosty.cache.resolve_cache.  None = compile every module)
+    :param workers: Number of modules to compile concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See POOL constants)
+    :return: frosty.bytecode.BytecodeTree
+    """
     freezer = resolve_freezer(freezer)
+    package_references = _discover_packages(include_packages, optional=optional, discovery=discovery, timeout=timeout)
+    modules = freezer.module_files(package_references, exclude=resolve_exclude(exclude))
+    return compile_modules(modules, directory, optimize=optimize, cache=resolve_cache(cache), workers=workers,
+                           pool=pool)
+
+
+def _try_discover(discovery, timeout, package_name):
+    """
+    Discover a single package name (None if it couldn't be found)
+    """
+    try:
+        references = _discover_packages([package_name], discovery=discovery, timeout=timeout)
+    except ImportError:
+        return None
+    return references.pop() if references else None
+
+
+def build_batch_includes(targets, discovery=None, cache=None, workers=None, pool=None, timeout=None):
+    """
+    Build the includes of many freeze targets in one pass.
+
+    Every package name is discovered once, however many targets list it, and package trees are walked once and shared
+    by every target (and freezer) that includes them.  Missing required packages are reported for all targets
+    together, before anything is walked.
+
+    :param targets: dict of target name -> dict of packages (list of names), optional (list of names), freezer
+                    (See FREEZER constants), compact, exclude, stats, sizes, profile, keep and fingerprint (See
+                    build_includes.  Discovery is shared, so stats only measure the walks).  Only packages is required.
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param cache: Persistent include cache (See frosty.cache.resolve_cache.  None = share walks in memory only)
+    :param workers: Number of packages to walk (and, with DISCOVERY.ISOLATED, import) concurrently
+    :param pool: Kind of worker pool used when workers is set (See POOL constants, None = POOL.THREAD)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :return: dict of target name -> complete set of package includes
+    """
+    cache = resolve_cache(cache) or MemoryIncludeCache()
+
+    names = set()
+    for target in targets.values():
+        names.update(target.get(u"packages") or [])
+        names.update(target.get(u"optional") or [])
+    names = sorted(names)
 
-    # Import (or get reference to) all listed packages to ensure that they exist.
-    package_references = _import_packages(include_packages, optional=optional)
+    # Imports share one interpreter, so only isolated discovery can safely run concurrently
+    discovery_workers = workers if discovery == DISCOVERY.ISOLATED else None
+    references = dict(zip(names, map_workers(partial(_try_discover, discovery, timeout), names,
+                                             workers=discovery_workers)))
+
+    failures = []
+    for target_name, target in sorted(targets.items()):
+        missing = sorted(set(name for name in target.get(u"packages") or [] if references[name] is None))
+        if missing:
+            failures.append(u"{0} ({1})".format(target_name, u", ".join(missing)))
+    if failures:
+        raise ImportError(u"Unable to find required packages: {0}".format(u"; ".join(failures)))
+
+    results = {}
+    for target_name, target in sorted(targets.items()):
+        for name in sorted(set(target.get(u"optional") or [])):
+            if references[name] is None:
+                warn(ImportWarning(u"Unable to import {0} (target {1})".format(name, target_name)))
+
+        package_references = set(references[name] for name in list(target.get(u"packages") or []) +
+                                 list(target.get(u"optional") or []) if references[name] is not None)
+
+        build = _Build(target.get(u"freezer"), cache=cache, stats=target.get(u"stats"),
+                       compact=target.get(u"compact", False), exclude=target.get(u"exclude"),
+                       sizes=target.get(u"sizes"), profile=target.get(u"profile"), keep=target.get(u"keep"),
+                       fingerprint=target.get(u"fingerprint"))
+        results[target_name] = build.build(package_references, workers=workers, pool=pool)
+    return results
+
+
+def iter_includes(include_packages, freezer=None, optional=None, discovery=None, timeout=None, exclude=None):
+    """
+    Generator counterpart of build_includes that yields includes as soon as each package directory is found.
+
+    All packages are discovered up front (so missing packages are still reported together), but no include set is ever
+    built.  See the freezer's iter_includes for the ordering and uniqueness of the names.
+
+    :param include_packages: list of package names
+    :type: include_pacakges: list of basestr
+    :param freezer: The freezer to use (See FREEZER constants)
+    :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+    :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+    :param timeout: Seconds to wait for each package import with DISCOVERY.ISOLATED (None = wait forever)
+    :param exclude: Glob patterns (or compiled regular expressions) of dotted names to leave out, e.g. "*.tests".
+                    Excluded packages are never walked (See frosty.exclude.ExcludePatterns)
+    :return: generator of includes
+    """
+    freezer = resolve_freezer(freezer)
+    exclude = resolve_exclude(exclude)
+    package_references = _discover_packages(include_packages, optional=optional, discovery=discovery, timeout=timeout)
 
-    # Find all includes for the given freezer type
-    includes = freezer.build_includes(package_references)
+    options = {'exclude': exclude} if exclude is not None else {}
+    if hasattr(freezer, 'iter_includes'):
+        includes = freezer.iter_includes(package_references, **options)
+    else:
+        # Custom freezer that only knows how to build a complete set
+        includes = freezer.build_includes(package_references, **options)
 
-    return includes
\ No newline at end of file
+    for include in includes:
+        yield include
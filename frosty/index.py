@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from .files import replace_file
+
+# This runs first thing in frozen applications, so only what the import system has loaded already is imported here
+try:
+    from importlib.machinery import ModuleSpec
+except ImportError:  # Python 2
+    ModuleSpec = None
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:  # Python 2
+    import imp
+    MAGIC_NUMBER = imp.get_magic()
+
+# File signature, interpreter magic number, offset and length of the index
+_HEADER = struct.Struct('<8s4sQQ')
+_SIGNATURE = b'FROSTYMI'
+
+# Bytes in front of the code object of a .pyc file
+if sys.version_info >= (3, 7):
+    _PYC_HEADER_SIZE = 16
+elif sys.version_info >= (3, 3):
+    _PYC_HEADER_SIZE = 12
+else:
+    _PYC_HEADER_SIZE = 8
+
+
+def write_module_index(modules, path):
+    """
+    Write a module archive: the code of every module, plus an index of dotted name -> (offset, length, is package)
+    that IndexFinder resolves imports with.
+
+    The index is marshalled rather than JSON, so loading it at start up doesn't import anything.  Archives only work
+    with the interpreter version that wrote them (as .pyc files do).
+
+    Example:
+
+        >>>tree = compile_includes(['salt'], 'build/bytecode')
+        >>>write_module_index(tree.modules, 'build/modules.idx')
+
+    :param modules: dict of module name -> .pyc file (e.g. frosty.bytecode.BytecodeTree.modules).  A module whose file
+                    is named __init__.pyc is a package.
+    :param path: File to write the archive to
+    :return: number of modules in the archive
+    :raises ValueError: if a .pyc file was compiled by a different interpreter
+    """
+    import tempfile
+
+    index = {}
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=u".tmp")
+    with os.fdopen(handle, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        for module_name, pyc_path in sorted(modules.items()):
+            with open(pyc_path, 'rb') as pyc:
+                data = pyc.read()
+            if data[:4] != MAGIC_NUMBER:
+                raise ValueError(u"{0} was compiled by a different interpreter".format(pyc_path))
+            offset = f.tell()
+            f.write(data[_PYC_HEADER_SIZE:])
+            is_package = os.path.splitext(os.path.basename(pyc_path))[0] == u"__init__"
+            index[str(module_name)] = (offset, len(data) - _PYC_HEADER_SIZE, is_package)
+
+        index_offset = f.tell()
+        index_data = marshal.dumps(index)
+        f.write(index_data)
+        f.seek(0)
+        f.write(_HEADER.pack(_SIGNATURE, MAGIC_NUMBER, index_offset, len(index_data)))
+    replace_file(temp_path, path)
+    return len(index)
+
+
+class IndexFinder(object):
+    """
+    Meta path finder (and loader) for the modules of a module archive (See write_module_index).
+
+    Every import is resolved with one dict lookup, and code is unmarshalled straight out of the memory mapped archive,
+    so nothing is searched, listed or stat()ed.  Modules that aren't in the archive are left to the next finder.
+    """
+    def __init__(self, path, search_root=None):
+        """
+        :param path: Module archive
+        :param search_root: Directory holding the on-disk parts of packages, e.g. their extension modules and data (None
+                            = packages are only found in the archive)
+        :raises ValueError: if the file isn't a module archive for this interpreter
+        """
+        self.path = path
+        self.search_root = search_root
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(u"{0} is not a module archive".format(path))
+        if len(self._map) < _HEADER.size or self._map[:len(_SIGNATURE)] != _SIGNATURE:
+            self.close()
+            raise ValueError(u"{0} is not a module archive".format(path))
+        signature, magic, index_offset, index_length = _HEADER.unpack(self._map[:_HEADER.size])
+        if magic != MAGIC_NUMBER:
+            self.close()
+            raise ValueError(u"{0} was written by a different interpreter".format(path))
+        self.index = marshal.loads(self._map[index_offset:index_offset + index_length])
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _filename(self, fullname):
+        entry = self.index[fullname]
+        parts = fullname.split('.')
+        if entry[2]:
+            parts.append('__init__')
+        return os.path.join(self.path, *parts) + '.pyc'
+
+    def _search_locations(self, fullname):
+        if self.search_root is None:
+            return []
+        return [os.path.join(self.search_root, *fullname.split('.'))]
+
+    def find_spec(self, fullname, path=None, target=None):
+        entry = self.index.get(fullname)
+        if entry is None:
+            return None
+        spec = ModuleSpec(fullname, self, origin=self._filename(fullname), is_package=entry[2])
+        if entry[2]:
+            spec.submodule_search_locations = self._search_locations(fullname)
+        spec.has_location = True
+        return spec
+
+    def find_module(self, fullname, path=None):
+        # PEP 302 finder, for Python 2
+        return self if fullname in self.index else None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        exec(self.get_code(module.__name__), module.__dict__)
+
+    def load_module(self, fullname):
+        # PEP 302 loader, for Python 2
+        module = sys.modules.get(fullname)
+        if module is None:
+            module = sys.modules[fullname] = type(sys)(fullname)
+        module.__file__ = self._filename(fullname)
+        module.__loader__ = self
+        if self.is_package(fullname):
+            module.__path__ = self._search_locations(fullname)
+            module.__package__ = fullname
+        else:
+            module.__package__ = fullname.rpartition('.')[0]
+        try:
+            self.exec_module(module)
+        except BaseException:
+            del sys.modules[fullname]
+            raise
+        return sys.modules[fullname]
+
+    def is_package(self, fullname):
+        return self.index[fullname][2]
+
+    def get_code(self, fullname):
+        offset, length, is_package = self.index[fullname]
+        return marshal.loads(self._map[offset:offset + length])
+
+    def get_source(self, fullname):
+        return None
+
+    def get_filename(self, fullname):
+        return self._filename(fullname)
+
+
+def install(path, search_root=None):
+    """
+    Resolve imports from a module archive, ahead of every other finder.
+
+    Meant to be called first thing in a frozen application:
+
+        >>>import frosty.index
+        >>>frosty.index.install(os.path.join(os.path.dirname(sys.executable), 'modules.idx'))
+
+    Before Python 3.7, importing frosty.index imports frosty's build modules as well (See frosty/__init__.py).
+
+    :param path: Module archive (See write_module_index)
+    :param search_root: Directory holding the on-disk parts of packages (See IndexFinder)
+    :return: the installed IndexFinder
+    """
+    finder = IndexFinder(path, search_root=search_root)
+    sys.meta_path.insert(0, finder)
+    return finder
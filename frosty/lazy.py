@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import io
+import os
+import sys
+
+# install() runs first thing in frozen applications, so anything that the import system hasn't loaded already is only
+# imported where it is needed
+from .files import MODULE, replace_file, split_module_file
+
+
+_MANIFEST_FORMAT = 1
+
+# Types of the manifest paths given to install() (instead of module names)
+_STRING_TYPES = (str, type(u""))
+
+
+class LazyReport(object):
+    """
+    Modules of a build that are made lazy in the frozen application, and why (See lazy_modules).
+
+    The report is also the manifest that the frozen application installs (See write and install).
+    """
+    def __init__(self):
+        self.lazy = {}  # module name -> reason
+        self.eager = []  # names of the modules that are executed when they are imported
+
+    def to_dict(self):
+        return {
+            u"format": _MANIFEST_FORMAT,
+            u"modules": sorted(self.lazy),
+            u"reasons": self.lazy,
+            u"eager": sorted(self.eager),
+        }
+
+    def write(self, path):
+        """
+        Write the report as a manifest for install()
+        """
+        import json
+        import tempfile
+
+        handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=u".tmp")
+        with io.open(handle, 'w', encoding='utf-8') as f:
+            f.write(u"{0}\n".format(json.dumps(self.to_dict(), indent=4, sort_keys=True)))
+        replace_file(temp_path, path)
+
+
+def lazy_modules(modules, patterns=None, profile=None, keep=None):
+    """
+    Choose the modules whose execution is deferred until they are first used.
+
+    A module is made lazy when it matches one of the patterns, or when a profile is given and its recorded runs never
+    imported it.  Extension modules are never made lazy, nor is anything that matches keep.
+
+    :param modules: iterable of (module name, whether the module is a package, file that defines the module) 3-tuples
+                    (See _Default.module_files)
+    :param patterns: frosty.exclude.ExcludePatterns of modules to make lazy (None = only use the profile)
+    :param profile: frosty.profile.ImportProfile (None = only use the patterns)
+    :param keep: frosty.exclude.ExcludePatterns of modules that are always executed on import
+    :return: LazyReport
+    """
+    report = LazyReport()
+    for module_name, is_package, path in sorted(modules):
+        split = split_module_file(os.path.basename(path))
+        if split is None or split[1] == MODULE.EXTENSION or (keep is not None and keep(module_name)):
+            report.eager.append(module_name)
+        elif patterns is not None and patterns(module_name):
+            report.lazy[module_name] = u"pattern"
+        elif profile is not None and not profile.used(module_name):
+            report.lazy[module_name] = u"profile"
+        else:
+            report.eager.append(module_name)
+    return report
+
+
+class LazyFinder(object):
+    """
+    Meta path finder that defers the execution of a set of modules until an attribute of theirs is first used
+    (importlib.util.LazyLoader).
+
+    Modules are still found by the finders after this one (e.g. frosty.index.IndexFinder or the freezer's own), so
+    importing a lazy module costs no more than the lookup.  Modules whose loader can't be deferred are imported as
+    usual.
+    """
+    def __init__(self, modules):
+        """
+        :param modules: iterable of the names of the modules to make lazy
+        """
+        from importlib.util import LazyLoader
+
+        self.modules = frozenset(modules)
+        self._lazy_loader = LazyLoader
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self.modules:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = self._lazy_loader(spec.loader)
+            return spec
+        return None
+
+
+def install(manifest):
+    """
+    Make the modules of a manifest lazy for the rest of the run.
+
+    Meant to be called first thing in a frozen application (after frosty.index.install, if that is used too):
+
+        >>>import frosty.lazy
+        >>>frosty.lazy.install(os.path.join(os.path.dirname(sys.executable), 'lazy.json'))
+
+    :param manifest: Path of a manifest (See LazyReport.write), a LazyReport, or an iterable of module names
+    :return: the installed LazyFinder, or None if the interpreter can't load modules lazily (Python < 3.5)
+    """
+    if sys.version_info < (3, 5, 0, 'final', 0):
+        return None
+    if isinstance(manifest, _STRING_TYPES):
+        import json
+
+        with io.open(manifest, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get(u"format") != _MANIFEST_FORMAT:
+            raise ValueError(u"{0} is not a lazy import manifest".format(manifest))
+        manifest = data[u"modules"]
+    elif isinstance(manifest, LazyReport):
+        manifest = manifest.lazy
+    finder = LazyFinder(manifest)
+    sys.meta_path.insert(0, finder)
+    return finder
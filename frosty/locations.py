@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import json
+import os
+import six
+import subprocess
+import sys
+import threading
+
+from .compat import UnicodeMixin, find_module_location
+
+
+class PackageLocation(UnicodeMixin, object):
+    """
+    Where a package (or module) lives on disk, without a reference to the live module object.
+
+    Freezer strategies only need to know the name of a package, the file that defines it and where its sub-modules are
+    searched for.  A location can be built from an imported module, or resolved directly from the import system without
+    executing any of the package's code (See locate_package).
+    """
+    def __init__(self, name, origin=None, search_locations=None):
+        """
+        :param name: Fully qualified package name
+        :param origin: File that defines the package (None = no disk location, e.g. built-in modules)
+        :param search_locations: Directories searched for sub-modules (None = not a package)
+        """
+        self.name = six.text_type(name)
+        self.origin = six.text_type(os.path.abspath(origin)) if origin else None
+        self.search_locations = tuple(six.text_type(os.path.abspath(path)) for path in search_locations or [])
+
+    @classmethod
+    def from_module(cls, module):
+        """
+        Build a location from an already imported module (or pass through something that is already a location)
+        """
+        if isinstance(module, PackageLocation):
+            return module
+        origin = getattr(module, '__file__', None)
+        if origin and origin.endswith((u".pyc", u".pyo")) and os.path.exists(origin[:-1]):
+            origin = origin[:-1]  # Python 2 points __file__ at the bytecode it loaded, instead of the source
+        return cls(module.__name__, origin, getattr(module, '__path__', None))
+
+    @property
+    def is_package(self):
+        return bool(self.search_locations)
+
+    def __eq__(self, other):
+        if not isinstance(other, PackageLocation):
+            return NotImplemented
+        return (self.name, self.origin, self.search_locations) == (other.name, other.origin, other.search_locations)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash((self.name, self.origin, self.search_locations))
+
+    def __unicode__(self):
+        return self.name
+
+    def __repr__(self):
+        return u"PackageLocation({0!r}, origin={1!r})".format(self.name, self.origin)
+
+
+def locate_package(package_name):
+    """
+    Resolve the location of a package through the import system's finders, without importing it.
+
+    Parent packages of a dotted name are not imported either -- each level is looked up in the search locations of the
+    level above it.
+
+    :param package_name: Fully qualified package name
+    :type package_name: basestr
+    :return: location of the package
+    :rtype: PackageLocation
+    :raises ImportError: if the package (or one of its parents) can't be found
+    """
+    parts = package_name.split('.')
+    search_locations = None
+    origin = None
+    for index in range(len(parts)):
+        if index and not search_locations:
+            # Parent isn't a package, so nothing can live beneath it
+            raise ImportError(u"No module named {0}".format(package_name))
+
+        try:
+            found = find_module_location('.'.join(parts[:index + 1]), search_locations)
+        except (ImportError, ValueError):
+            found = None
+        if found is None:
+            raise ImportError(u"No module named {0}".format(package_name))
+        origin, search_locations = found
+
+    return PackageLocation(package_name, origin, search_locations)
+
+
+# Runs in a fresh interpreter: import the package exactly like frosty.includes._import_packages does and report where it
+# lives on the original stdout (package code that prints is redirected to stderr).
+_ISOLATED_IMPORT_SCRIPT = u"""
+import json, os, sys
+request = json.loads(sys.stdin.read())
+sys.path[:] = request['sys_path']
+result_fd = os.dup(1)
+os.dup2(2, 1)
+sys.stdout = sys.stderr
+try:
+    module = __import__(request['name'], globals(), locals(), [], 0)
+except ImportError as e:
+    sys.stderr.write(str(e))
+    sys.exit(1)
+result = {
+    'name': module.__name__,
+    'file': getattr(module, '__file__', None),
+    'path': list(getattr(module, '__path__', None) or []),
+}
+os.write(result_fd, json.dumps(result).encode('utf-8'))
+"""
+
+
+def import_package_location(package_name, timeout=None):
+    """
+    Import a package in a separate interpreter and report its location back.
+
+    Nothing that the package does at import time (network probes, slow extension initialisation, monkey patching) can
+    leak into, or hang, the calling interpreter.  The subprocess shares the caller's sys.path.
+
+    :param package_name: Fully qualified package name
+    :type package_name: basestr
+    :param timeout: Seconds to wait for the import before giving up (None = wait forever)
+    :return: location of the package
+    :rtype: PackageLocation
+    :raises ImportError: if the package can't be imported, or the import timed out
+    """
+    request = json.dumps({u"name": package_name, u"sys_path": sys.path}).encode('utf-8')
+    process = subprocess.Popen([sys.executable, u"-c", _ISOLATED_IMPORT_SCRIPT], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    timed_out = []
+
+    def kill():
+        timed_out.append(True)
+        process.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout is not None else None
+    if timer is not None:
+        timer.start()
+    try:
+        output, errors = process.communicate(request)
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+    if timed_out:
+        raise ImportError(u"Timed out importing {0} after {1} seconds".format(package_name, timeout))
+    if process.returncode != 0:
+        raise ImportError(u"Unable to import {0}: {1}".format(package_name, errors.decode('utf-8', 'replace').strip()))
+
+    result = json.loads(output.decode('utf-8'))
+    return PackageLocation(result[u"name"], result[u"file"], result[u"path"])
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+#
+# record_imports runs first thing in frozen applications, so only the interpreter's own start up modules are imported
+# here; everything else is imported when a profile is read or written.
+from __future__ import absolute_import
+
+import io
+import os
+import sys
+
+from .files import replace_file
+
+try:
+    from _thread import allocate_lock
+except ImportError:  # Python 2
+    from thread import allocate_lock
+
+_STRING_TYPES = (str, type(u""))
+
+
+_PROFILE_FORMAT = 1
+
+# Environment variable that turns recording on in a frozen application (See record_imports)
+PROFILE_VARIABLE = u"FROSTY_IMPORT_PROFILE"
+
+
+def _open(path, mode, compressed=None):
+    """
+    Open a profile file as text (gzip compressed when the name ends in .gz, unless compressed says otherwise)
+    """
+    if compressed is None:
+        compressed = path.endswith(u".gz")
+    if compressed:
+        import gzip
+        return io.TextIOWrapper(gzip.open(path, mode + 'b'), encoding='utf-8')
+    return io.open(path, mode, encoding='utf-8')
+
+
+class ImportProfile(object):
+    """
+    Set of module names that were actually imported during representative runs of an application.
+
+    A profile trims an include set down to what is really used (See build_includes(profile=...)).  Packages that were
+    never imported are excluded while walking, so they are never walked either, and wild cards of packages that were
+    imported are narrowed to the modules in them that were.
+    """
+    def __init__(self, modules=None):
+        self.modules = frozenset(modules or [])
+        self._children = None
+
+    @classmethod
+    def load(cls, paths):
+        """
+        Read one or more profile files (the union of every run recorded in them)
+
+        :param paths: path, or iterable of paths, of profile files
+        :raises ValueError: if a file isn't a profile
+        """
+        import json
+
+        if isinstance(paths, _STRING_TYPES):
+            paths = [paths]
+        modules = set()
+        for path in paths:
+            with _open(path, 'r') as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get(u"format") != _PROFILE_FORMAT:
+                raise ValueError(u"{0} is not an import profile".format(path))
+            modules.update(data[u"modules"])
+        return cls(modules)
+
+    def write(self, path):
+        """
+        Atomically write the profile to path, merged with whatever profile is already there
+        """
+        import json
+        import tempfile
+
+        modules = set(self.modules)
+        if os.path.exists(path):
+            try:
+                modules |= ImportProfile.load(path).modules
+            except ValueError:
+                pass
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=u".tmp")
+        os.close(handle)
+        with _open(temp_path, 'w', compressed=path.endswith(u".gz")) as f:
+            f.write(type(u"")(json.dumps({u"format": _PROFILE_FORMAT, u"modules": sorted(modules)})))
+        replace_file(temp_path, path)
+
+    def used(self, name):
+        """
+        True if a module name (or the package of a "package.*" wild card) was imported
+        """
+        return (name[:-2] if name.endswith(u".*") else name) in self.modules
+
+    def children(self, package_name):
+        """
+        Imported modules directly inside a package
+        """
+        if self._children is None:
+            children = {}
+            for module in self.modules:
+                parent = module.rpartition(u".")[0]
+                if parent:
+                    children.setdefault(parent, set()).add(module)
+            self._children = children
+        return self._children.get(package_name, set())
+
+    def exclude(self, exclude=None, keep=None):
+        """
+        Exclusion check that leaves out everything that wasn't imported (See frosty.exclude.ExcludePatterns)
+
+        :param exclude: frosty.exclude.ExcludePatterns that are excluded as well (None = only the profile)
+        :param keep: frosty.exclude.ExcludePatterns of names that are never excluded by the profile
+        """
+        return _ProfileExclude(self, exclude, keep)
+
+    def trim(self, includes, keep=None):
+        """
+        Trim an include set to what was imported
+
+        :param includes: set of includes
+        :param keep: frosty.exclude.ExcludePatterns of includes that are always kept (None = keep nothing extra)
+        :return: trimmed set of includes
+        """
+        trimmed = set()
+        for include in includes:
+            if keep is not None and keep(include):
+                trimmed.add(include)
+            elif not self.used(include):
+                continue
+            elif include.endswith(u".*"):
+                # Explicit names work with every freezer, and pull in nothing unused
+                package_name = include[:-2]
+                trimmed.add(package_name)
+                trimmed |= self.children(package_name)
+            else:
+                trimmed.add(include)
+        return trimmed
+
+    @property
+    def key(self):
+        """
+        Stable identifier of the profile (for cache keys)
+        """
+        import hashlib
+
+        return hashlib.sha1(u"\n".join(sorted(self.modules)).encode('utf-8')).hexdigest()[:16]
+
+
+class _ProfileExclude(object):
+    """
+    frosty.exclude.ExcludePatterns compatible check built from an ImportProfile
+    """
+    def __init__(self, profile, exclude=None, keep=None):
+        self.profile = profile
+        self.exclude = exclude
+        self.keep = keep
+
+    def __call__(self, name):
+        if self.exclude is not None and self.exclude(name):
+            return True
+        if self.keep is not None and self.keep(name):
+            return False
+        return not self.profile.used(name)
+
+    @property
+    def key(self):
+        return u"{0}:{1}:{2}".format(self.profile.key, self.exclude.key if self.exclude is not None else u"",
+                                     self.keep.key if self.keep is not None else u"")
+
+
+def resolve_profile(profile):
+    """
+    Locate the appropriate import profile given a profile setting from the programmer.
+
+    :param profile: None = no profile, a profile path, an iterable of profile paths, or an ImportProfile
+    :return: ImportProfile instance or None
+    """
+    if profile is None or isinstance(profile, ImportProfile):
+        return profile
+    return ImportProfile.load(profile)
+
+
+class ImportRecorder(object):
+    """
+    Records the modules that an application imports, for an ImportProfile.
+
+    Recording costs nothing while the application runs: sys.modules is only read when the profile is written (at
+    exit, or on snapshot()).  Every run is merged into the same profile file.  Every module in sys.modules is recorded,
+    including those imported before recording started and frosty's own, since the frozen application needs them all.
+    """
+    def __init__(self, path):
+        """
+        :param path: Profile file to write (compressed when the name ends in .gz)
+        """
+        self.path = path
+        self.modules = set()
+        self._lock = allocate_lock()
+        self._started = False
+
+    def snapshot(self):
+        """
+        Record the modules imported so far (call before the application unloads modules of its own)
+        """
+        names = [name for name, module in list(sys.modules.items()) if module is not None]
+        with self._lock:
+            self.modules.update(names)
+
+    def start(self):
+        """
+        Write the profile of this run when the interpreter exits
+        """
+        if not self._started:
+            import atexit
+
+            self._started = True
+            atexit.register(self.write)
+        return self
+
+    def write(self):
+        """
+        Record the modules imported so far and merge them into the profile file
+        """
+        self.snapshot()
+        with self._lock:
+            ImportProfile(self.modules).write(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.write()
+
+
+def record_imports(path=None):
+    """
+    Record the imports of this run into a profile, if recording was asked for.
+
+    Meant to be called first thing in a frozen application:
+
+        >>>import frosty.profile
+        >>>frosty.profile.record_imports()
+
+    Nothing happens unless a path is given or the FROSTY_IMPORT_PROFILE environment variable is set, so the same
+    bundle can be profiled during representative runs and shipped as is.
+
+    :param path: Profile file to write (None = the FROSTY_IMPORT_PROFILE environment variable)
+    :return: the started ImportRecorder, or None if recording wasn't asked for
+    """
+    path = path or os.environ.get(PROFILE_VARIABLE)
+    if not path:
+        return None
+    return ImportRecorder(path).start()
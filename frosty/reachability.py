@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import ast
+import hashlib
+import six
+
+from warnings import warn
+
+from .cache import resolve_cache
+from .exclude import resolve_exclude
+from .freezers import resolve_freezer
+from .includes import _locate_packages
+from .locations import locate_package
+from .workers import map_workers
+
+
+def _call_name(node):
+    """
+    Dotted name of the function being called (None if it isn't a plain name or attribute chain)
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return u".".join(reversed(parts))
+
+
+def _string_value(node):
+    if hasattr(ast, 'Constant') and isinstance(node, ast.Constant) and isinstance(node.value, six.string_types):
+        return node.value
+    if hasattr(ast, 'Str') and isinstance(node, getattr(ast, 'Str')):
+        return node.s
+    return None
+
+
+def find_imports(source, filename=u"<unknown>"):
+    """
+    Find every import in a module's source, without executing it.
+
+    Besides import statements, calls to importlib.import_module() and __import__() with a literal module name are
+    picked up too.
+
+    :param source: Module source code
+    :param filename: File name used in syntax errors
+    :return: list of (module, names, level) 3-tuples.  module is None for "from . import x", names is empty for plain
+             imports and level is the number of leading dots of a relative import.
+    :raises SyntaxError: if the source can't be parsed
+    """
+    imports = []
+    for node in ast.walk(ast.parse(source, filename)):
+        if isinstance(node, ast.Import):
+            imports.extend((alias.name, [], 0) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.module, [alias.name for alias in node.names], node.level or 0))
+        elif isinstance(node, ast.Call) and node.args:
+            if _call_name(node.func) in (u"importlib.import_module", u"import_module", u"__import__"):
+                module = _string_value(node.args[0])
+                if module and not module.startswith(u"."):
+                    imports.append((module, [], 0))
+    return imports
+
+
+def _scan_file(job):
+    """
+    Imports of a single source file, reusing the result cached for its content hash (module level, so that process
+    pools can pickle it)
+
+    :param job: 2-tuple of the file path and the IncludeCache (or None)
+    """
+    path, cache = job
+    with open(path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha1(source).hexdigest()
+
+    if cache is not None:
+        imports = cache.scanned_imports(digest)
+        if imports is not None:
+            return imports
+
+    try:
+        imports = [list(found) for found in find_imports(source, path)]
+    except (SyntaxError, ValueError) as e:
+        warn(u"Unable to parse {0}, its imports are ignored: {1}".format(path, e))
+        imports = []
+
+    if cache is not None:
+        cache.store_scanned_imports(digest, imports)
+    return imports
+
+
+def _resolve_relative(module_name, is_package, module, level):
+    """
+    Absolute name of a relative import found in module_name (None if it can't be resolved)
+    """
+    if not level:
+        return module
+    if module_name is None:
+        # Scripts aren't part of a package
+        return None
+    parts = module_name.split(u".")
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[:-(level - 1)] if level - 1 < len(parts) else []
+    if not parts:
+        return None
+    return u".".join(parts + ([module] if module else []))
+
+
+def _import_candidates(module_name, is_package, imports):
+    """
+    Every module name that importing imports (found in module_name) may execute, parents first
+    """
+    for module, names, level in imports:
+        base = _resolve_relative(module_name, is_package, module, level)
+        if base is None:
+            continue
+        parts = base.split(u".")
+        for index in range(len(parts)):
+            yield u".".join(parts[:index + 1])
+        for name in names:
+            if name != u"*":
+                # Could be a sub-module, or just an attribute of base (which simply won't be found)
+                yield base + u"." + name
+
+
+def _in_scope(name, scope):
+    return any(name == package or name.startswith(package + u".") for package in scope)
+
+
+def build_reachable_includes(entry_scripts, include_packages, freezer=None, dynamic=None, workers=None, pool=None,
+                             cache=None, exclude=None):
+    """
+    Build the minimal includes needed by one or more entry scripts, from a static import graph.
+
+    Sources are parsed with the ast module, and imported modules are located through the import system's finders, so
+    no package code is ever executed.  Starting from the entry scripts, every module that can be reached inside
+    include_packages is included explicitly (along with its parent packages).  Modules outside of include_packages are
+    left to the freezer's own module finder, and aren't followed.
+
+    Imports that can't be seen statically (plugin loaders, computed names, "from pkg import *" of sub-modules) are
+    missed.  List the packages that rely on them in dynamic, and they get the freezer's regular include rules instead.
+
+    :param entry_scripts: Paths of the scripts the frozen application starts from
+    :param include_packages: Names of the packages to include reachable modules from
+    :param freezer: The freezer to use for dynamic packages (See FREEZER constants)
+    :param dynamic: Names of packages that load their modules dynamically (always included with the freezer's rules)
+    :param workers: Number of files to parse concurrently (None = one at a time)
+    :param pool: Kind of worker pool used when workers is set (See frosty.workers.POOL constants)
+    :param cache: Cache parsed imports by file content hash (See frosty.cache.resolve_cache)
+    :param exclude: Patterns of dotted names that are neither included nor followed (See frosty.exclude.ExcludePatterns)
+    :return: set of includes
+    """
+    freezer = resolve_freezer(freezer)
+    cache = resolve_cache(cache)
+    exclude = resolve_exclude(exclude)
+    scope = list(include_packages)
+
+    includes = set()
+    located = {}
+    frontier = [(None, path, False) for path in entry_scripts]
+    while frontier:
+        # Each level of the graph is parsed in one batch, so the files in it can be parsed concurrently
+        scanned = map_workers(_scan_file, [(path, cache) for _, path, _ in frontier], workers=workers, pool=pool)
+
+        next_frontier = []
+        for (module_name, path, is_package), imports in zip(frontier, scanned):
+            for candidate in _import_candidates(module_name, is_package, imports):
+                if candidate in located or not _in_scope(candidate, scope):
+                    continue
+                if exclude is not None and exclude(candidate):
+                    located[candidate] = None
+                    continue
+                try:
+                    location = locate_package(candidate)
+                except ImportError:
+                    location = None
+                located[candidate] = location
+                if location is None:
+                    continue
+
+                includes.add(candidate)
+                if location.origin is not None and location.origin.endswith(u".py"):
+                    next_frontier.append((candidate, location.origin, location.is_package))
+        frontier = next_frontier
+
+    if dynamic:
+        if exclude is None:
+            includes |= freezer.build_includes(_locate_packages(dynamic, top_level=False))
+        else:
+            includes |= freezer.build_includes(_locate_packages(dynamic, top_level=False), exclude=exclude)
+
+    return includes
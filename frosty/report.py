@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import six
+
+
+class BuildReport(object):
+    """
+    Base of the reports that build_includes fills in while it builds, and hands to callbacks once the build finishes
+    (See frosty.stats.BuildStats, frosty.sizes.SizeReport and frosty.fingerprint.BuildFingerprint).
+
+    Pass an instance to read the report back after the build, or just a callback to be handed a new one.
+    """
+    def __init__(self, callbacks=None):
+        """
+        :param callbacks: callable (or list of callables) called with this object when the build finishes
+        """
+        if callable(callbacks):
+            callbacks = [callbacks]
+        self.callbacks = list(callbacks or [])
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def _report(self):
+        """
+        Hand the finished report to every callback (called at the end of finish)
+        """
+        for callback in self.callbacks:
+            callback(self)
+
+    @classmethod
+    def resolve(cls, setting, name):
+        """
+        Locate the appropriate report given a setting from the programmer.
+
+        :param setting: None/False = no report, a callback, or an instance of this class
+        :param name: Name of the setting (for error messages)
+        :return: instance of this class or None
+        """
+        if setting is None or setting is False:
+            return None
+        if isinstance(setting, cls):
+            return setting
+        if callable(setting):
+            return cls(setting)
+        raise ValueError(u"Unsupported {0} setting \"{1}\".".format(name, six.text_type(setting)))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import os
+import six
+
+from .report import BuildReport
+from .walk import DATA, include_attribution
+
+
+class SizeReport(BuildReport):
+    """
+    Bundle size report of a build_includes call: the on-disk bytes (source, bytecode, extensions and package data) of
+    every package walked, attributed to the include that pulls them into the bundle (See
+    frosty.walk.include_attribution).  Files that no include pulls in are reported as unattributed.
+
+    The files are the ones listed by the build's own walk (or by the cached walk, when the build uses a cache), so only
+    their sizes are read.  Directories that aren't packages (templates, __pycache__...) are never walked, and packages
+    inside zip archives aren't measured.
+
+    Pass an instance (or just a callback) as build_includes(sizes=...):
+
+        >>>report = SizeReport()
+        >>>build_includes(['salt'], sizes=report)
+        >>>report.by_include()[:10]
+    """
+    def __init__(self, callbacks=None):
+        """
+        :param callbacks: callable (or list of callables) called with this object when the build finishes
+        """
+        super(SizeReport, self).__init__(callbacks)
+        self._includes = {}  # include -> dict of kind -> bytes
+        self._subtrees = {}  # package name -> bytes of the package and everything beneath it
+        self._unattributed = 0
+
+    def finish(self, includes, packages, exclude=None):
+        """
+        Measure the files of every package walked, attribute them to the final include set, and report the finished
+        report to every callback
+
+        :param includes: final set of includes
+        :param packages: list of frosty.walk.PackageFiles recorded by the build
+        :param exclude: frosty.exclude.ExcludePatterns compatible check of the modules that the build left out (None =
+                        exclude nothing)
+        """
+        self._includes, self._subtrees, self._unattributed = {}, {}, 0
+        attribute = include_attribution(includes, exclude=exclude)
+        for package_files in packages:
+            depth = len(package_files.package_name.split(u"."))
+            for package, module, kind, path in package_files.files:
+                try:
+                    size = os.lstat(path).st_size
+                except OSError:
+                    continue
+                include = attribute(package, module)
+                if include is None:
+                    self._unattributed += size
+                else:
+                    kinds = self._includes.setdefault(include, {})
+                    kinds[kind] = kinds.get(kind, 0) + size
+
+                parts = package.split(u".")
+                for index in range(depth, len(parts) + 1):
+                    subtree = u".".join(parts[:index])
+                    self._subtrees[subtree] = self._subtrees.get(subtree, 0) + size
+
+        self._report()
+
+    @property
+    def total_bytes(self):
+        return sum(sum(kinds.values()) for kinds in self._includes.values())
+
+    @property
+    def unattributed_bytes(self):
+        return self._unattributed
+
+    def by_include(self):
+        """
+        Includes ranked by the bytes they pull into the bundle (largest first)
+
+        :return: list of (include, bytes, dict of kind -> bytes) 3-tuples
+        """
+        ranked = [(include, sum(kinds.values()), dict(kinds)) for include, kinds in six.iteritems(self._includes)]
+        return sorted(ranked, key=lambda item: (-item[1], item[0]))
+
+    def by_subtree(self):
+        """
+        Packages ranked by the bytes of everything beneath them (largest first)
+
+        :return: list of (package name, bytes) 2-tuples
+        """
+        return sorted(six.iteritems(self._subtrees), key=lambda item: (-item[1], item[0]))
+
+    def check(self, max_bytes=None, max_include_bytes=None):
+        """
+        Compare the report against size budgets (e.g. to fail a CI build)
+
+        :param max_bytes: Largest allowed total of the bundle (None = no limit)
+        :param max_include_bytes: Largest allowed size of any single include (None = no limit)
+        :return: list of messages, one for each budget that was exceeded (empty = within budget)
+        """
+        violations = []
+        if max_bytes is not None and self.total_bytes > max_bytes:
+            violations.append(u"Bundle is {0:,} bytes (budget {1:,})".format(self.total_bytes, max_bytes))
+        if max_include_bytes is not None:
+            for include, size, kinds in self.by_include():
+                if size <= max_include_bytes:
+                    break
+                violations.append(u"{0} is {1:,} bytes (budget {2:,})".format(include, size, max_include_bytes))
+        return violations
+
+    def to_dict(self):
+        return {
+            u"total_bytes": self.total_bytes,
+            u"unattributed_bytes": self.unattributed_bytes,
+            u"includes": [{u"include": include, u"bytes": size, u"kinds": kinds}
+                          for include, size, kinds in self.by_include()],
+            u"subtrees": [{u"package": package, u"bytes": size} for package, size in self.by_subtree()],
+        }
+
+
+def resolve_sizes(sizes):
+    """
+    Locate the appropriate size report given a sizes setting from the programmer.
+
+    :param sizes: None/False = no report, a callback, or a SizeReport (to read the report back after the build)
+    :return: SizeReport instance or None
+    """
+    return SizeReport.resolve(sizes, u"sizes")
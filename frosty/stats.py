@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+from .compat import timer
+from .report import BuildReport
+
+
+class PackageStats(object):
+    """
+    Measurements for building the includes of a single package
+    """
+    def __init__(self, package_name, package_path):
+        self.package_name = package_name
+        self.package_path = package_path
+        self.seconds = 0.0
+        self.walk_seconds = 0.0
+        self.directories = 0
+        self.files = 0
+        self.includes = 0
+        self.cached = False
+
+    @property
+    def names_seconds(self):
+        """
+        Time spent deriving include names (everything that wasn't spent walking)
+        """
+        return max(self.seconds - self.walk_seconds, 0.0)
+
+    def timed_walk(self, walk):
+        """
+        Wrap a walk_packages compatible function so that its time, directories and files are recorded here
+        """
+        def timed(top):
+            results = iter(walk(top))
+            while True:
+                start = timer()
+                try:
+                    result = next(results)
+                except StopIteration:
+                    self.walk_seconds += timer() - start
+                    return
+                self.walk_seconds += timer() - start
+                self.directories += 1
+                self.files += len(result[2])
+                yield result
+        return timed
+
+    def to_dict(self):
+        return {
+            u"package_name": self.package_name,
+            u"package_path": self.package_path,
+            u"seconds": self.seconds,
+            u"walk_seconds": self.walk_seconds,
+            u"names_seconds": self.names_seconds,
+            u"directories": self.directories,
+            u"files": self.files,
+            u"includes": self.includes,
+            u"cached": self.cached,
+        }
+
+
+class BuildStats(BuildReport):
+    """
+    Measurements for a whole build_includes call: wall time per phase, plus a PackageStats for every package walked.
+
+    Pass an instance (or just a callback) as build_includes(stats=...).  Nothing is measured when stats aren't asked
+    for.  Callbacks are called with the finished stats, e.g. to send them to build metrics:
+
+        >>>build_includes(['salt'], stats=lambda stats: metrics.send(stats.to_dict()))
+    """
+    def __init__(self, callbacks=None):
+        """
+        :param callbacks: callable (or list of callables) called with this object when the build finishes
+        """
+        super(BuildStats, self).__init__(callbacks)
+        self.phases = []  # list of (phase, seconds), in the order they ran
+        self.packages = []
+
+    def add_phase(self, phase, seconds):
+        self.phases.append((phase, seconds))
+
+    def add_package(self, package_stats):
+        self.packages.append(package_stats)
+
+    @property
+    def seconds(self):
+        return sum(seconds for phase, seconds in self.phases)
+
+    @property
+    def directories(self):
+        return sum(package.directories for package in self.packages)
+
+    @property
+    def files(self):
+        return sum(package.files for package in self.packages)
+
+    @property
+    def includes(self):
+        return sum(package.includes for package in self.packages)
+
+    def finish(self):
+        """
+        Report the finished stats to every callback
+        """
+        self._report()
+
+    def to_dict(self):
+        return {
+            u"seconds": self.seconds,
+            u"phases": [{u"phase": phase, u"seconds": seconds} for phase, seconds in self.phases],
+            u"directories": self.directories,
+            u"files": self.files,
+            u"includes": self.includes,
+            u"packages": [package.to_dict() for package in self.packages],
+        }
+
+
+def resolve_stats(stats):
+    """
+    Locate the appropriate stats object given a stats setting from the programmer.
+
+    :param stats: None/False = no stats, a callback, or a BuildStats (to read the stats back after the build)
+    :return: BuildStats instance or None
+    """
+    return BuildStats.resolve(stats, u"stats")
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import six
+
+
+class _Node(object):
+    __slots__ = ('children', 'known', 'package', 'included', 'wildcard')
+
+    def __init__(self):
+        self.children = {}
+        self.known = False  # Module known to exist (See IncludeTrie.add_module)
+        self.package = False
+        self.included = False  # Included by name
+        self.wildcard = False  # Included along with all of its direct sub-modules ("name.*")
+
+
+class IncludeTrie(object):
+    """
+    Prefix trie of dotted include names.
+
+    A name ending in ".*" is a wild card for a package: the package itself and every module directly inside of it (the
+    same meaning the default freezer strategy gives it).  Besides includes, the trie can hold the modules that are
+    known to exist, which is what allows it to translate between wild cards and explicit names:
+
+        compact() -- smallest list for freezers that support wild cards (complete packages collapse to "name.*")
+        expand()  -- explicit list for freezers that don't (wild cards expand to the known modules)
+
+    Membership and prefix queries only touch the nodes along the given name.
+    """
+    def __init__(self, includes=None):
+        self._root = _Node()
+        self._count = 0
+        for include in includes or []:
+            self.add(include)
+
+    def _find(self, name):
+        node = self._root
+        for part in name.split(u"."):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _node(self, name):
+        node = self._root
+        for part in name.split(u"."):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+        return node
+
+    def add(self, include):
+        """
+        Add an include name (a module name, or a package name followed by ".*")
+        """
+        if include.endswith(u".*"):
+            node = self._node(include[:-2])
+            if not node.wildcard:
+                node.wildcard = True
+                self._count += 1
+        else:
+            node = self._node(include)
+            if not node.included:
+                node.included = True
+                self._count += 1
+
+    def add_module(self, name, package=False):
+        """
+        Record that a module (or package) exists, without including it
+        """
+        node = self._node(name)
+        node.known = True
+        node.package = node.package or package
+
+    def discard(self, include):
+        node = self._find(include[:-2] if include.endswith(u".*") else include)
+        if node is None:
+            return
+        if include.endswith(u".*"):
+            if node.wildcard:
+                node.wildcard = False
+                self._count -= 1
+        elif node.included:
+            node.included = False
+            self._count -= 1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        """
+        True if name is included: by name, by a wild card of its own, or by the wild card of its parent package.
+        Include names ending in ".*" are looked up as given.
+        """
+        if name.endswith(u".*"):
+            node = self._find(name[:-2])
+            return node is not None and node.wildcard
+
+        parent, node = None, self._root
+        for part in name.split(u"."):
+            parent, node = node, node.children.get(part)
+            if node is None:
+                return False
+        return node.included or node.wildcard or (parent is not self._root and parent.wildcard)
+
+    def _iter_node(self, prefix, node):
+        stack = [(prefix, node)]
+        while stack:
+            name, node = stack.pop()
+            if node.included:
+                yield name
+            if node.wildcard:
+                yield name + u".*"
+            for part in sorted(node.children, reverse=True):
+                stack.append((name + u"." + part, node.children[part]))
+
+    def iter_prefix(self, prefix):
+        """
+        Every include name at or beneath a dotted prefix, in tree order
+        """
+        node = self._find(prefix)
+        if node is None:
+            return iter([])
+        return self._iter_node(prefix, node)
+
+    def has_prefix(self, prefix):
+        """
+        True if anything at or beneath a dotted prefix is included
+        """
+        for _ in self.iter_prefix(prefix):
+            return True
+        return False
+
+    def __iter__(self):
+        for part in sorted(self._root.children):
+            for include in self._iter_node(part, self._root.children[part]):
+                yield include
+
+    def compact(self):
+        """
+        Smallest equivalent include list for a freezer that supports wild cards.
+
+        A known package whose known sub-modules are all included collapses to "name.*".  Names that a wild card
+        already covers are dropped.
+
+        :return: generator of include names, in tree order
+        """
+        stack = [(part, self._root.children[part], False) for part in sorted(self._root.children, reverse=True)]
+        while stack:
+            name, node, covered = stack.pop()
+            children = node.children
+            known_children = [child for child in six.itervalues(children) if child.known]
+            complete = (node.package and (node.included or covered) and bool(known_children) and
+                        all(child.included or child.wildcard for child in known_children))
+            if node.wildcard or complete:
+                yield name + u".*"
+            elif node.included and not covered:
+                yield name
+            child_covered = node.wildcard or complete
+            for part in sorted(children, reverse=True):
+                stack.append((name + u"." + part, children[part], child_covered))
+
+    def expand(self):
+        """
+        Explicit include list for a freezer that doesn't support wild cards (wild cards expand to the known modules)
+
+        :return: generator of include names, in tree order
+        """
+        stack = [(part, self._root.children[part], False) for part in sorted(self._root.children, reverse=True)]
+        while stack:
+            name, node, covered = stack.pop()
+            if node.included or node.wildcard or (covered and node.known):
+                yield name
+            for part in sorted(node.children, reverse=True):
+                stack.append((name + u"." + part, node.children[part], node.wildcard))
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import errno
+import mmap
+import os
+import six
+import threading
+import zipfile
+
+from .compat import scandir
+from .files import BYTECODE_SUFFIXES, EXTENSION_SUFFIXES, MODULE, SOURCE_SUFFIXES, is_identifier, split_module_file
+
+
+# File names that make a directory a package, most common first (zipimport can't load extension modules)
+_INIT_FILES = [u"__init__" + suffix for suffix in SOURCE_SUFFIXES + BYTECODE_SUFFIXES + EXTENSION_SUFFIXES]
+_ARCHIVE_INIT_FILES = [u"__init__" + suffix for suffix in SOURCE_SUFFIXES + BYTECODE_SUFFIXES]
+
+# Kind of the files that aren't modules (templates, certificates, data files...)
+DATA = u"data"
+
+# Order in which the import system's file finder tries each kind of module file
+_KIND_PRIORITY = {MODULE.EXTENSION: 0, MODULE.SOURCE: 1, MODULE.BYTECODE: 2}
+
+
+def init_file(files, archive=False):
+    """
+    The file that makes a directory a package, given the names of the files in it (None = not a package)
+    """
+    for name in _ARCHIVE_INIT_FILES if archive else _INIT_FILES:
+        if name in files:
+            return name
+    return None
+
+
+def iter_module_files(files, archive=False):
+    """
+    The modules in a directory, given the names of the files in it (excluding __init__).  A module that is present
+    in several forms (e.g. .py and .pyc) is only listed once, the way the import system would find it.
+
+    :return: generator of (module name, file name, kind) 3-tuples, in file name order
+    """
+    found = {}
+    for filename in files:
+        split = split_module_file(filename)
+        if split is None or split[0] == u"__init__" or (archive and split[1] == MODULE.EXTENSION):
+            continue
+        name, kind = split
+        if name not in found or _KIND_PRIORITY[kind] < _KIND_PRIORITY[found[name][1]]:
+            found[name] = (filename, kind)
+    for name, (filename, kind) in sorted(six.iteritems(found), key=lambda item: item[1][0]):
+        yield name, filename, kind
+
+
+def is_package_directory(path):
+    """
+    True if path is a (regular) package directory (an __init__ module in any importable form).  The directory is listed
+    once, instead of probing for every importable __init__ suffix.
+    """
+    try:
+        return init_file(scan_directory(path)[1]) is not None
+    except OSError:
+        return False
+
+
+def scan_directory(path):
+    """
+    Split the entries of a directory into (sub-directories, files), both sorted by name.
+
+    Uses scandir where it is available, so the type of each entry comes from the directory listing itself instead of a
+    stat call per entry.  Symbolic links to directories are never listed as sub-directories (os.walk doesn't descend
+    into them by default either).
+    """
+    dirs, files = [], []
+    if scandir is not None:
+        for entry in scandir(path):
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+            else:
+                files.append(entry.name)
+    else:
+        for name in os.listdir(path):
+            entry_path = os.path.join(path, name)
+            if os.path.isdir(entry_path) and not os.path.islink(entry_path):
+                dirs.append(name)
+            else:
+                files.append(name)
+    dirs.sort()
+    files.sort()
+    return dirs, files
+
+
+class _ArchiveIndex(object):
+    """
+    Directory tree of a zip archive (zipped eggs, wheels, zipapps), built from its central directory alone.
+
+    On Python 3 the archive is memory-mapped, so only the pages holding the central directory are ever read (Python 2's
+    mmap.read() needs a size, which zipfile doesn't pass, so the file is read normally there).  Nothing is extracted.
+    Paths given to scan and is_package are file system style paths beneath the archive path, the same way zipimport
+    reports them in __file__ and __path__.
+    """
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        self.directories = {u"": (set(), set())}
+
+        with open(archive_path, 'rb') as f:
+            data = None
+            if not six.PY2:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, EnvironmentError):
+                    pass
+            try:
+                archive = zipfile.ZipFile(data if data is not None else f)
+                try:
+                    names = archive.namelist()
+                finally:
+                    archive.close()
+            finally:
+                if data is not None:
+                    data.close()
+
+        for name in names:
+            parts = [part for part in name.split(u"/") if part]
+            if not parts:
+                continue
+            directory_parts = parts if name.endswith(u"/") else parts[:-1]
+            for index in range(len(directory_parts)):
+                parent = u"/".join(directory_parts[:index])
+                self.directories[parent][0].add(directory_parts[index])
+                self.directories.setdefault(u"/".join(directory_parts[:index + 1]), (set(), set()))
+            if not name.endswith(u"/"):
+                self.directories[u"/".join(parts[:-1])][1].add(parts[-1])
+
+    def _listing(self, path):
+        inner_path = os.path.relpath(path, self.archive_path)
+        inner_path = u"" if inner_path == os.curdir else inner_path.replace(os.sep, u"/")
+        try:
+            return self.directories[inner_path]
+        except KeyError:
+            raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+
+    def scan(self, path):
+        """
+        scan_directory for a directory inside the archive
+        """
+        dirs, files = self._listing(path)
+        return sorted(dirs), sorted(files)
+
+    def is_package(self, path):
+        """
+        is_package_directory for a directory inside the archive
+        """
+        try:
+            return init_file(self._listing(path)[1], archive=True) is not None
+        except OSError:
+            return False
+
+
+_archive_indexes = {}
+_archive_indexes_lock = threading.Lock()
+
+
+def find_archive(path):
+    """
+    Find the zip archive that a path points into (zipimport style, e.g. /site-packages/app.egg/app/sub)
+
+    :return: path of the archive, or None if path is on the regular file system
+    """
+    if os.path.isdir(path):
+        return None
+    parent = path
+    while True:
+        parent, tail = os.path.split(parent)
+        if not tail:
+            return None
+        if os.path.exists(parent):
+            return parent if os.path.isfile(parent) and zipfile.is_zipfile(parent) else None
+
+
+def archive_index(archive_path):
+    """
+    Index of a zip archive (re-read only when the archive itself changes)
+    """
+    stat = os.stat(archive_path)
+    key = (archive_path, stat.st_mtime, stat.st_size, stat.st_ino)
+    with _archive_indexes_lock:
+        index = _archive_indexes.get(archive_path)
+        if index is None or index[0] != key:
+            index = _archive_indexes[archive_path] = (key, _ArchiveIndex(archive_path))
+    return index[1]
+
+
+def directory_functions(top):
+    """
+    Functions that list directories on whatever top lives on (the file system, or a zip archive)
+
+    :return: 2-tuple of scan_directory and is_package_directory compatible functions
+    """
+    archive_path = find_archive(top)
+    if archive_path is None:
+        return scan_directory, is_package_directory
+    index = archive_index(archive_path)
+    return index.scan, index.is_package
+
+
+class _Listings(object):
+    """
+    scan_directory and is_package_directory compatible pair that lists every directory once: the listing that shows a
+    sub-directory is a package is kept until the walk descends into it.  Only the listings of packages that are still
+    to be visited are held.
+    """
+    def __init__(self, scan):
+        self._scan = scan
+        self._pending = {}
+
+    def scan(self, path):
+        listing = self._pending.pop(path, None)
+        return listing if listing is not None else self._scan(path)
+
+    def is_package(self, path):
+        try:
+            dirs, files = self._scan(path)
+        except OSError:
+            return False
+        if init_file(files) is None:
+            return False
+        self._pending[path] = (dirs, files)
+        return True
+
+
+def walk_packages(top, scan=None, is_package=None):
+    """
+    os.walk compatible (top down) traversal of a package directory that only visits package directories.
+
+    Every sub-directory is listed once: its listing decides whether it is a package and, if it is, is reused when the
+    walk descends into it.  Sub-directories without an __init__ module are never descended into, so data directories,
+    docs and vendored assets beneath a package cost one listing each, no matter how deep they are.  Like os.walk, the
+    caller may prune dirs in place to skip sub-packages.
+
+    Packages inside zip archives are walked straight from the archive's central directory (See directory_functions),
+    and produce the same results as the extracted package would.
+
+    :param top: Package directory to walk (always visited)
+    :param scan: function that lists a directory as (sub-directories, files) (None = pick for top)
+    :param is_package: function that decides whether a sub-directory is a package (None = pick for top)
+    :return: generator of (root, package sub-directory names, file names)
+    """
+    if scan is None or is_package is None:
+        default_scan, default_is_package = directory_functions(top)
+        if scan is None and is_package is None and default_scan is scan_directory:
+            # Archives are indexed in memory, so only listings of the file system are worth keeping
+            listings = _Listings(scan_directory)
+            default_scan, default_is_package = listings.scan, listings.is_package
+        scan = scan or default_scan
+        is_package = is_package or default_is_package
+
+    stack = [top]
+    while stack:
+        root = stack.pop()
+        try:
+            dirs, files = scan(root)
+        except OSError:
+            continue
+
+        dirs = [name for name in dirs if is_package(os.path.join(root, name))]
+        yield root, dirs, files
+
+        stack.extend(os.path.join(root, name) for name in reversed(dirs))
+
+
+class PackageTree(object):
+    """
+    In-memory model of a package directory, built from a single walk.
+
+    The tree can be walked any number of times without touching the filesystem again, so several include strategies
+    can be derived from one scan of the package.
+    """
+    def __init__(self, top, walk=walk_packages):
+        """
+        :param top: Package directory
+        :param walk: walk_packages compatible function used for the single scan
+        """
+        self.top = top
+        self.listings = dict((root, (dirs, files)) for root, dirs, files in walk(top))
+
+    def walk(self, top=None):
+        """
+        walk_packages compatible replay of the scan (the caller may prune dirs in place, like with walk_packages)
+        """
+        stack = [self.top if top is None else top]
+        while stack:
+            root = stack.pop()
+            listing = self.listings.get(root)
+            if listing is None:
+                continue
+            dirs, files = list(listing[0]), list(listing[1])
+            yield root, dirs, files
+            stack.extend(os.path.join(root, name) for name in reversed(dirs))
+
+
+class PackageFiles(object):
+    """
+    Files of a single package, as listed by the walk that built its includes: its modules (in every form on disk) and
+    the package data beside them.  Directories that aren't packages are never walked, so nothing inside them is listed.
+    """
+    def __init__(self, package_name, package_path, package_dir):
+        """
+        :param package_name: Fully qualified name of the package
+        :param package_path: File that defines the package
+        :param package_dir: Package directory (None = a plain module, which is its only file)
+        """
+        self.package_name = package_name
+        self.package_dir = package_dir
+        self.files = []  # list of (package name, module name or None, kind, path)
+        if package_dir is None:
+            split = split_module_file(os.path.basename(package_path))
+            self.files.append((package_name, package_name, split[1] if split else MODULE.SOURCE, package_path))
+
+    def _add(self, root, files):
+        relative_path = os.path.relpath(root, self.package_dir)
+        package = self.package_name
+        if relative_path != os.curdir:
+            package = u".".join([package] + relative_path.split(os.sep))
+        for filename in files:
+            split = split_module_file(filename)
+            if split is None:
+                self.files.append((package, None, DATA, os.path.join(root, filename)))
+            else:
+                module = package if split[0] == u"__init__" else package + u"." + split[0]
+                self.files.append((package, module, split[1], os.path.join(root, filename)))
+
+    def recorded_walk(self, walk):
+        """
+        Wrap a walk_packages compatible function so that the files of every directory it visits are recorded here
+        """
+        def recorded(top):
+            for root, dirs, files in walk(top):
+                self._add(root, files)
+                yield root, dirs, files
+        return recorded
+
+    def record(self, walk):
+        """
+        Record the files of every directory of a walk_packages compatible traversal (e.g. a replay of a cached walk)
+        """
+        for root, dirs, files in walk:
+            self._add(root, files)
+
+
+def include_attribution(includes, exclude=None):
+    """
+    Function that tells which include pulls a file of a walked package (See PackageFiles) into the bundle.
+
+    A module goes to its own include, or to the wild card of its package ("package.*").  Package data goes to the
+    package's wild card, or to the package itself, and so do the modules of an included package whose modules aren't
+    named one by one (e.g. the top-level package of FREEZER.DEFAULT), unless they are excluded.
+
+    :param includes: final set of includes
+    :param exclude: frosty.exclude.ExcludePatterns compatible check of the modules that the build left out, e.g. by an
+                    import profile (None = exclude nothing)
+    :return: function of (package name, module name or None) that returns the include (None if no include pulls the
+             file in)
+    """
+    includes = set(includes)
+    named = set(include.rpartition(u".")[0] for include in includes if not include.endswith(u".*"))
+
+    def attribute(package, module):
+        if module is not None and module in includes:
+            return module
+        if package + u".*" in includes:
+            return package + u".*"
+        if package in includes and (module is None or (package not in named and
+                                                        (exclude is None or not exclude(module)))):
+            return package
+        return None
+    return attribute
+
+
+def namespace_members(package_name, search_locations):
+    """
+    Merge the portions of a PEP 420 namespace package into the regular packages and modules beneath it.
+
+    Every portion is scanned once, in search location order.  Locations that resolve to the same directory are only
+    scanned the first time, and (like the import system) the first portion that provides a name wins.  Directories
+    without an __init__.py that appear beneath the portions are nested namespace packages, and are merged the same way.
+
+    :param package_name: Fully qualified name of the namespace package
+    :param search_locations: The namespace package's __path__ entries
+    :return: 2-tuple of the set of nested namespace package names (that contain anything) and a dict of member file
+             paths (__init__.py for packages) to their fully qualified names
+    """
+    members = {}  # name -> path
+    namespaces = set()
+    scanned = set()
+    stack = [(package_name, list(search_locations))]
+    while stack:
+        namespace_name, locations = stack.pop()
+        nested = {}
+        nested_order = []
+        for location in locations:
+            real_location = os.path.realpath(location)
+            if real_location in scanned:
+                continue
+            scanned.add(real_location)
+
+            scan, is_package = directory_functions(location)
+            try:
+                dirs, files = scan(location)
+            except OSError:
+                continue
+
+            for name in dirs:
+                if not is_identifier(name):
+                    continue
+                member_name = namespace_name + u"." + name
+                path = os.path.join(location, name)
+                if is_package(path):
+                    members.setdefault(member_name, os.path.join(path, u"__init__.py"))
+                else:
+                    if member_name not in nested:
+                        nested_order.append(member_name)
+                    nested.setdefault(member_name, []).append(path)
+            for module, name, kind in iter_module_files(files, archive=find_archive(location) is not None):
+                members.setdefault(namespace_name + u"." + module, os.path.join(location, name))
+
+        for member_name in reversed(nested_order):
+            if member_name not in members:
+                namespaces.add(member_name)
+                stack.append((member_name, nested[member_name]))
+
+    # Drop nested "namespaces" that turned out to hold nothing importable (data directories and the like)
+    namespaces = set([
+        namespace for namespace in namespaces
+        if any(name.startswith(namespace + u".") for name in members)
+    ])
+    return namespaces, dict((path, name) for name, path in members.items())
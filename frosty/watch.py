@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import six
+import struct
+import sys
+import threading
+
+from .cache import _CacheEntry
+from .exclude import resolve_exclude
+from .freezers import resolve_freezer
+from .includes import _discover_packages
+
+
+# Subset of <sys/inotify.h> that matters for include sets: entries appearing, disappearing or being renamed
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_NONBLOCK = getattr(os, 'O_NONBLOCK', 0)  # Only Linux has inotify, but the module is imported everywhere
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify(object):
+    """
+    Minimal ctypes binding of Linux inotify (directory watches only)
+    """
+    def __init__(self):
+        library = ctypes.util.find_library('c')
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith('linux'):
+            return False
+        library = ctypes.util.find_library('c')
+        return bool(library) and hasattr(ctypes.CDLL(library), 'inotify_init1')
+
+    def add_watch(self, path):
+        """
+        :return: watch descriptor, or None if the directory couldn't be watched (e.g. it was just removed)
+        """
+        if isinstance(path, six.text_type):
+            path = path.encode(sys.getfilesystemencoding())
+        wd = self._libc.inotify_add_watch(self.fd, path, _WATCH_MASK)
+        return wd if wd >= 0 else None
+
+    def remove_watch(self, wd):
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout):
+        """
+        Wait up to timeout seconds for events
+
+        :return: list of (watch descriptor, mask) tuples
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            events.append((wd, mask))
+            offset += _EVENT_HEADER.size + length
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class IncludeWatcher(object):
+    """
+    Long-lived include set for a list of packages that is kept up to date as their package trees change.
+
+    Each package directory is walked once up front.  After that, a change only re-lists the directories that actually
+    changed (through the same fingerprints as frosty.cache.IncludeCache), and the include set is updated with the
+    difference.  Changes are picked up through inotify on Linux, and by polling directory fingerprints elsewhere.
+
+    Example:
+
+        >>>with IncludeWatcher(['salt'], callback=lambda added, removed: rebuild()) as watcher:
+        >>>    watcher.includes
+    """
+    def __init__(self, include_packages, freezer=None, optional=None, discovery=None, callback=None, interval=1.0,
+                 use_inotify=True, exclude=None):
+        """
+        :param include_packages: list of package names
+        :param freezer: The freezer to use (See FREEZER constants)
+        :param optional: Optional pacakge names to include (will only issue a warning if they don't exist)
+        :param discovery: How packages are found (See DISCOVERY constants, None = DISCOVERY.IMPORT)
+        :param callback: called with (added, removed) sets of includes after every change
+        :param interval: Seconds between polls (or between checks for stop() when using inotify)
+        :param use_inotify: Use inotify when it is available (False = always poll)
+        :param exclude: Patterns of dotted names to leave out (See frosty.includes.build_includes)
+        """
+        self.freezer = resolve_freezer(freezer)
+        self.exclude = resolve_exclude(exclude)
+        self.callback = callback
+        self.interval = interval
+        self.use_inotify = use_inotify and _Inotify.available()
+
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stopping = threading.Event()
+        self._inotify = None
+        self._watches = {}  # watch descriptor -> package directory
+        self._watched_paths = {}  # watched directory -> watch descriptor
+
+        package_references = _discover_packages(include_packages, optional=optional, discovery=discovery)
+        passthrough_includes, package_root_paths = self.freezer._exclude_packages(
+            *self.freezer._split_packages(package_references), exclude=self.exclude)
+
+        self._packages = {}  # package directory -> (package path, package name, _CacheEntry, includes)
+        self._counts = {}  # include -> number of packages (or passthrough references) that give it
+        self._count(passthrough_includes)
+        for package_path, package_name in sorted(six.iteritems(package_root_paths)):
+            package_dir = self.freezer._package_dir(package_path)
+            if package_dir is None:
+                # Plain modules never change their include
+                self._count([package_name])
+                continue
+            entry = _CacheEntry()
+            includes = self.freezer._package_includes(package_path, package_name, walk=entry.walk,
+                                                      exclude=self.exclude)
+            self._packages[package_dir] = (package_path, package_name, entry, includes)
+            self._count(includes)
+
+    def _count(self, includes):
+        for include in includes:
+            self._counts[include] = self._counts.get(include, 0) + 1
+
+    @property
+    def includes(self):
+        """
+        Snapshot of the current include set
+        """
+        with self._lock:
+            return set(self._counts)
+
+    def _refresh(self, package_dir):
+        """
+        Re-walk one package (only its changed directories are re-listed), returning (added, removed) includes
+        """
+        package_path, package_name, entry, old_includes = self._packages[package_dir]
+        if entry.is_fresh():
+            return set(), set()
+
+        includes = self.freezer._package_includes(package_path, package_name, walk=entry.walk, exclude=self.exclude)
+        self._packages[package_dir] = (package_path, package_name, entry, includes)
+
+        added, removed = set(), set()
+        for include in includes - old_includes:
+            if include not in self._counts:
+                added.add(include)
+        self._count(includes - old_includes)
+        for include in old_includes - includes:
+            self._counts[include] -= 1
+            if not self._counts[include]:
+                del self._counts[include]
+                removed.add(include)
+
+        if self._inotify is not None:
+            self._watch_entry(package_dir, entry)
+        return added, removed
+
+    def _refresh_packages(self, package_dirs):
+        """
+        Refresh the given packages and notify the callback of any overall change
+        """
+        added, removed = set(), set()
+        with self._lock:
+            for package_dir in sorted(package_dirs):
+                package_added, package_removed = self._refresh(package_dir)
+                added = (added - package_removed) | package_added
+                removed = (removed - package_added) | package_removed
+
+        if (added or removed) and self.callback is not None:
+            self.callback(added, removed)
+        return added, removed
+
+    def poll(self):
+        """
+        Check every package for changes right now
+
+        :return: 2-tuple of the (added, removed) includes
+        """
+        return self._refresh_packages(list(self._packages))
+
+    def _watch_entry(self, package_dir, entry):
+        """
+        Watch every directory the package's last walk looked at (non-packages too, for a new __init__.py)
+        """
+        for path in entry.directories:
+            if path not in self._watched_paths:
+                wd = self._inotify.add_watch(path)
+                if wd is not None:
+                    self._watches[wd] = package_dir
+                    self._watched_paths[path] = wd
+
+    def _run_inotify(self):
+        while not self._stopping.is_set():
+            changed = set()
+            for wd, mask in self._inotify.read(self.interval):
+                if mask & _IN_IGNORED:
+                    # The kernel dropped the watch (directory removed); forget it so it can be re-added if it returns
+                    package_dir = self._watches.pop(wd, None)
+                    for path in [path for path, watched in six.iteritems(self._watched_paths) if watched == wd]:
+                        del self._watched_paths[path]
+                else:
+                    package_dir = self._watches.get(wd)
+                if package_dir is not None:
+                    changed.add(package_dir)
+            if changed:
+                self._refresh_packages(changed)
+
+    def _run_polling(self):
+        while not self._stopping.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        """
+        Start watching in a background thread
+        """
+        if self._thread is not None:
+            return self
+        self._stopping.clear()
+        if self.use_inotify:
+            self._inotify = _Inotify()
+            with self._lock:
+                for package_dir, (package_path, package_name, entry, includes) in six.iteritems(self._packages):
+                    self._watch_entry(package_dir, entry)
+            target = self._run_inotify
+        else:
+            target = self._run_polling
+        self._thread = threading.Thread(target=target, name=u"frosty-watcher")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop watching (waits for the background thread to finish)
+        """
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._watches = {}
+            self._watched_paths = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+from __future__ import absolute_import
+
+from .compat import futures
+
+
+class POOL(object):
+    """
+    Constants for selecting the kind of worker pool used to process packages concurrently
+    """
+
+    THREAD = u"thread"  # Cheap to start, and the walks spend most of their time waiting on the file system
+    PROCESS = u"process"  # Sidesteps the GIL for CPU bound name derivation (work must be picklable)
+
+    ALL = set([THREAD, PROCESS])
+
+
+def map_workers(function, items, workers=None, pool=None):
+    """
+    Apply function to every item, concurrently across a pool of workers when asked to.
+
+    Results are always returned in the order of items, so callers that merge them get the same output as a serial run.
+    Falls back to a serial run with fewer than two workers (or items), or when concurrent.futures isn't available.
+
+    :param function: callable applied to each item (must be picklable for POOL.PROCESS)
+    :param items: iterable of items
+    :param workers: Maximum number of concurrent workers (None = serial)
+    :param pool: Kind of worker pool (See POOL constants, None = POOL.THREAD)
+    :return: list of results
+    """
+    if pool is not None and pool not in POOL.ALL:
+        raise ValueError(u"Unsupported worker pool \"{0}\".".format(pool))
+
+    items = list(items)
+    if not workers or workers < 2 or len(items) < 2 or futures is None:
+        return [function(item) for item in items]
+
+    if pool == POOL.PROCESS:
+        executor_cls = futures.ProcessPoolExecutor
+    else:
+        executor_cls = futures.ThreadPoolExecutor
+
+    with executor_cls(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(function, items))
@@ -30,6 +30,11 @@ setup(
         'frosty': 'frosty'
     },
     include_package_data=True,
+    entry_points={
+        'console_scripts': [
+            'frosty = frosty.cli:main',
+        ],
+    },
     install_requires=requirements,
     license="BSD",
     zip_safe=False,
@@ -1 +1,47 @@
-# -*- coding: utf-8 -*-
\ No newline at end of file
+# -*- coding: utf-8 -*-
+#
+# Helpers shared by the tests
+from __future__ import absolute_import
+
+import os
+import shutil
+import sys
+import tempfile
+
+
+def write_file(path, text=''):
+    """
+    Write a file, creating the directories above it
+    """
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+class TemporaryDirectoryMixin(object):
+    """
+    unittest.TestCase mixin that gives every test a fresh temporary directory (self.root), removed afterwards
+    """
+
+    # Directory beneath self.root ('' = self.root itself) that is on sys.path during every test (None = none)
+    sys_path = None
+
+    # Top level packages written by the tests, whose modules are dropped from sys.modules after every test
+    packages = ()
+
+    def setUp(self):
+        super(TemporaryDirectoryMixin, self).setUp()
+        self.root = tempfile.mkdtemp()
+        if self.sys_path is not None:
+            self._sys_path_entry = os.path.join(self.root, self.sys_path) if self.sys_path else self.root
+            sys.path.insert(0, self._sys_path_entry)
+
+    def tearDown(self):
+        for name in list(sys.modules):
+            if name.split('.')[0] in self.packages:
+                del sys.modules[name]
+        if self.sys_path is not None:
+            sys.path.remove(self._sys_path_entry)
+        shutil.rmtree(self.root)
+        super(TemporaryDirectoryMixin, self).tearDown()
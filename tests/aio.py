@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+aio
+----------------------------------
+Test the asyncio include builders
+"""
+from __future__ import absolute_import
+
+import os
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    from frosty.aio import build_includes_async
+except (ImportError, SyntaxError):  # Python < 3.5
+    asyncio = build_includes_async = None
+
+from frosty.fingerprint import BuildFingerprint
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY, build_includes
+from frosty.sizes import SizeReport
+from frosty.stats import BuildStats
+from frosty.workers import POOL
+from tests import TemporaryDirectoryMixin, write_file
+
+
+@unittest.skipIf(build_includes_async is None, "build_includes_async needs Python 3.5+")
+class Test_build_includes_async(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for build_includes_async
+    """
+
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_build_includes_async, self).setUp()
+        self.packages = []
+        for index in range(4):
+            package_name = 'frosty_async_{0}'.format(index)
+            for name in ['__init__.py', 'module.py', 'sub/__init__.py', 'sub/deep.py', 'tests/__init__.py']:
+                write_file(os.path.join(self.root, package_name, *name.split('/')))
+            self.packages.append(package_name)
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        super(Test_build_includes_async, self).tearDown()
+
+    def _run(self, coroutine):
+        # Coroutines are driven with loop callbacks rather than async def, so this module still imports on Python 2
+        return self.loop.run_until_complete(coroutine)
+
+    def test_matches_build_includes(self):
+        for freezer in [FREEZER.DEFAULT, FREEZER.CXFREEZE]:
+            expected = build_includes(self.packages + ['sys'], freezer=freezer, discovery=DISCOVERY.SPEC,
+                                      exclude=['*.tests'])
+            actual = self._run(build_includes_async(self.packages + ['sys'], freezer=freezer, discovery=DISCOVERY.SPEC,
+                                                    exclude=['*.tests'], workers=2))
+            self.assertEqual(actual, expected)
+
+    def test_stats(self):
+        stats = BuildStats()
+        self._run(build_includes_async(self.packages, discovery=DISCOVERY.SPEC, stats=stats))
+        self.assertEqual(len(stats.packages), len(self.packages))
+
+    def test_reports_match_build_includes(self):
+        reports = []
+        for build in [build_includes, build_includes_async]:
+            stats, sizes, fingerprint = BuildStats(), SizeReport(), BuildFingerprint()
+            includes = build(self.packages, discovery=DISCOVERY.SPEC, workers=2, pool=POOL.PROCESS, stats=stats,
+                             sizes=sizes, fingerprint=fingerprint)
+            if build is build_includes_async:
+                includes = self._run(includes)
+            reports.append((includes, [phase for phase, seconds in stats.phases], sizes.to_dict(), fingerprint.digest))
+        self.assertEqual(reports[0], reports[1])
+
+    def test_event_loop_not_blocked(self):
+        import frosty.freezers
+        original = frosty.freezers._Default._package_includes.__func__
+        ticks = []
+
+        def slow_package_includes(cls, *args, **kwargs):
+            time.sleep(0.05)
+            return original(cls, *args, **kwargs)
+
+        def tick():
+            ticks.append(threading.current_thread())
+            handles.append(self.loop.call_later(0.005, tick))
+
+        handles = [self.loop.call_soon(tick)]
+        frosty.freezers._Default._package_includes = classmethod(slow_package_includes)
+        try:
+            self._run(build_includes_async(self.packages, discovery=DISCOVERY.SPEC, workers=1))
+        finally:
+            frosty.freezers._Default._package_includes = classmethod(original)
+            handles[-1].cancel()
+        self.assertGreater(len(ticks), 10)
+
+    def test_cancellation(self):
+        # The task is cancelled once it has taken its first step (and is waiting on the executor)
+        task = self.loop.create_task(build_includes_async(self.packages, discovery=DISCOVERY.SPEC, workers=1))
+        self.loop.call_soon(task.cancel)
+        self.assertRaises(asyncio.CancelledError, self._run, task)
+
+
+if __name__ == '__main__':
+    unittest.main()
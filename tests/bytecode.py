@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+bytecode
+----------------------------------
+Test bytecode precompilation
+"""
+from __future__ import absolute_import
+
+import marshal
+import os
+import shutil
+import unittest
+
+from frosty.bytecode import _CHECKED_HASH, bytecode_file, bytecode_key
+from frosty.cache import IncludeCache, MemoryIncludeCache
+from frosty.includes import DISCOVERY, compile_includes
+from frosty.workers import POOL
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_compile_includes(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for compile_includes and frosty.bytecode
+    """
+
+    sys_path = 'src'
+
+    def setUp(self):
+        super(Test_compile_includes, self).setUp()
+        self.package_dir = os.path.join(self.root, 'src', 'frosty_compiled')
+        write_file(os.path.join(self.package_dir, '__init__.py'), 'VALUE = 1\n')
+        write_file(os.path.join(self.package_dir, 'module.py'), 'def f():\n    "docs"\n    return 2\n')
+        write_file(os.path.join(self.package_dir, 'sub', '__init__.py'))
+        write_file(os.path.join(self.package_dir, 'sub', 'broken.py'), 'def (:\n')
+        write_file(os.path.join(self.package_dir, 'tests', '__init__.py'))
+        self.cache = IncludeCache(os.path.join(self.root, 'cache'))
+        self.output = os.path.join(self.root, 'bytecode')
+
+    def _compile(self, **kwargs):
+        kwargs.setdefault('cache', self.cache)
+        return compile_includes(['frosty_compiled'], self.output, discovery=DISCOVERY.SPEC, exclude=['*.tests'],
+                                **kwargs)
+
+    def test_tree(self):
+        tree = self._compile()
+        self.assertEqual(sorted(tree.modules), ['frosty_compiled', 'frosty_compiled.module', 'frosty_compiled.sub'])
+        self.assertEqual(list(tree.errors), ['frosty_compiled.sub.broken'])
+        self.assertEqual(tree.modules['frosty_compiled.sub'],
+                         os.path.join(self.output, 'frosty_compiled', 'sub', '__init__.pyc'))
+        self.assertTrue(os.path.isfile(os.path.join(self.output, 'frosty_compiled', 'module.pyc')))
+
+    def test_unchanged_modules_reused(self):
+        first = self._compile()
+        self.assertEqual(len(first.compiled), 3)
+        self.assertEqual(first.reused, [])
+
+        write_file(os.path.join(self.package_dir, 'module.py'), 'def f():\n    return 3\n')
+        shutil.rmtree(self.output)
+        second = self._compile(workers=2, pool=POOL.THREAD)
+        self.assertEqual(second.compiled, ['frosty_compiled.module'])
+        self.assertEqual(sorted(second.reused), ['frosty_compiled', 'frosty_compiled.sub'])
+
+    def test_clear(self):
+        self._compile()
+        self.assertTrue(os.listdir(self.cache.bytecode_directory()))
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache.bytecode_directory()))
+        self.assertEqual(len(self._compile().compiled), 3)
+
+    @unittest.skipIf(_CHECKED_HASH is None, u"checked-hash .pyc files (PEP 552) need Python 3.7+")
+    def test_reproducible(self):
+        path = os.path.join(self.output, 'frosty_compiled', 'module.pyc')
+        self._compile(cache=MemoryIncludeCache())
+        with open(path, 'rb') as f:
+            first = f.read()
+        os.utime(os.path.join(self.package_dir, 'module.py'), (0, 0))
+        self._compile(cache=None)
+        with open(path, 'rb') as f:
+            second = f.read()
+        self.assertEqual(first, second)
+        code = marshal.loads(second[16:])
+        self.assertEqual(code.co_filename, 'frosty_compiled/module.py')
+
+    def test_optimize_level(self):
+        self.assertNotEqual(bytecode_key(b'', 'x.py', 0), bytecode_key(b'', 'x.py', 2))
+        self.assertEqual(bytecode_file('a.b', True), 'a/b/__init__.pyc')
+        self.assertEqual(bytecode_file('a.b', False, suffix='.py'), 'a/b.py')
+
+
+if __name__ == '__main__':
+    unittest.main()
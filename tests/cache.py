@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+cache
+----------------------------------
+Test the persistent include cache
+"""
+from __future__ import absolute_import
+
+import os
+import unittest
+
+from frosty.cache import IncludeCache, resolve_cache
+from frosty.freezers import FREEZER
+from frosty.locations import PackageLocation
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_include_cache(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for IncludeCache
+    """
+
+    def setUp(self):
+        super(Test_include_cache, self).setUp()
+        self.cache_dir = os.path.join(self.root, 'cache')
+        self.package_dir = os.path.join(self.root, 'src', 'cachedpkg')
+        for path in ['__init__.py', 'module.py', os.path.join('sub', '__init__.py')]:
+            write_file(os.path.join(self.package_dir, path))
+        self.location = PackageLocation('cachedpkg', os.path.join(self.package_dir, '__init__.py'),
+                                        [self.package_dir])
+
+    def build(self, freezer, cache):
+        return freezer.build_includes([self.location], cache=cache)
+
+    def test_matches_uncached(self):
+        for freezer in FREEZER.ALL:
+            expected = freezer.build_includes([self.location])
+            self.assertEqual(expected, self.build(freezer, IncludeCache(self.cache_dir)))
+            # Second round is served from the cache files written by the first
+            self.assertEqual(expected, self.build(freezer, IncludeCache(self.cache_dir)))
+
+    def test_unchanged_tree_not_walked(self):
+        self.build(FREEZER.CXFREEZE, IncludeCache(self.cache_dir))
+
+        def fail(*args, **kwargs):
+            raise AssertionError(u"Unchanged package was walked again")
+
+        cache = IncludeCache(self.cache_dir)
+        original = FREEZER.CXFREEZE.__dict__['_iter_package_includes']
+        FREEZER.CXFREEZE._iter_package_includes = fail
+        try:
+            actual = self.build(FREEZER.CXFREEZE, cache)
+        finally:
+            FREEZER.CXFREEZE._iter_package_includes = original
+        self.assertEqual(set(['cachedpkg', 'cachedpkg.module', 'cachedpkg.sub']), actual)
+
+    def test_changed_tree_rescanned(self):
+        self.build(FREEZER.CXFREEZE, IncludeCache(self.cache_dir))
+        write_file(os.path.join(self.package_dir, 'sub', 'added.py'))
+
+        actual = self.build(FREEZER.CXFREEZE, IncludeCache(self.cache_dir))
+        self.assertEqual(set(['cachedpkg', 'cachedpkg.module', 'cachedpkg.sub', 'cachedpkg.sub.added']), actual)
+
+    def test_new_sub_package_found(self):
+        write_file(os.path.join(self.package_dir, 'data', 'asset.txt'))
+        self.build(FREEZER.DEFAULT, IncludeCache(self.cache_dir))
+        write_file(os.path.join(self.package_dir, 'data', '__init__.py'))
+
+        actual = self.build(FREEZER.DEFAULT, IncludeCache(self.cache_dir))
+        self.assertEqual(set(['cachedpkg', 'cachedpkg.sub.*', 'cachedpkg.data.*']), actual)
+
+    def test_resolve_cache(self):
+        self.assertEqual(resolve_cache(None), None)
+        self.assertEqual(resolve_cache(False), None)
+        self.assertEqual(resolve_cache(self.cache_dir).directory, self.cache_dir)
+        cache = IncludeCache(self.cache_dir)
+        self.assertTrue(resolve_cache(cache) is cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
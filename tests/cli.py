@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+cli
+----------------------------------
+Test batch builds and the command line tool
+"""
+from __future__ import absolute_import
+
+import ast
+import io
+import json
+import os
+import unittest
+
+from frosty.cache import MemoryIncludeCache
+from frosty.cli import load_batch, main
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY, build_batch_includes, build_includes
+from frosty.stats import BuildStats
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_batch(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for build_batch_includes and the frosty command line tool
+    """
+
+    sys_path = u""
+
+    def setUp(self):
+        super(Test_batch, self).setUp()
+        for name in [u"__init__.py", u"core.py", u"sub/__init__.py", u"sub/deep.py"]:
+            write_file(os.path.join(self.root, u"frosty_batch_pkg", *name.split(u"/")))
+        write_file(os.path.join(self.root, u"frosty_batch_mod.py"))
+        self.targets = {
+            u"one": {u"packages": [u"frosty_batch_pkg"], u"freezer": u"cxfreeze"},
+            u"two": {u"packages": [u"frosty_batch_pkg", u"frosty_batch_mod"], u"freezer": u"py2exe"},
+        }
+
+    def test_matches_build_includes(self):
+        """
+        Ensure that every target gets the same includes as a separate build
+        """
+        actual = build_batch_includes(self.targets, discovery=DISCOVERY.SPEC)
+        for target_name, target in self.targets.items():
+            expected = build_includes(target[u"packages"], freezer=target[u"freezer"], discovery=DISCOVERY.SPEC)
+            self.assertEqual(actual[target_name], expected)
+
+    def test_shared_trees(self):
+        """
+        Ensure that a package listed by several targets is walked into one shared tree
+        """
+        cache = MemoryIncludeCache()
+        build_batch_includes(self.targets, discovery=DISCOVERY.SPEC, cache=cache)
+        self.assertEqual(list(cache._entries), [os.path.join(self.root, u"frosty_batch_pkg")])
+        self.assertEqual(len(cache._entries[os.path.join(self.root, u"frosty_batch_pkg")].includes), 2)
+
+    def test_missing_packages_reported_together(self):
+        """
+        Ensure that missing required packages of every target are reported in one error
+        """
+        targets = {
+            u"one": {u"packages": [u"im_not_a_real_package"]},
+            u"two": {u"packages": [u"frosty_batch_pkg", u"im_also_not_a_real_package"]},
+        }
+        try:
+            build_batch_includes(targets, discovery=DISCOVERY.SPEC)
+            self.fail(u"Expected an ImportError")
+        except ImportError as e:
+            self.assertIn(u"one (im_not_a_real_package)", u"{0}".format(e))
+            self.assertIn(u"two (im_also_not_a_real_package)", u"{0}".format(e))
+
+    def test_stats(self):
+        stats = BuildStats()
+        self.targets[u"one"][u"stats"] = stats
+        build_batch_includes(self.targets, discovery=DISCOVERY.SPEC)
+        self.assertEqual([phase for phase, seconds in stats.phases], [u"split", u"packages"])
+        self.assertEqual([package.package_name for package in stats.packages], [u"frosty_batch_pkg"])
+
+    def test_invalid_target_names(self):
+        """
+        Ensure that target names can't write outside of --output-dir
+        """
+        batch_path = os.path.join(self.root, u"targets.json")
+        for target_name in [u"../escaped", u"sub/target", u"sub\\target", u"..", u"."]:
+            with io.open(batch_path, 'w', encoding='utf-8') as f:
+                f.write(u"{0}".format(json.dumps({target_name: {u"packages": [u"frosty_batch_pkg"]}})))
+            self.assertRaises(ValueError, load_batch, batch_path)
+
+        with io.open(batch_path, 'w', encoding='utf-8') as f:
+            f.write(u"{0}".format(json.dumps(self.targets)))
+        self.assertEqual(load_batch(batch_path), self.targets)
+
+    def test_main_batch_snippets(self):
+        """
+        Ensure that the command line tool writes freezer ready options per target
+        """
+        batch_path = os.path.join(self.root, u"targets.json")
+        with io.open(batch_path, 'w', encoding='utf-8') as f:
+            f.write(u"{0}".format(json.dumps(self.targets)))
+        output_dir = os.path.join(self.root, u"output")
+
+        status = main([u"--batch", batch_path, u"--discovery", DISCOVERY.SPEC, u"--format", u"snippet",
+                       u"--output-dir", output_dir])
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(os.listdir(output_dir)), [u"one.py", u"two.py"])
+
+        with io.open(os.path.join(output_dir, u"two.py"), 'r', encoding='utf-8') as f:
+            source = f.read()
+        options = ast.literal_eval(source.split(u"options = ", 1)[1])
+        expected = build_includes([u"frosty_batch_pkg", u"frosty_batch_mod"], freezer=FREEZER.PY2EXE,
+                                  discovery=DISCOVERY.SPEC)
+        self.assertEqual(options, {u"py2exe": {u"includes": sorted(expected)}})
+
+    def test_main_size_budget(self):
+        """
+        Ensure that the command line tool writes size reports and fails when a budget is exceeded
+        """
+        report_path = os.path.join(self.root, u"sizes.json")
+        output_dir = os.path.join(self.root, u"output")
+        arguments = [u"frosty_batch_pkg", u"--discovery", DISCOVERY.SPEC, u"--output-dir", output_dir,
+                     u"--size-report", report_path]
+        self.assertEqual(main(arguments), 0)
+        with io.open(report_path, 'r', encoding='utf-8') as f:
+            self.assertIn(u"includes", json.load(f))
+        self.assertEqual(main(arguments + [u"--max-bytes", u"-1"]), 3)
+
+    def test_main_missing_package(self):
+        """
+        Ensure that the command line tool fails cleanly for missing packages
+        """
+        self.assertEqual(main([u"im_not_a_real_package", u"--discovery", DISCOVERY.SPEC]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+exclude
+----------------------------------
+Test the exclusion patterns
+"""
+from __future__ import absolute_import
+
+import re
+import unittest
+
+from frosty.exclude import ExcludePatterns, resolve_exclude
+
+
+class Test_exclude_patterns(unittest.TestCase):
+    """
+    All tests for ExcludePatterns and resolve_exclude
+    """
+
+    def test_glob_patterns(self):
+        exclude = ExcludePatterns(['*.tests', '*.test.*'])
+        self.assertTrue(exclude('salt.tests'))
+        self.assertTrue(exclude('salt.modules.tests'))
+        self.assertTrue(exclude('salt.test.unit'))
+        self.assertFalse(exclude('salt.test'))
+        self.assertFalse(exclude('salt.tests_helper'))
+
+    def test_regex_patterns(self):
+        exclude = ExcludePatterns([re.compile(r'.*\._vendor\b')])
+        self.assertTrue(exclude('pip._vendor'))
+        self.assertTrue(exclude('pip._vendor.requests'))
+        self.assertFalse(exclude('pip._vendored'))
+
+    def test_key(self):
+        self.assertEqual(ExcludePatterns(['*.tests']).key, ExcludePatterns(['*.tests']).key)
+        self.assertNotEqual(ExcludePatterns(['*.tests']).key, ExcludePatterns(['*.test']).key)
+        self.assertNotEqual(ExcludePatterns(['a']).key, ExcludePatterns([re.compile('a')]).key)
+
+    def test_resolve_exclude(self):
+        self.assertIsNone(resolve_exclude(None))
+        self.assertIsNone(resolve_exclude([]))
+        self.assertTrue(resolve_exclude('*.tests')('salt.tests'))
+        self.assertTrue(resolve_exclude(re.compile('salt'))('salt.tests'))
+        exclude = ExcludePatterns(['*.tests'])
+        self.assertIs(resolve_exclude(exclude), exclude)
+
+
+if __name__ == '__main__':
+    unittest.main()
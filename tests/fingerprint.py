@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+fingerprint
+----------------------------------
+Test build fingerprints
+"""
+from __future__ import absolute_import
+
+import os
+import unittest
+
+from frosty.cache import IncludeCache
+from frosty.fingerprint import BuildFingerprint, hash_files, resolve_fingerprint
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY, build_includes
+from frosty.profile import ImportProfile
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_build_fingerprint(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for BuildFingerprint and build_includes(fingerprint=...)
+    """
+
+    sys_path = 'src'
+
+    def setUp(self):
+        super(Test_build_fingerprint, self).setUp()
+        self.package_dir = os.path.join(self.root, 'src', 'frosty_printed')
+        write_file(os.path.join(self.package_dir, '__init__.py'))
+        write_file(os.path.join(self.package_dir, 'module.py'), 'VALUE = 1\n')
+        write_file(os.path.join(self.package_dir, 'sub', '__init__.py'))
+        write_file(os.path.join(self.package_dir, 'sub', 'data.json'), '{}')
+        write_file(os.path.join(self.package_dir, 'idle.py'))
+        self.cache = IncludeCache(os.path.join(self.root, 'cache'))
+
+    def _fingerprint(self, **kwargs):
+        fingerprint = BuildFingerprint()
+        build_includes(['frosty_printed'], discovery=DISCOVERY.SPEC, fingerprint=fingerprint, **kwargs)
+        return fingerprint
+
+    def test_deterministic(self):
+        first = self._fingerprint()
+        second = self._fingerprint(cache=self.cache, workers=2)
+        self.assertEqual(first, second)
+        self.assertEqual(self._fingerprint(cache=self.cache), first)
+        self.assertEqual(sorted(first.files), ['frosty_printed/__init__.py', 'frosty_printed/idle.py',
+                                               'frosty_printed/module.py', 'frosty_printed/sub/__init__.py',
+                                               'frosty_printed/sub/data.json'])
+
+        path = os.path.join(self.root, 'build.fingerprint')
+        self.assertFalse(first.matches(path))
+        first.write(path)
+        self.assertTrue(second.matches(path))
+
+    def test_changes(self):
+        original = self._fingerprint()
+        self.assertNotEqual(original, self._fingerprint(freezer=FREEZER.CXFREEZE))
+        self.assertNotEqual(original, self._fingerprint(exclude=['*.sub']))
+
+        write_file(os.path.join(self.package_dir, 'module.py'), 'VALUE = 2\n')
+        self.assertNotEqual(original, self._fingerprint())
+
+    def test_package_data(self):
+        original = self._fingerprint()
+        write_file(os.path.join(self.package_dir, 'sub', 'data.json'), '{"changed": true}')
+        self.assertNotEqual(original, self._fingerprint())
+
+    def test_only_included_files(self):
+        profile = ImportProfile(['frosty_printed', 'frosty_printed.module'])
+        builds = [{'profile': profile}, {'exclude': ['frosty_printed.idle']},
+                  {'freezer': FREEZER.CXFREEZE, 'exclude': ['frosty_printed.idle']}]
+        originals = [self._fingerprint(**build) for build in builds]
+        for original in originals:
+            self.assertNotIn('frosty_printed/idle.py', original.files)
+
+        write_file(os.path.join(self.package_dir, 'idle.py'), 'UNUSED = 1\n')
+        self.assertEqual([self._fingerprint(**build) for build in builds], originals)
+
+    def test_cached_hashes(self):
+        path = os.path.join(self.package_dir, 'module.py')
+        first = hash_files([path], cache=self.cache)
+        self.assertIn(os.path.abspath(path), IncludeCache(self.cache.directory).file_hashes())
+
+        write_file(path, 'VALUE = 20\n')
+        self.assertNotEqual(hash_files([path], cache=IncludeCache(self.cache.directory)), first)
+
+    def test_resolve(self):
+        self.assertIsNone(resolve_fingerprint(None))
+        self.assertRaises(ValueError, resolve_fingerprint, True)
+        self.assertIsInstance(resolve_fingerprint(lambda fingerprint: None), BuildFingerprint)
+        self.assertRaises(ValueError, resolve_fingerprint, 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ Test all freezer lookup helper functions
 """
 from __future__ import absolute_import
 
+import os
 import six
 import sys
 
@@ -16,7 +17,10 @@ if sys.version_info <= (2, 6, 0, 'final', 0):
 else:
     import unittest
 
-from frosty.freezers import FREEZER, resolve_freezer
+from warnings import catch_warnings, simplefilter
+
+from frosty.freezers import FREEZER, _FreezerRegistry, _registry, register_freezer, resolve_freezer
+from tests import TemporaryDirectoryMixin, write_file
 
 
 class Test_freezer_resolve(unittest.TestCase):
@@ -57,6 +61,79 @@ class Test_freezer_resolve(unittest.TestCase):
         actual_instance = resolve_freezer(FREEZER.DEFAULT())
         self.assertEqual(actual_instance.__class__, FREEZER.DEFAULT)
 
+    def test_instantiated_built_in_no_warning(self):
+        """
+        Ensure that built-in freezer instances aren't reported as custom implementations
+        """
+        with catch_warnings(record=True) as caught_warnings:
+            simplefilter('always')
+            resolve_freezer(FREEZER.CXFREEZE())
+        self.assertEqual(len(caught_warnings), 0)
+
+    def test_string_lookup_cached_instance(self):
+        """
+        Ensure that string lookups are case insensitive and share one instance per freezer
+        """
+        self.assertIs(resolve_freezer(u"cxfreeze"), resolve_freezer(u" CxFreeze "))
+
+    def test_unsupported_freezer(self):
+        """
+        Ensure that unknown freezer names are rejected
+        """
+        self.assertRaises(ValueError, resolve_freezer, u"no-such-freezer")
+
+
+class _CustomFreezer(FREEZER.DEFAULT):
+    def __unicode__(self):
+        return u"custom"
+
+
+class Test_freezer_registry(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for registering freezers by name and through entry points
+    """
+
+    sys_path = ''
+    packages = ['frosty_test_plugin']
+
+    def test_register_freezer(self):
+        """
+        Ensure that registered freezers resolve by name, without warnings
+        """
+        register_freezer(u"Custom", _CustomFreezer)
+        try:
+            self.assertEqual(resolve_freezer(u"custom").__class__, _CustomFreezer)
+            with catch_warnings(record=True) as caught_warnings:
+                simplefilter('always')
+                resolve_freezer(_CustomFreezer())
+            self.assertEqual(len(caught_warnings), 0)
+        finally:
+            _registry._classes.pop(u"custom")
+            _registry._registered.discard(_CustomFreezer)
+
+    def test_entry_point_lazy_load(self):
+        """
+        Ensure that entry point freezers are only loaded when their name is looked up
+        """
+        write_file(os.path.join(self.root, u"frosty_test_plugin.py"),
+                   u"from frosty.freezers import FREEZER\n"
+                   u"class PluginFreezer(FREEZER.DEFAULT):\n"
+                   u"    pass\n")
+        dist_info = os.path.join(self.root, u"frosty_test_plugin-1.0.dist-info")
+        write_file(os.path.join(dist_info, u"METADATA"),
+                   u"Metadata-Version: 2.1\nName: frosty-test-plugin\nVersion: 1.0\n")
+        write_file(os.path.join(dist_info, u"entry_points.txt"),
+                   u"[frosty.freezers]\nplugin = frosty_test_plugin:PluginFreezer\n")
+
+        registry = _FreezerRegistry(FREEZER.ALL)
+        self.assertEqual(registry.lookup(u"py2exe"), FREEZER.PY2EXE)
+        self.assertNotIn('frosty_test_plugin', sys.modules)
+
+        freezer = registry.lookup(u"Plugin")
+        self.assertEqual(freezer.__name__, u"PluginFreezer")
+        self.assertTrue(registry.is_registered(freezer))
+        self.assertIsNone(registry.lookup(u"missing"))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
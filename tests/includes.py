@@ -8,12 +8,22 @@ Test all freezer include functions
 """
 from __future__ import absolute_import
 
+import os
+import sys
 import unittest
+import zipfile
 
 from warnings import catch_warnings, simplefilter
 
-from frosty.includes import _import_packages, build_includes
+from frosty.compat import EXTENSION_SUFFIXES
+from frosty.includes import _import_packages, _isolated_packages, _locate_packages, build_freezer_includes, \
+    build_includes, find_native_modules, iter_includes, DISCOVERY
+from frosty.locations import PackageLocation
 from frosty.freezers import FREEZER
+from frosty.workers import POOL
+from tests import TemporaryDirectoryMixin, write_file
+
+import frosty.walk
 
 
 class Test_import_packages(unittest.TestCase):
@@ -61,6 +71,91 @@ class Test_import_packages(unittest.TestCase):
         self.assertTrue(all(w.category is ImportWarning for w in caught_warnings))
 
 
+class Test_locate_packages(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for the _locate_packages internal function
+    """
+
+    sys_path = ''
+    packages = ['frosty_explosive']
+
+    def setUp(self):
+        super(Test_locate_packages, self).setUp()
+        for path in [['frosty_explosive', '__init__.py'], ['frosty_explosive', 'inner', '__init__.py']]:
+            write_file(os.path.join(self.root, *path), 'raise RuntimeError("package code was executed")\n')
+
+    def test_locations_exist(self):
+        import wheel
+        expected = set([PackageLocation.from_module(wheel), PackageLocation('sys')])
+        actual = _locate_packages(set(['wheel', 'sys']))
+        self.assertEqual(expected, actual)
+
+    def test_package_code_not_executed(self):
+        actual = _locate_packages(set(['frosty_explosive.inner']), top_level=False)
+        self.assertEqual(len(actual), 1)
+        location = actual.pop()
+        self.assertEqual(location.origin, os.path.join(self.root, 'frosty_explosive', 'inner', '__init__.py'))
+        self.assertNotIn('frosty_explosive', sys.modules)
+
+    def test_dotted_names_resolve_to_top_level(self):
+        actual = _locate_packages(set(['frosty_explosive.inner']))
+        self.assertEqual(set(location.name for location in actual), set(['frosty_explosive']))
+        self.assertNotIn('frosty_explosive', sys.modules)
+
+    def test_required_location_missing(self):
+        self.assertRaises(ImportError, _locate_packages, set(['im_not_a_real_package']))
+        self.assertRaises(ImportError, _locate_packages, set(['frosty_explosive.im_not_a_real_package']))
+
+    def test_optional_location_missing(self):
+        with catch_warnings(record=True) as caught_warnings:
+            simplefilter(u"always")
+            _locate_packages(set(), optional=set(['im_not_a_real_package']))
+
+        self.assertEqual(len(caught_warnings), 1)
+        self.assertTrue(all(w.category is ImportWarning for w in caught_warnings))
+
+
+class Test_isolated_packages(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for the _isolated_packages internal function
+    """
+
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_isolated_packages, self).setUp()
+        packages = {
+            'frosty_leaky': 'import sys\nsys.frosty_leaked = True\nprint("noise")\n',
+            'frosty_sleepy': 'import time\ntime.sleep(30)\n',
+        }
+        for name, source in packages.items():
+            write_file(os.path.join(self.root, name, '__init__.py'), source)
+
+    def test_locations_match_import(self):
+        import wheel
+        expected = set([PackageLocation.from_module(wheel), PackageLocation('sys')])
+        actual = _isolated_packages(set(['wheel', 'sys']), workers=2)
+        self.assertEqual(expected, actual)
+
+    def test_side_effects_isolated(self):
+        actual = _isolated_packages(set(['frosty_leaky']))
+        self.assertEqual(set(location.name for location in actual), set(['frosty_leaky']))
+        self.assertFalse(hasattr(sys, 'frosty_leaked'))
+        self.assertNotIn('frosty_leaky', sys.modules)
+
+    def test_timeout(self):
+        self.assertRaises(ImportError, _isolated_packages, set(['frosty_sleepy']), timeout=1)
+
+        with catch_warnings(record=True) as caught_warnings:
+            simplefilter(u"always")
+            actual = _isolated_packages(set(), optional=set(['frosty_sleepy', 'im_not_a_real_package']), timeout=1,
+                                        workers=2)
+
+        self.assertEqual(actual, set())
+        self.assertEqual(len(caught_warnings), 2)
+        self.assertTrue(all(w.category is ImportWarning for w in caught_warnings))
+
+
 class Test_build_includes(unittest.TestCase):
 
     def test_default_build_includes(self):
@@ -70,8 +165,6 @@ class Test_build_includes(unittest.TestCase):
             'wheel',
             'wheel.signatures.*',
             'wheel.test.*',
-            'wheel.test.complex-dist.complexdist.*',
-            'wheel.test.simple.dist.simpledist.*',
             'wheel.tool.*',
         ])
         actual = build_includes(packages, freezer=FREEZER.DEFAULT)
@@ -83,8 +176,7 @@ class Test_build_includes(unittest.TestCase):
             'sys', 'wheel', 'wheel.__main__', 'wheel.archive', 'wheel.bdist_wheel', 'wheel.decorator',
             'wheel.egg2wheel', 'wheel.install', 'wheel.metadata', 'wheel.paths', 'wheel.pep425tags',
             'wheel.pkginfo', 'wheel.signatures', 'wheel.signatures.djbec', 'wheel.signatures.ed25519py',
-            'wheel.signatures.keys', 'wheel.test', 'wheel.test.complex-dist.complexdist',
-            'wheel.test.simple.dist.simpledist', 'wheel.test.test_basic', 'wheel.test.test_install',
+            'wheel.signatures.keys', 'wheel.test', 'wheel.test.test_basic', 'wheel.test.test_install',
             'wheel.test.test_keys', 'wheel.test.test_paths', 'wheel.test.test_ranking',
             'wheel.test.test_signatures', 'wheel.test.test_tagopt', 'wheel.test.test_tool',
             'wheel.test.test_wheelfile', 'wheel.tool', 'wheel.util', 'wheel.wininst2wheel'
@@ -92,5 +184,249 @@ class Test_build_includes(unittest.TestCase):
         actual = build_includes(packages, freezer=FREEZER.CXFREEZE)
         self.assertEqual(expected, actual)
 
+    def test_exclude(self):
+        packages = set(['wheel', 'sys'])
+        exclude = ['*.test', '*.signatures.*']
+        self.assertEqual(build_includes(packages, freezer=FREEZER.DEFAULT, exclude=exclude),
+                         set(['sys', 'wheel', 'wheel.tool.*']))
+        self.assertEqual(build_includes(packages, freezer=FREEZER.DEFAULT, exclude='*.test.*'),
+                         set(['sys', 'wheel', 'wheel.signatures.*', 'wheel.tool.*']))
+        actual = build_includes(packages, freezer=FREEZER.CXFREEZE, exclude=exclude)
+        self.assertNotIn('wheel.test', actual)
+        self.assertNotIn('wheel.test.test_basic', actual)
+        self.assertNotIn('wheel.signatures.keys', actual)
+        self.assertIn('wheel.signatures', actual)
+        self.assertIn('wheel.tool', actual)
+        self.assertEqual(build_includes(packages, exclude=['sys', 'wheel']), set())
+
+    def test_exclude_compact(self):
+        actual = build_includes(set(['wheel']), freezer=FREEZER.DEFAULT, compact=True, exclude=['*.test'])
+        self.assertNotIn('wheel.*', actual)
+        self.assertIn('wheel.signatures.*', actual)
+        self.assertIn('wheel.archive', actual)
+        self.assertFalse([include for include in actual if include.startswith('wheel.test')])
+
+    def test_excluded_packages_never_walked(self):
+        scanned = []
+        scan_directory = frosty.walk.scan_directory
+
+        def recording_scan_directory(path):
+            scanned.append(path)
+            return scan_directory(path)
+        frosty.walk.scan_directory = recording_scan_directory
+        try:
+            for freezer in FREEZER.ALL:
+                build_includes(set(['wheel']), freezer=freezer, exclude=['*.test'])
+        finally:
+            frosty.walk.scan_directory = scan_directory
+        import wheel
+        wheel_dir = os.path.dirname(wheel.__file__)
+        self.assertIn(wheel_dir, scanned)
+        # The excluded package is listed (once per walk) to find that it is a package, but nothing in it is walked
+        self.assertEqual(scanned.count(os.path.join(wheel_dir, 'test')), len(FREEZER.ALL))
+        self.assertFalse([path for path in scanned if path.startswith(os.path.join(wheel_dir, 'test', ''))])
+
+    def test_spec_discovery_matches_import(self):
+        packages = set(['wheel', 'sys'])
+        for freezer in FREEZER.ALL:
+            expected = build_includes(packages, freezer=freezer, discovery=DISCOVERY.IMPORT)
+            actual = build_includes(packages, freezer=freezer, discovery=DISCOVERY.SPEC)
+            self.assertEqual(expected, actual)
+
+    def test_dotted_discovery_matches_import(self):
+        packages = set(['wheel.tool'])
+        expected = build_includes(packages, freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.IMPORT)
+        self.assertIn('wheel.signatures', expected)
+        for discovery in [DISCOVERY.SPEC, DISCOVERY.ISOLATED]:
+            actual = build_includes(packages, freezer=FREEZER.CXFREEZE, discovery=discovery, timeout=60)
+            self.assertEqual(expected, actual)
+
+    def test_isolated_discovery_matches_import(self):
+        packages = set(['wheel', 'sys'])
+        expected = build_includes(packages, freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.IMPORT)
+        actual = build_includes(packages, freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.ISOLATED, timeout=60)
+        self.assertEqual(expected, actual)
+
+    def test_workers_match_serial(self):
+        packages = set(['wheel', 'wheel.tool', 'wheel.signatures', 'sys', 'os'])
+        for freezer in FREEZER.ALL:
+            expected = build_includes(packages, freezer=freezer)
+            for pool in POOL.ALL:
+                actual = build_includes(packages, freezer=freezer, workers=4, pool=pool)
+                self.assertEqual(expected, actual)
+
+
+class Test_build_includes_archive(TemporaryDirectoryMixin, unittest.TestCase):
+
+    sys_path = 'frosty_zipped.egg'
+    packages = ['frosty_zipped']
+
+    def setUp(self):
+        super(Test_build_includes_archive, self).setUp()
+        with zipfile.ZipFile(os.path.join(self.root, 'frosty_zipped.egg'), 'w') as archive:
+            for path in ['__init__.py', 'module.py', 'sub/__init__.py', 'sub/inner.py', 'data/asset.txt']:
+                archive.writestr('frosty_zipped/' + path, '')
+
+    def test_default_build_includes(self):
+        expected = set(['frosty_zipped', 'frosty_zipped.sub.*'])
+        for discovery in [DISCOVERY.IMPORT, DISCOVERY.SPEC]:
+            actual = build_includes(set(['frosty_zipped']), freezer=FREEZER.DEFAULT, discovery=discovery)
+            self.assertEqual(expected, actual)
+
+    def test_cxfreeze_build_includes(self):
+        expected = set(['frosty_zipped', 'frosty_zipped.module', 'frosty_zipped.sub', 'frosty_zipped.sub.inner'])
+        for discovery in [DISCOVERY.IMPORT, DISCOVERY.SPEC]:
+            actual = build_includes(set(['frosty_zipped']), freezer=FREEZER.CXFREEZE, discovery=discovery)
+            self.assertEqual(expected, actual)
+
+
+@unittest.skipIf(sys.version_info < (3, 3), u"implicit namespace packages (PEP 420) need Python 3.3+")
+class Test_build_includes_namespace(TemporaryDirectoryMixin, unittest.TestCase):
+
+    packages = ['frosty_ns']
+
+    def setUp(self):
+        super(Test_build_includes_namespace, self).setUp()
+        self.roots = [os.path.join(self.root, 'first'), os.path.join(self.root, 'second')]
+        layout = [
+            (0, ['frosty_ns', 'alpha', '__init__.py']),
+            (0, ['frosty_ns', 'alpha', 'sub', '__init__.py']),
+            (0, ['frosty_ns', 'tool.py']),
+            (1, ['frosty_ns', 'beta', '__init__.py']),
+            (1, ['frosty_ns', 'beta', 'module.py']),
+            (1, ['frosty_ns', 'nested', 'gamma', '__init__.py']),
+            (1, ['frosty_ns', 'data-files', 'asset.txt']),
+        ]
+        for index, parts in layout:
+            write_file(os.path.join(self.roots[index], *parts))
+        # The first portion is listed twice, to make sure it isn't walked twice
+        self.path_entries = [self.roots[0], self.roots[0], self.roots[1]]
+        sys.path[0:0] = self.path_entries
+
+    def tearDown(self):
+        for path in self.path_entries:
+            sys.path.remove(path)
+        super(Test_build_includes_namespace, self).tearDown()
+
+    def test_default_build_includes(self):
+        expected = set([
+            'frosty_ns', 'frosty_ns.alpha', 'frosty_ns.alpha.sub.*', 'frosty_ns.tool', 'frosty_ns.beta',
+            'frosty_ns.nested', 'frosty_ns.nested.gamma',
+        ])
+        for discovery in [DISCOVERY.IMPORT, DISCOVERY.SPEC]:
+            actual = build_includes(set(['frosty_ns']), freezer=FREEZER.DEFAULT, discovery=discovery)
+            self.assertEqual(expected, actual)
+
+    def test_cxfreeze_build_includes(self):
+        expected = set([
+            'frosty_ns', 'frosty_ns.alpha', 'frosty_ns.alpha.sub', 'frosty_ns.tool', 'frosty_ns.beta',
+            'frosty_ns.beta.module', 'frosty_ns.nested', 'frosty_ns.nested.gamma',
+        ])
+        actual = build_includes(set(['frosty_ns']), freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC)
+        self.assertEqual(expected, actual)
+
+
+class Test_build_includes_compiled(TemporaryDirectoryMixin, unittest.TestCase):
+
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_build_includes_compiled, self).setUp()
+        extension = EXTENSION_SUFFIXES[0]
+        for parts in [['__init__.py'], ['plain.py'], ['_speedups' + extension], ['sourceless.pyc'],
+                      ['both.py'], ['both.pyc'], ['cython', '__init__' + extension], ['cython', 'inner.py'],
+                      ['__pycache__', 'plain.cpython-99.pyc'], ['not-a-module.py']]:
+            write_file(os.path.join(self.root, 'frosty_compiled', *parts))
+
+    def test_cxfreeze_build_includes(self):
+        expected = set([
+            'frosty_compiled', 'frosty_compiled.plain', 'frosty_compiled._speedups', 'frosty_compiled.sourceless',
+            'frosty_compiled.both', 'frosty_compiled.cython', 'frosty_compiled.cython.inner',
+        ])
+        actual = build_includes(set(['frosty_compiled']), freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC)
+        self.assertEqual(expected, actual)
+
+    def test_default_build_includes(self):
+        expected = set(['frosty_compiled', 'frosty_compiled.cython.*'])
+        actual = build_includes(set(['frosty_compiled']), freezer=FREEZER.DEFAULT, discovery=DISCOVERY.SPEC)
+        self.assertEqual(expected, actual)
+
+    def test_find_native_modules(self):
+        package_dir = os.path.join(self.root, 'frosty_compiled')
+        expected = {
+            'frosty_compiled._speedups': os.path.join(package_dir, '_speedups' + EXTENSION_SUFFIXES[0]),
+            'frosty_compiled.cython': os.path.join(package_dir, 'cython', '__init__' + EXTENSION_SUFFIXES[0]),
+        }
+        actual = find_native_modules(set(['frosty_compiled']), discovery=DISCOVERY.SPEC)
+        self.assertEqual(expected, actual)
+
+
+class Test_iter_includes(unittest.TestCase):
+
+    def test_matches_build_includes(self):
+        packages = set(['wheel', 'sys'])
+        for freezer in FREEZER.ALL:
+            expected = build_includes(packages, freezer=freezer)
+            actual = list(iter_includes(packages, freezer=freezer))
+            self.assertEqual(len(actual), len(expected))
+            self.assertEqual(set(actual), expected)
+
+    def test_exclude_matches_build_includes(self):
+        for freezer in FREEZER.ALL:
+            expected = build_includes(set(['wheel']), freezer=freezer, exclude=['*.test'])
+            actual = set(iter_includes(set(['wheel']), freezer=freezer, exclude=['*.test']))
+            self.assertEqual(expected, actual)
+
+    def test_lazy(self):
+        includes = iter_includes(set(['wheel']), freezer=FREEZER.CXFREEZE)
+        self.assertEqual(next(includes), 'wheel')
+
+    def test_missing_packages_reported_up_front(self):
+        includes = iter_includes(set(['im_not_a_real_package']))
+        self.assertRaises(ImportError, next, includes)
+
+
+class Test_build_freezer_includes(unittest.TestCase):
+
+    def setUp(self):
+        self.scanned = []
+        self.scan_directory = frosty.walk.scan_directory
+
+        def scan_directory(path):
+            self.scanned.append(path)
+            return self.scan_directory(path)
+        frosty.walk.scan_directory = scan_directory
+
+    def tearDown(self):
+        frosty.walk.scan_directory = self.scan_directory
+
+    def test_matches_build_includes(self):
+        packages = set(['wheel', 'wheel.tool', 'sys'])
+        for compact in [False, True]:
+            actual = build_freezer_includes(packages, FREEZER.ALL, compact=compact)
+            self.assertEqual(sorted(actual), ['bbfreeze', 'cxfreeze', 'default', 'py2app', 'py2exe'])
+            for freezer in FREEZER.ALL:
+                expected = build_includes(packages, freezer=freezer, compact=compact)
+                self.assertEqual(actual[u"{0}".format(freezer())], expected)
+
+    def test_exclude_matches_build_includes(self):
+        actual = build_freezer_includes(set(['wheel']), FREEZER.ALL, exclude=['*.test'])
+        for freezer in FREEZER.ALL:
+            expected = build_includes(set(['wheel']), freezer=freezer, exclude=['*.test'])
+            self.assertEqual(actual[u"{0}".format(freezer())], expected)
+
+    def test_single_scan(self):
+        build_freezer_includes(set(['wheel']), [FREEZER.DEFAULT, FREEZER.CXFREEZE, 'py2exe'])
+        self.assertTrue(self.scanned)
+        self.assertEqual(len(self.scanned), len(set(self.scanned)))
+
+    def test_workers_match_serial(self):
+        packages = set(['wheel', 'wheel.tool', 'sys'])
+        expected = build_freezer_includes(packages, FREEZER.ALL)
+        for pool in POOL.ALL:
+            actual = build_freezer_includes(packages, FREEZER.ALL, workers=4, pool=pool)
+            self.assertEqual(expected, actual)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+index
+----------------------------------
+Test module archives and the meta path finder that imports from them
+"""
+from __future__ import absolute_import
+
+import os
+import subprocess
+import sys
+import unittest
+
+from frosty.cache import MemoryIncludeCache
+from frosty.includes import DISCOVERY, compile_includes
+from frosty.index import IndexFinder, install, write_module_index
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_module_index(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for write_module_index and IndexFinder
+    """
+
+    packages = ['frosty_indexed']
+
+    def setUp(self):
+        super(Test_module_index, self).setUp()
+        source_dir = os.path.join(self.root, 'src')
+        write_file(os.path.join(source_dir, 'frosty_indexed', '__init__.py'), 'from . import module\n')
+        write_file(os.path.join(source_dir, 'frosty_indexed', 'module.py'), 'VALUE = 42\n')
+        write_file(os.path.join(source_dir, 'frosty_indexed', 'sub', '__init__.py'))
+        write_file(os.path.join(source_dir, 'frosty_indexed', 'sub', 'deep.py'), 'from .. import module\nVALUE = 7\n')
+
+        sys.path.insert(0, source_dir)
+        try:
+            tree = compile_includes(['frosty_indexed'], os.path.join(self.root, 'bytecode'), discovery=DISCOVERY.SPEC,
+                                    cache=MemoryIncludeCache())
+        finally:
+            sys.path.remove(source_dir)
+        self.archive = os.path.join(self.root, 'modules.idx')
+        self.assertEqual(write_module_index(tree.modules, self.archive), 4)
+        self.finder = None
+
+    def tearDown(self):
+        if self.finder is not None:
+            sys.meta_path.remove(self.finder)
+            self.finder.close()
+        super(Test_module_index, self).tearDown()
+
+    def test_import(self):
+        self.finder = install(self.archive)
+        import frosty_indexed.sub.deep
+        self.assertEqual(frosty_indexed.sub.deep.VALUE, 7)
+        self.assertEqual(frosty_indexed.module.VALUE, 42)
+        self.assertIs(frosty_indexed.__loader__, self.finder)
+        self.assertEqual(frosty_indexed.sub.__path__, [])
+
+    def test_unknown_modules_passed_on(self):
+        finder = IndexFinder(self.archive, search_root=os.path.join(self.root, 'lib'))
+        try:
+            self.assertIsNone(finder.find_module('frosty_not_indexed'))
+            self.assertTrue(finder.is_package('frosty_indexed.sub'))
+            self.assertFalse(finder.is_package('frosty_indexed.module'))
+            if hasattr(finder, 'find_spec') and sys.version_info >= (3, 4):
+                self.assertIsNone(finder.find_spec('frosty_not_indexed'))
+                self.assertEqual(finder.find_spec('frosty_indexed.sub').submodule_search_locations,
+                                 [os.path.join(self.root, 'lib', 'frosty_indexed', 'sub')])
+        finally:
+            finder.close()
+
+    @unittest.skipIf(sys.version_info < (3, 7), u"importing frosty only defers the build modules on Python 3.7+")
+    def test_runtime_imports(self):
+        """
+        Ensure that the runtime modules don't import the build (they run before anything else in frozen applications)
+        """
+        script = ("import sys; before = set(sys.modules); import frosty.index, frosty.lazy, frosty.profile; "
+                  "print(' '.join(sorted(set(sys.modules) - before)))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=root)
+        imported = set(output.decode('utf-8').split())
+        self.assertEqual(set(name for name in imported if name.startswith('frosty')),
+                         set(['frosty', 'frosty.files', 'frosty.index', 'frosty.lazy', 'frosty.profile']))
+        for name in ['json', 'zipfile', 'subprocess', 'concurrent.futures', 'py_compile', 'six', 'threading', 'gzip']:
+            self.assertNotIn(name, imported)
+
+    def test_not_an_archive(self):
+        path = os.path.join(self.root, 'bytecode', 'frosty_indexed', 'module.pyc')
+        self.assertRaises(ValueError, IndexFinder, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+lazy
+----------------------------------
+Test lazily imported modules
+"""
+from __future__ import absolute_import
+
+import os
+import sys
+import unittest
+
+from frosty.includes import DISCOVERY, find_lazy_modules
+from frosty.lazy import install
+from frosty.profile import ImportProfile
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_lazy_modules(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for find_lazy_modules and the lazy import finder
+    """
+
+    sys_path = ''
+    packages = ['frosty_lazy']
+
+    def setUp(self):
+        super(Test_lazy_modules, self).setUp()
+        package_dir = os.path.join(self.root, 'frosty_lazy')
+        write_file(os.path.join(package_dir, '__init__.py'), 'from . import heavy, used\n')
+        write_file(os.path.join(package_dir, 'heavy.py'),
+                   'import frosty_lazy\nfrosty_lazy.EXECUTED = True\nVALUE = 1\n')
+        write_file(os.path.join(package_dir, 'used.py'))
+        write_file(os.path.join(package_dir, 'plugins', '__init__.py'))
+        self.finder = None
+
+    def tearDown(self):
+        if self.finder is not None:
+            sys.meta_path.remove(self.finder)
+        super(Test_lazy_modules, self).tearDown()
+
+    def test_report(self):
+        profile = ImportProfile(['frosty_lazy', 'frosty_lazy.used'])
+        report = find_lazy_modules(['frosty_lazy'], lazy=['*.plugins'], profile=profile, keep=['*.used'],
+                                   discovery=DISCOVERY.SPEC)
+        self.assertEqual(report.lazy, {'frosty_lazy.heavy': 'profile', 'frosty_lazy.plugins': 'pattern'})
+        self.assertEqual(report.eager, ['frosty_lazy', 'frosty_lazy.used'])
+
+    @unittest.skipIf(sys.version_info < (3, 5), "Lazy loading needs importlib.util.LazyLoader")
+    def test_deferred_execution(self):
+        report = find_lazy_modules(['frosty_lazy'], lazy=['*.heavy'], discovery=DISCOVERY.SPEC)
+        manifest = os.path.join(self.root, 'lazy.json')
+        report.write(manifest)
+        self.finder = install(manifest)
+
+        import frosty_lazy
+        self.assertFalse(hasattr(frosty_lazy, 'EXECUTED'))
+        self.assertEqual(frosty_lazy.heavy.VALUE, 1)
+        self.assertTrue(frosty_lazy.EXECUTED)
+
+
+if __name__ == '__main__':
+    unittest.main()
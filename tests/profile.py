@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+profile
+----------------------------------
+Test import profiles and profile-guided include trimming
+"""
+from __future__ import absolute_import
+
+import os
+import sys
+import unittest
+
+from frosty.exclude import resolve_exclude
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY, build_includes
+from frosty.profile import ImportProfile, ImportRecorder, PROFILE_VARIABLE, record_imports, resolve_profile
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_import_profile(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for ImportRecorder, ImportProfile and build_includes(profile=...)
+    """
+
+    sys_path = ''
+    packages = ['frosty_profiled']
+
+    def setUp(self):
+        super(Test_import_profile, self).setUp()
+        for name in ['__init__.py', 'core.py', 'unused.py', 'used/__init__.py', 'used/deep.py', 'used/idle.py',
+                     'idle/__init__.py', 'idle/module.py', 'plugins/__init__.py', 'plugins/extra.py']:
+            write_file(os.path.join(self.root, 'frosty_profiled', *name.split('/')))
+        self.profile = ImportProfile(['frosty_profiled', 'frosty_profiled.core', 'frosty_profiled.used',
+                                      'frosty_profiled.used.deep'])
+
+    def test_recorder_merges_runs(self):
+        for path in [os.path.join(self.root, 'profile.json'), os.path.join(self.root, 'profile.json.gz')]:
+            ImportProfile(['first_run']).write(path)
+            for name in ['frosty_profiled', 'frosty_profiled.core']:
+                sys.modules.pop(name, None)
+            with ImportRecorder(path):
+                import frosty_profiled.core  # noqa
+                import frosty.reachability  # noqa
+            modules = ImportProfile.load(path).modules
+            self.assertTrue(set(['first_run', 'frosty', 'frosty.reachability', 'frosty_profiled',
+                                 'frosty_profiled.core', 'encodings']) <= modules)
+            self.assertEqual(resolve_profile([path]).modules, modules)
+
+    def test_recorder_keeps_earlier_imports(self):
+        import json  # noqa
+        path = os.path.join(self.root, 'profile.json')
+        with ImportRecorder(path):
+            import email  # noqa
+        includes = build_includes(['json', 'email'], discovery=DISCOVERY.SPEC, profile=path)
+        self.assertIn('json', includes)
+        self.assertIn('email', includes)
+
+    def test_record_imports_disabled(self):
+        previous = os.environ.pop(PROFILE_VARIABLE, None)
+        try:
+            self.assertIsNone(record_imports())
+        finally:
+            if previous is not None:
+                os.environ[PROFILE_VARIABLE] = previous
+
+    def test_load_invalid(self):
+        path = os.path.join(self.root, 'not_a_profile.json')
+        with open(path, 'w') as f:
+            f.write('[]')
+        self.assertRaises(ValueError, ImportProfile.load, path)
+
+    def test_trim_wildcards(self):
+        includes = build_includes(['frosty_profiled'], discovery=DISCOVERY.SPEC, profile=self.profile)
+        self.assertEqual(includes, set(['frosty_profiled', 'frosty_profiled.used', 'frosty_profiled.used.deep']))
+
+    def test_trim_names(self):
+        includes = build_includes(['frosty_profiled'], freezer=FREEZER.PY2EXE, discovery=DISCOVERY.SPEC,
+                                  profile=self.profile, compact=True)
+        self.assertEqual(includes, set(['frosty_profiled', 'frosty_profiled.core', 'frosty_profiled.used',
+                                        'frosty_profiled.used.deep']))
+
+    def test_keep(self):
+        includes = build_includes(['frosty_profiled'], freezer=FREEZER.PY2EXE, discovery=DISCOVERY.SPEC,
+                                  profile=self.profile, keep=['frosty_profiled.plugins*'])
+        self.assertEqual(includes, set(['frosty_profiled', 'frosty_profiled.plugins.*', 'frosty_profiled.used',
+                                        'frosty_profiled.used.deep']))
+
+    def test_profile_exclude(self):
+        exclude = self.profile.exclude(keep=resolve_exclude(['*.plugins']))
+        self.assertTrue(exclude('frosty_profiled.idle'))
+        self.assertTrue(exclude('frosty_profiled.plugins.extra'))
+        self.assertFalse(exclude('frosty_profiled.plugins'))
+        self.assertFalse(exclude('frosty_profiled.used.*'))
+        self.assertNotEqual(exclude.key, self.profile.exclude().key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+reachability
+----------------------------------
+Test the static import graph include strategy
+"""
+from __future__ import absolute_import
+
+import os
+import sys
+import unittest
+
+from frosty.cache import IncludeCache
+from frosty.freezers import FREEZER
+from frosty.reachability import build_reachable_includes, find_imports, _resolve_relative
+from frosty.workers import POOL
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_find_imports(unittest.TestCase):
+
+    def test_statements_and_calls(self):
+        source = '\n'.join([
+            'import os.path, json',
+            'from . import sibling',
+            'from ..parent import name',
+            'import importlib',
+            'importlib.import_module("plugins.loaded")',
+            '__import__("other")',
+            'importlib.import_module(computed)',
+        ])
+        expected = [
+            ('os.path', [], 0), ('json', [], 0), (None, ['sibling'], 1), ('parent', ['name'], 2),
+            ('importlib', [], 0), ('plugins.loaded', [], 0), ('other', [], 0),
+        ]
+        self.assertEqual(sorted(find_imports(source), key=repr), sorted(expected, key=repr))
+
+    def test_resolve_relative(self):
+        self.assertEqual(_resolve_relative('a.b.c', False, 'd', 1), 'a.b.d')
+        self.assertEqual(_resolve_relative('a.b', True, 'd', 1), 'a.b.d')
+        self.assertEqual(_resolve_relative('a.b.c', False, None, 2), 'a')
+        self.assertEqual(_resolve_relative('a', False, 'd', 1), None)
+        self.assertEqual(_resolve_relative(None, False, 'd', 1), None)
+
+
+class Test_build_reachable_includes(TemporaryDirectoryMixin, unittest.TestCase):
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_build_reachable_includes, self).setUp()
+        package = os.path.join(self.root, 'frosty_app')
+        write_file(os.path.join(package, '__init__.py'))
+        write_file(os.path.join(package, 'core.py'), 'from . import helpers\nfrom .sub import thing\n')
+        write_file(os.path.join(package, 'helpers.py'), 'import json\n')
+        write_file(os.path.join(package, 'unused.py'))
+        write_file(os.path.join(package, 'sub', '__init__.py'))
+        write_file(os.path.join(package, 'sub', 'thing.py'))
+        write_file(os.path.join(package, 'sub', 'other.py'))
+        write_file(os.path.join(package, 'tests', '__init__.py'))
+        write_file(os.path.join(package, 'tests', 'test_core.py'), 'import frosty_app.core\n')
+        write_file(os.path.join(package, 'plugins', '__init__.py'))
+        write_file(os.path.join(package, 'plugins', 'first.py'))
+        self.script = os.path.join(self.root, 'main.py')
+        write_file(self.script,
+                   'import frosty_app.core\nimport importlib\nimportlib.import_module("frosty_app.plugins")\n')
+
+    def test_reachable_only(self):
+        expected = set([
+            'frosty_app', 'frosty_app.core', 'frosty_app.helpers', 'frosty_app.sub', 'frosty_app.sub.thing',
+            'frosty_app.plugins',
+        ])
+        actual = build_reachable_includes([self.script], ['frosty_app'])
+        self.assertEqual(expected, actual)
+        self.assertNotIn('frosty_app', sys.modules)
+
+    def test_dynamic(self):
+        actual = build_reachable_includes([self.script], ['frosty_app'], freezer=FREEZER.CXFREEZE,
+                                          dynamic=['frosty_app.plugins'])
+        self.assertIn('frosty_app.plugins.first', actual)
+        self.assertNotIn('frosty_app.unused', actual)
+
+    def test_workers_and_cache(self):
+        expected = build_reachable_includes([self.script], ['frosty_app'])
+        cache = IncludeCache(os.path.join(self.root, 'cache'))
+        for pool in POOL.ALL:
+            self.assertEqual(expected, build_reachable_includes([self.script], ['frosty_app'], workers=2, pool=pool,
+                                                                cache=cache))
+        self.assertTrue(os.listdir(os.path.join(self.root, 'cache', 'imports')))
+        self.assertEqual(expected, build_reachable_includes([self.script], ['frosty_app'],
+                                                            cache=IncludeCache(os.path.join(self.root, 'cache'))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+sizes
+----------------------------------
+Test the bundle size report
+"""
+from __future__ import absolute_import
+
+import os
+import unittest
+
+from frosty.cache import MemoryIncludeCache
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY, build_includes
+from frosty.sizes import DATA, SizeReport, resolve_sizes
+from frosty.stats import BuildStats
+from frosty.walk import MODULE
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_size_report(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for SizeReport
+    """
+
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_size_report, self).setUp()
+        package_dir = os.path.join(self.root, 'frosty_sized')
+        for parts, size in [(['__init__.py'], 10), (['module.py'], 100), (['module.pyc'], 1000),
+                            (['sub', '__init__.py'], 20), (['sub', 'heavy.py'], 5000),
+                            (['sub', 'templates', 'page.html'], 300), (['sub', 'LICENSE'], 7),
+                            (['excluded', '__init__.py'], 50000)]:
+            write_file(os.path.join(package_dir, *parts), '#' * size)
+
+    def test_default_wildcards(self):
+        report = SizeReport()
+        includes = build_includes(['frosty_sized'], discovery=DISCOVERY.SPEC, sizes=report, exclude=['*.excluded'])
+        self.assertEqual(includes, set(['frosty_sized', 'frosty_sized.sub.*']))
+        # Directories that aren't packages (sub/templates) are never walked, so they aren't measured
+        self.assertEqual(report.by_include(), [
+            ('frosty_sized.sub.*', 5027, {MODULE.SOURCE: 5020, DATA: 7}),
+            ('frosty_sized', 1110, {MODULE.SOURCE: 110, MODULE.BYTECODE: 1000}),
+        ])
+        self.assertEqual(report.unattributed_bytes, 0)
+        self.assertEqual(report.by_subtree(), [('frosty_sized', 6137), ('frosty_sized.sub', 5027)])
+
+    def test_explicit_modules(self):
+        report = SizeReport()
+        build_includes(['frosty_sized'], freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC, sizes=report)
+        ranked = report.by_include()
+        self.assertEqual(ranked[0], ('frosty_sized.excluded', 50000, {MODULE.SOURCE: 50000}))
+        self.assertIn(('frosty_sized.module', 1100, {MODULE.SOURCE: 100, MODULE.BYTECODE: 1000}), ranked)
+        self.assertEqual(report.unattributed_bytes, 0)
+        self.assertEqual(report.total_bytes, 56137)
+
+    def test_excluded_modules(self):
+        report = SizeReport()
+        build_includes(['frosty_sized'], freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC, sizes=report,
+                       exclude=['frosty_sized.module'])
+        self.assertNotIn('frosty_sized.module', [include for include, size, kinds in report.by_include()])
+        self.assertEqual(report.unattributed_bytes, 1100)
+
+    def test_cached(self):
+        expected = SizeReport()
+        build_includes(['frosty_sized'], discovery=DISCOVERY.SPEC, sizes=expected)
+        cache = MemoryIncludeCache()
+        for run in range(2):
+            report, stats = SizeReport(), BuildStats()
+            build_includes(['frosty_sized'], discovery=DISCOVERY.SPEC, sizes=report, stats=stats, cache=cache)
+            self.assertEqual(report.to_dict(), expected.to_dict())
+            self.assertEqual([package.cached for package in stats.packages], [run == 1])
+
+    def test_check(self):
+        report = SizeReport()
+        build_includes(['frosty_sized'], freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC, sizes=report)
+        self.assertEqual(report.check(), [])
+        self.assertEqual(report.check(max_bytes=100000, max_include_bytes=50000), [])
+        self.assertEqual(len(report.check(max_bytes=1000)), 1)
+        self.assertEqual(len(report.check(max_include_bytes=1000)), 3)
+
+    def test_callback(self):
+        reports = []
+        build_includes(['frosty_sized'], discovery=DISCOVERY.SPEC, sizes=reports.append)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].to_dict()[u"includes"][0][u"include"], 'frosty_sized.excluded.*')
+
+    def test_resolve_sizes(self):
+        self.assertIsNone(resolve_sizes(None))
+        self.assertRaises(ValueError, resolve_sizes, True)
+        report = SizeReport()
+        self.assertIs(resolve_sizes(report), report)
+        self.assertRaises(ValueError, resolve_sizes, 'yes')
+
+
+if __name__ == '__main__':
+    unittest.main()
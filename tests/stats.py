@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+stats
+----------------------------------
+Test the build_includes measurements
+"""
+from __future__ import absolute_import
+
+import shutil
+import tempfile
+import unittest
+
+from frosty.freezers import FREEZER
+from frosty.includes import build_includes
+from frosty.stats import BuildStats, resolve_stats
+from frosty.workers import POOL
+
+
+class Test_build_stats(unittest.TestCase):
+    """
+    All tests for collecting BuildStats from build_includes
+    """
+
+    def test_phases_and_packages(self):
+        stats = BuildStats()
+        includes = build_includes(set(['wheel', 'sys']), freezer=FREEZER.CXFREEZE, stats=stats)
+
+        self.assertEqual([phase for phase, seconds in stats.phases], ['discovery', 'split', 'packages'])
+        self.assertEqual([package.package_name for package in stats.packages], ['wheel'])
+        self.assertEqual(stats.includes, len(includes) - 1)  # 'sys' is passed through without being walked
+        self.assertTrue(stats.directories > 1)
+        self.assertTrue(stats.files > stats.directories)
+        self.assertTrue(stats.packages[0].walk_seconds <= stats.packages[0].seconds)
+
+    def test_callback(self):
+        reported = []
+        build_includes(set(['wheel']), stats=reported.append)
+        self.assertEqual(len(reported), 1)
+        self.assertEqual(reported[0].to_dict()['packages'][0]['package_name'], 'wheel')
+
+    def test_process_pool(self):
+        stats = BuildStats()
+        build_includes(set(['wheel', 'wheel.tool']), workers=2, pool=POOL.PROCESS, stats=stats)
+        self.assertEqual(len(stats.packages), 1)  # wheel.tool is imported as wheel, just like before
+
+    def test_cached(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            build_includes(set(['wheel']), cache=cache_dir)
+            stats = BuildStats()
+            build_includes(set(['wheel']), cache=cache_dir, stats=stats)
+        finally:
+            shutil.rmtree(cache_dir)
+        self.assertTrue(stats.packages[0].cached)
+        self.assertEqual(stats.directories, 0)
+
+    def test_resolve_stats(self):
+        self.assertEqual(resolve_stats(None), None)
+        self.assertEqual(resolve_stats(False), None)
+        self.assertRaises(ValueError, resolve_stats, True)
+        stats = BuildStats()
+        self.assertTrue(resolve_stats(stats) is stats)
+        self.assertRaises(ValueError, resolve_stats, 'not a callback')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+trie
+----------------------------------
+Test the include name trie
+"""
+from __future__ import absolute_import
+
+import unittest
+
+from frosty.freezers import FREEZER
+from frosty.includes import build_includes
+from frosty.trie import IncludeTrie
+
+
+class Test_include_trie(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = IncludeTrie()
+        modules = [('app', True), ('app.core', False), ('app.util', False), ('app.sub', True), ('app.sub.a', False),
+                   ('app.sub.b', False)]
+        for name, package in modules:
+            self.trie.add_module(name, package=package)
+
+    def test_membership(self):
+        self.trie.add('app')
+        self.trie.add('app.sub.*')
+        self.assertEqual(len(self.trie), 2)
+        self.assertIn('app', self.trie)
+        self.assertIn('app.sub', self.trie)
+        self.assertIn('app.sub.a', self.trie)
+        self.assertIn('app.sub.*', self.trie)
+        self.assertNotIn('app.core', self.trie)
+        self.assertNotIn('app.*', self.trie)
+        self.assertNotIn('other', self.trie)
+
+        self.trie.discard('app.sub.*')
+        self.assertNotIn('app.sub.a', self.trie)
+        self.assertEqual(len(self.trie), 1)
+
+    def test_prefix(self):
+        for include in ['app', 'app.core', 'app.sub.a']:
+            self.trie.add(include)
+        self.assertEqual(list(self.trie.iter_prefix('app.sub')), ['app.sub.a'])
+        self.assertTrue(self.trie.has_prefix('app'))
+        self.assertFalse(self.trie.has_prefix('app.util'))
+        self.assertFalse(self.trie.has_prefix('nothing'))
+        self.assertEqual(list(self.trie), ['app', 'app.core', 'app.sub.a'])
+
+    def test_compact(self):
+        for include in ['app', 'app.core', 'app.util', 'app.sub', 'app.sub.a', 'app.sub.b']:
+            self.trie.add(include)
+        self.assertEqual(list(self.trie.compact()), ['app.*', 'app.sub.*'])
+
+        # An incomplete package can't collapse
+        self.trie.discard('app.util')
+        self.assertEqual(list(self.trie.compact()), ['app', 'app.core', 'app.sub.*'])
+
+    def test_expand(self):
+        self.trie.add('app')
+        self.trie.add('app.sub.*')
+        self.assertEqual(list(self.trie.expand()), ['app', 'app.sub', 'app.sub.a', 'app.sub.b'])
+
+
+class Test_build_includes_compact(unittest.TestCase):
+
+    def test_default(self):
+        expected = set(['wheel.*', 'wheel.signatures.*', 'wheel.test.*'])
+        actual = build_includes(set(['wheel']), freezer=FREEZER.DEFAULT, compact=True)
+        self.assertEqual(expected, actual)
+
+    def test_cxfreeze(self):
+        expected = build_includes(set(['wheel']), freezer=FREEZER.CXFREEZE)
+        actual = build_includes(set(['wheel']), freezer=FREEZER.CXFREEZE, compact=True)
+        self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
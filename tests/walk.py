@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+walk
+----------------------------------
+Test the package directory walker
+"""
+from __future__ import absolute_import
+
+import os
+import shutil
+import unittest
+import zipfile
+
+from frosty.compat import EXTENSION_SUFFIXES
+from frosty.walk import MODULE, PackageTree, find_archive, iter_module_files, scan_directory, split_module_file, \
+    walk_packages
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_walk_packages(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for walk_packages
+    """
+
+    def setUp(self):
+        super(Test_walk_packages, self).setUp()
+        for path in ['__init__.py', 'module.py',
+                     os.path.join('sub', '__init__.py'),
+                     os.path.join('sub', 'deeper', '__init__.py'),
+                     os.path.join('data', 'asset.txt'),
+                     os.path.join('data', 'hidden', '__init__.py')]:
+            write_file(os.path.join(self.root, path))
+
+    def test_scan_directory(self):
+        dirs, files = scan_directory(self.root)
+        self.assertEqual(dirs, ['data', 'sub'])
+        self.assertEqual(files, ['__init__.py', 'module.py'])
+
+    def test_only_package_directories_visited(self):
+        visited = [os.path.relpath(root, self.root) for root, dirs, files in walk_packages(self.root)]
+        self.assertEqual(visited, [os.curdir, 'sub', os.path.join('sub', 'deeper')])
+
+    def test_non_package_directories_never_scanned(self):
+        scanned = []
+
+        def scan(path):
+            scanned.append(os.path.relpath(path, self.root))
+            return scan_directory(path)
+
+        list(walk_packages(self.root, scan=scan))
+        self.assertNotIn('data', scanned)
+
+    def test_every_directory_listed_once(self):
+        import frosty.walk
+        scanned = []
+        original = frosty.walk.scan_directory
+
+        def scan(path):
+            scanned.append(os.path.relpath(path, self.root))
+            return original(path)
+
+        frosty.walk.scan_directory = scan
+        try:
+            list(walk_packages(self.root))
+        finally:
+            frosty.walk.scan_directory = original
+        self.assertEqual(sorted(scanned), [os.curdir, 'data', 'sub', os.path.join('sub', 'deeper')])
+
+    def test_prune_in_place(self):
+        visited = []
+        for root, dirs, files in walk_packages(self.root):
+            visited.append(os.path.relpath(root, self.root))
+            dirs[:] = []
+        self.assertEqual(visited, [os.curdir])
+
+
+class Test_module_files(unittest.TestCase):
+    """
+    All tests for recognising module files
+    """
+
+    def test_split_module_file(self):
+        self.assertEqual(split_module_file('module.py'), ('module', MODULE.SOURCE))
+        self.assertEqual(split_module_file('module.pyc'), ('module', MODULE.BYTECODE))
+        for suffix in EXTENSION_SUFFIXES:
+            self.assertEqual(split_module_file('module' + suffix), ('module', MODULE.EXTENSION))
+        self.assertIsNone(split_module_file('module.cpython-99.pyc'))
+        self.assertIsNone(split_module_file('not-a-module.py'))
+        self.assertIsNone(split_module_file('README.txt'))
+
+    def test_iter_module_files(self):
+        files = ['README.txt', '__init__.py', 'a.py', 'a.pyc', 'b.pyc', 'c' + EXTENSION_SUFFIXES[0], 'c.py']
+        expected = [('a', 'a.py', MODULE.SOURCE), ('b', 'b.pyc', MODULE.BYTECODE),
+                    ('c', 'c' + EXTENSION_SUFFIXES[0], MODULE.EXTENSION)]
+        self.assertEqual(list(iter_module_files(files)), expected)
+        self.assertEqual([name for name, filename, kind in iter_module_files(files, archive=True)], ['a', 'b', 'c'])
+
+
+class Test_package_tree(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for PackageTree
+    """
+
+    def setUp(self):
+        super(Test_package_tree, self).setUp()
+        for path in ['__init__.py', 'module.py',
+                     os.path.join('sub', '__init__.py'),
+                     os.path.join('sub', 'deeper', '__init__.py'),
+                     os.path.join('other', '__init__.py')]:
+            write_file(os.path.join(self.root, path))
+
+    def test_replay_matches_walk(self):
+        tree = PackageTree(self.root)
+        expected = list(walk_packages(self.root))
+        self.assertEqual(list(tree.walk(self.root)), expected)
+        self.assertEqual(list(tree.walk(self.root)), expected)
+
+    def test_replay_without_filesystem(self):
+        tree = PackageTree(self.root)
+        shutil.rmtree(os.path.join(self.root, 'sub'))
+        visited = [os.path.relpath(root, self.root) for root, dirs, files in tree.walk()]
+        self.assertEqual(visited, [os.curdir, 'other', 'sub', os.path.join('sub', 'deeper')])
+
+    def test_prune_in_place(self):
+        tree = PackageTree(self.root)
+        visited = []
+        for root, dirs, files in tree.walk():
+            visited.append(os.path.relpath(root, self.root))
+            dirs[:] = [name for name in dirs if name != 'sub']
+        self.assertEqual(visited, [os.curdir, 'other'])
+
+
+class Test_walk_archive(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for walking packages inside zip archives
+    """
+
+    def setUp(self):
+        super(Test_walk_archive, self).setUp()
+        self.source = os.path.join(self.root, 'src')
+        self.archive = os.path.join(self.root, 'packages.zip')
+        paths = ['__init__.py', 'module.py',
+                 os.path.join('sub', '__init__.py'),
+                 os.path.join('sub', 'deeper', '__init__.py'),
+                 os.path.join('data', 'asset.txt'),
+                 os.path.join('data', 'hidden', '__init__.py')]
+        with zipfile.ZipFile(self.archive, 'w') as archive:
+            for path in paths:
+                write_file(os.path.join(self.source, 'pkg', path))
+                archive.write(os.path.join(self.source, 'pkg', path), os.path.join('pkg', path))
+
+    def relative_walk(self, top):
+        return [(os.path.relpath(root, top), dirs, files) for root, dirs, files in walk_packages(top)]
+
+    def test_find_archive(self):
+        self.assertEqual(find_archive(os.path.join(self.archive, 'pkg', 'sub')), self.archive)
+        self.assertEqual(find_archive(os.path.join(self.source, 'pkg', 'sub')), None)
+        self.assertEqual(find_archive(os.path.join(self.source, 'not_here')), None)
+
+    def test_matches_directory(self):
+        expected = self.relative_walk(os.path.join(self.source, 'pkg'))
+        actual = self.relative_walk(os.path.join(self.archive, 'pkg'))
+        self.assertEqual(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
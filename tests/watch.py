@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+watch
+----------------------------------
+Test the include watcher
+"""
+from __future__ import absolute_import
+
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+from frosty.freezers import FREEZER
+from frosty.includes import DISCOVERY
+from frosty.watch import IncludeWatcher, _Inotify
+from tests import TemporaryDirectoryMixin, write_file
+
+
+class Test_include_watcher(TemporaryDirectoryMixin, unittest.TestCase):
+    """
+    All tests for IncludeWatcher
+    """
+
+    sys_path = ''
+
+    def setUp(self):
+        super(Test_include_watcher, self).setUp()
+        self.package_dir = os.path.join(self.root, 'frosty_watched')
+        for path in ['__init__.py', 'module.py', os.path.join('sub', '__init__.py')]:
+            write_file(os.path.join(self.package_dir, path))
+
+    def test_poll(self):
+        changes = []
+        watcher = IncludeWatcher(['frosty_watched'], freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC,
+                                 callback=lambda added, removed: changes.append((added, removed)))
+        self.assertEqual(watcher.includes, set(['frosty_watched', 'frosty_watched.module', 'frosty_watched.sub']))
+        self.assertEqual(watcher.poll(), (set(), set()))
+
+        write_file(os.path.join(self.package_dir, 'sub', 'added.py'))
+        os.remove(os.path.join(self.package_dir, 'module.py'))
+        expected = (set(['frosty_watched.sub.added']), set(['frosty_watched.module']))
+        self.assertEqual(watcher.poll(), expected)
+        self.assertEqual(changes, [expected])
+        self.assertEqual(watcher.includes, set(['frosty_watched', 'frosty_watched.sub', 'frosty_watched.sub.added']))
+
+    def test_without_inotify(self):
+        """
+        Ensure that the watcher imports and polls on platforms without inotify (or O_NONBLOCK, like Windows)
+        """
+        script = "\n".join([
+            "import os, sys",
+            "del os.O_NONBLOCK",
+            "sys.path.insert(0, sys.argv[1])",
+            "import frosty.watch",
+            "frosty.watch._Inotify.available = classmethod(lambda cls: False)",
+            "watcher = frosty.watch.IncludeWatcher(['frosty_watched'], freezer='cxfreeze', discovery='spec',",
+            "                                      interval=0.01).start()",
+            "open(os.path.join(sys.argv[1], 'frosty_watched', 'added.py'), 'w').close()",
+            "added, removed = watcher.poll()",
+            "polling = watcher._inotify is None",
+            "watcher.stop()",
+            "print(' '.join([str(watcher.use_inotify), str(polling)] + sorted(added)))",
+        ])
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', script, self.root], cwd=root)
+        self.assertEqual(output.decode('utf-8').split(), ['False', 'True', 'frosty_watched.added'])
+
+    def test_new_sub_package(self):
+        write_file(os.path.join(self.package_dir, 'data', 'asset.txt'))
+        watcher = IncludeWatcher(['frosty_watched'], discovery=DISCOVERY.SPEC)
+        write_file(os.path.join(self.package_dir, 'data', '__init__.py'))
+        self.assertEqual(watcher.poll(), (set(['frosty_watched.data.*']), set()))
+
+    @unittest.skipUnless(_Inotify.available(), u"inotify is not available")
+    def test_inotify(self):
+        changed = threading.Event()
+        changes = []
+
+        def callback(added, removed):
+            changes.append((added, removed))
+            changed.set()
+
+        with IncludeWatcher(['frosty_watched'], freezer=FREEZER.CXFREEZE, discovery=DISCOVERY.SPEC, callback=callback,
+                            interval=0.1):
+            write_file(os.path.join(self.package_dir, 'sub', 'added.py'))
+            self.assertTrue(changed.wait(10))
+        self.assertEqual(changes, [(set(['frosty_watched.sub.added']), set())])
+
+
+if __name__ == '__main__':
+    unittest.main()